@@ -0,0 +1,204 @@
+"""Columnar issue snapshots shared with process-pool workers
+
+Sending rows to a process pool pickles every row for every task, which for
+tenants with millions of issues costs more than the parallelism saves.
+Instead, the parent loads the issues once into NumPy columns (timestamps,
+category/severity codes, area ids, resolution hours), copies them into one
+``multiprocessing.shared_memory`` segment, and sends children only a small
+``SharedColumnsHandle``. Each child maps the segment and reads the columns as
+read-only arrays without copying.
+
+``SharedIssueColumns`` owns the segment; closing it (or leaving its ``with``
+block, garbage collection, or interpreter exit) unlinks it exactly once. If
+the owner dies without cleaning up, the multiprocessing resource tracker
+(shared with pool children, which only attach) unlinks it. Children never
+unlink.
+
+Kernels run through ``map_shared`` take ``(columns, *args)`` and must return
+new objects (e.g. ``bincount`` results), not views into the columns.
+"""
+import weakref
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
+from multiprocessing import shared_memory
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.models import IssueModel, SLAMetricModel
+from app.domain.batch import NO_CODE, encode_strings
+from app.utils.concurrency import Executor, ItemResult, imap
+
+NO_AREA = -1
+_ALIGN = 64
+
+# Column name -> dtype; ``IssueColumns`` holds one array per entry
+COLUMN_DTYPES = {
+    "issue_id": np.dtype(np.int64),
+    "tenant_id": np.dtype(np.int64),
+    "area_id": np.dtype(np.int64),  # NO_AREA when unassigned
+    "category": np.dtype(np.int16),  # index into categories, NO_CODE if unset
+    "severity": np.dtype(np.int16),  # index into severities, NO_CODE if unset
+    "created_at": np.dtype("datetime64[s]"),
+    "resolved_at": np.dtype("datetime64[s]"),  # NaT while open
+    "resolution_hours": np.dtype(np.float64),  # NaN without an SLA result
+    "met_sla": np.dtype(np.int8),  # 1 met, 0 missed, -1 no SLA result
+}
+
+
+@dataclass
+class IssueColumns:
+    """Issues as aligned NumPy columns plus the category/severity vocabularies"""
+    issue_id: np.ndarray
+    tenant_id: np.ndarray
+    area_id: np.ndarray
+    category: np.ndarray
+    severity: np.ndarray
+    created_at: np.ndarray
+    resolved_at: np.ndarray
+    resolution_hours: np.ndarray
+    met_sla: np.ndarray
+    categories: Tuple[str, ...] = ()
+    severities: Tuple[str, ...] = ()
+
+    def __len__(self) -> int:
+        return len(self.issue_id)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in COLUMN_DTYPES)
+
+    def code(self, vocabulary: str, value: str) -> int:
+        """Code of a category/severity name, NO_CODE if absent from this snapshot"""
+        names = getattr(self, vocabulary)
+        return names.index(value) if value in names else NO_CODE
+
+
+def load_issue_columns(db: Session, tenant_id: Optional[int] = None,
+                       since: Optional[datetime] = None, batch_size: int = 10000) -> IssueColumns:
+    """Snapshot issues (and their SLA result) as columns, streamed from the database"""
+    query = (
+        select(IssueModel.id, IssueModel.tenant_id, IssueModel.area_id, IssueModel.category,
+               IssueModel.severity, IssueModel.created_at, IssueModel.resolved_at,
+               SLAMetricModel.resolution_time_hours, SLAMetricModel.met_sla)
+        .outerjoin(SLAMetricModel, SLAMetricModel.issue_id == IssueModel.id)
+        .order_by(IssueModel.id)
+    )
+    if tenant_id is not None:
+        query = query.where(IssueModel.tenant_id == tenant_id)
+    if since is not None:
+        query = query.where(IssueModel.created_at >= since)
+
+    rows = list(zip(*db.execute(query.execution_options(yield_per=batch_size)))) or [()] * 9
+    ids, tenants, areas, categories, severities, created, resolved, hours, met = rows
+    category_codes, category_names = encode_strings(list(categories))
+    severity_codes, severity_names = encode_strings(list(severities))
+    return IssueColumns(
+        issue_id=np.array(ids, dtype=np.int64),
+        tenant_id=np.array(tenants, dtype=np.int64),
+        area_id=np.array([NO_AREA if a is None else a for a in areas], dtype=np.int64),
+        category=category_codes,
+        severity=severity_codes,
+        created_at=np.array(created, dtype="datetime64[s]"),
+        resolved_at=np.array(resolved, dtype="datetime64[s]"),
+        resolution_hours=np.array([np.nan if h is None else float(h) for h in hours],
+                                  dtype=np.float64),
+        met_sla=np.array([-1 if m is None else int(m) for m in met], dtype=np.int8),
+        categories=category_names,
+        severities=severity_names,
+    )
+
+
+@dataclass(frozen=True)
+class SharedColumnsHandle:
+    """Everything a child needs to map a shared snapshot (cheap to pickle)"""
+    name: str
+    rows: int
+    layout: Tuple[Tuple[str, str, int], ...]  # (column, dtype, byte offset)
+    categories: Tuple[str, ...]
+    severities: Tuple[str, ...]
+
+
+def _release(segment: shared_memory.SharedMemory):
+    segment.close()
+    try:
+        segment.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class SharedIssueColumns:
+    """Owner of a shared-memory copy of an ``IssueColumns`` snapshot"""
+
+    def __init__(self, columns: IssueColumns):
+        layout, offset = [], 0
+        for name, dtype in COLUMN_DTYPES.items():
+            layout.append((name, dtype.str, offset))
+            offset += -(-len(columns) * dtype.itemsize // _ALIGN) * _ALIGN
+        self._segment = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        self._finalizer = weakref.finalize(self, _release, self._segment)
+        for name, dtype, start in layout:
+            source = getattr(columns, name)
+            target = np.ndarray(len(columns), dtype=dtype, buffer=self._segment.buf, offset=start)
+            target[:] = source
+            del target
+        self.handle = SharedColumnsHandle(self._segment.name, len(columns), tuple(layout),
+                                          tuple(columns.categories), tuple(columns.severities))
+
+    @property
+    def closed(self) -> bool:
+        return not self._finalizer.alive
+
+    def close(self):
+        """Unmap and unlink the segment (idempotent)"""
+        self._finalizer()
+
+    def __enter__(self) -> "SharedIssueColumns":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@contextmanager
+def attach(handle: SharedColumnsHandle) -> Iterator[IssueColumns]:
+    """Map a shared snapshot as read-only columns for the duration of the block"""
+    segment = shared_memory.SharedMemory(name=handle.name)
+    arrays = {}
+    try:
+        for name, dtype, offset in handle.layout:
+            array = np.ndarray(handle.rows, dtype=dtype, buffer=segment.buf, offset=offset)
+            array.flags.writeable = False
+            arrays[name] = array
+        columns = IssueColumns(**arrays, categories=handle.categories,
+                               severities=handle.severities)
+        yield columns
+    finally:
+        columns = None
+        arrays.clear()
+        try:
+            segment.close()
+        except BufferError:
+            # A kernel kept a view; the mapping goes away with the process
+            pass
+
+
+def _run_kernel(kernel, handle: SharedColumnsHandle, args: tuple):
+    with attach(handle) as columns:
+        return kernel(columns, *args)
+
+
+def map_shared(kernel, shared: Union[SharedIssueColumns, SharedColumnsHandle],
+               arg_tuples: Iterable[tuple], executor: Union[str, Executor] = "cpu",
+               **imap_kwargs) -> Iterator[ItemResult]:
+    """``kernel(columns, *args)`` for each args tuple, in the process pool
+
+    Each task pickles only the kernel reference, the handle and its args.
+    ``kernel`` must be a module-level function.
+    """
+    handle = shared.handle if isinstance(shared, SharedIssueColumns) else shared
+    return imap(partial(_run_kernel, kernel, handle), arg_tuples, executor, **imap_kwargs)
@@ -1,20 +1,39 @@
 """Issue counts & trends"""
-from datetime import datetime, timedelta
-from typing import Dict
+from typing import Dict, Optional
 
+from sqlalchemy.orm import Session
 
-def compute_issue_stats(tenant_id: int, days: int = 30) -> Dict:
-    """Compute issue statistics for a tenant"""
-    # TODO: Query database for issue data
-    # TODO: Calculate counts, trends, and distributions
-    
+from app.db.queries import get_dashboard_counts
+from app.db.routing import ReadSessionLocal
+
+
+def compute_issue_stats(tenant_id: int, days: int = 30, db: Optional[Session] = None) -> Dict:
+    """Compute issue statistics for a tenant
+
+    Counts cover every issue; ``trend`` compares issues created in the last
+    ``days`` with the ``days`` before. One query (``get_dashboard_counts``).
+    """
+    owns_session = db is None
+    db = db or ReadSessionLocal()
+    try:
+        return issue_stats_from_counts(get_dashboard_counts(db, tenant_id, days))
+    finally:
+        if owns_session:
+            db.close()
+
+
+def issue_stats_from_counts(counts: Dict) -> Dict:
+    """compute_issue_stats figures from ``get_dashboard_counts`` output"""
+    totals = counts["totals"]
     return {
-        "total_issues": 0,
-        "open_issues": 0,
-        "resolved_issues": 0,
-        "by_category": {},
-        "by_severity": {},
-        "trend": "stable"  # increasing, decreasing, stable
+        "total_issues": totals["issues"],
+        "open_issues": totals["open"],
+        "resolved_issues": totals["resolved"],
+        "by_category": {key: values["issues"] for key, values in counts["by_category"].items()},
+        "by_severity": {key: values["issues"] for key, values in counts["by_severity"].items()},
+        "current_period_issues": totals["current_period"],
+        "previous_period_issues": totals["previous_period"],
+        "trend": compute_trend(totals["current_period"], totals["previous_period"]),
     }
 
 
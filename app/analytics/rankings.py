@@ -1,30 +1,290 @@
-"""Tenant/area leaderboards"""
-from typing import List, Dict
+"""Tenant/area leaderboards
 
+``Leaderboard`` keeps one scope's latest scores for one metric type sorted best
+first, so rank, percentile and top-k/bottom-k are bisections and slices
+instead of a sort per request. A scope is every tenant (tenant-level scores)
+or the areas of one tenant.
 
-def compute_tenant_rankings(metric_type: str = "overall") -> List[Dict]:
+``leaderboards`` holds the boards of this process. A board is loaded from
+``performance_scores`` on first use and tagged with its tenant's
+``scores_cache`` generation. ``store_scores`` folds new rows into loaded boards
+as it invalidates. A board whose generation moved some other way (another
+process wrote scores) is reloaded on its next read. With a per-process cache
+backend those generations never move here, so boards are also reloaded once
+they are older than the cache TTL.
+"""
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.analytics.columnar import NO_AREA, IssueColumns
+from app.analytics.score_engine import METRIC_TYPES
+from app.db.routing import ReadSessionLocal, constrain_read
+from app.db.queries import get_score_leaderboard
+from app.utils.read_cache import TenantReadCache, scores_cache
+
+_BEFORE_ALL = float("-inf")
+
+
+class Leaderboard:
+    """Scores by entity, ordered by score descending, then entity id
+
+    Ties share a rank (standard competition ranking: 1, 2, 2, 4). Lookups are
+    O(log n). An update is a bisection plus one list insert/delete.
+    """
+
+    def __init__(self, scores: Optional[Dict[int, float]] = None):
+        self._scores: Dict[int, float] = dict(scores or {})
+        self._order: List[Tuple[float, int]] = sorted(
+            (-score, entity_id) for entity_id, score in self._scores.items()
+        )
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __contains__(self, entity_id: int) -> bool:
+        return entity_id in self._scores
+
+    def score(self, entity_id: int) -> Optional[float]:
+        return self._scores.get(entity_id)
+
+    def update(self, entity_id: int, score: float):
+        """Set an entity's score, moving it to its new position"""
+        self.remove(entity_id)
+        self._scores[entity_id] = score
+        insort(self._order, (-score, entity_id))
+
+    def remove(self, entity_id: int):
+        old = self._scores.pop(entity_id, None)
+        if old is not None:
+            del self._order[bisect_left(self._order, (-old, entity_id))]
+
+    def _above(self, score: float) -> int:
+        """Number of scores strictly greater than ``score``"""
+        return bisect_left(self._order, (-score, _BEFORE_ALL))
+
+    def rank_of_score(self, score: float) -> int:
+        """Rank a score would get: one more than the number of higher scores"""
+        return self._above(score) + 1
+
+    def rank(self, entity_id: int) -> Optional[int]:
+        score = self._scores.get(entity_id)
+        return None if score is None else self.rank_of_score(score)
+
+    def percentile(self, score: float) -> float:
+        """Percentage of scores at or below ``score`` (50.0 for an empty board)"""
+        if not self._order:
+            return 50.0
+        return round((len(self._order) - self._above(score)) / len(self._order) * 100, 1)
+
+    def top(self, k: int, offset: int = 0) -> List[Tuple[int, int, float]]:
+        """``(rank, entity_id, score)`` for the best ``k`` entities after ``offset``"""
+        return [(self.rank_of_score(-neg), entity_id, -neg)
+                for neg, entity_id in self._order[offset:offset + k]]
+
+    def bottom(self, k: int) -> List[Tuple[int, int, float]]:
+        """``(rank, entity_id, score)`` for the worst ``k`` entities, worst first"""
+        if k <= 0:
+            return []
+        return [(self.rank_of_score(-neg), entity_id, -neg)
+                for neg, entity_id in reversed(self._order[-k:])]
+
+    def count_between(self, low: float, high: float) -> int:
+        """Number of scores in ``[low, high]``"""
+        return (bisect_right(self._order, (-low, float("inf")))
+                - bisect_left(self._order, (-high, _BEFORE_ALL)))
+
+
+class _Board:
+    __slots__ = ("generation", "board", "calculated_at", "loaded_at")
+
+    def __init__(self, generation: Optional[int], board: Leaderboard,
+                 calculated_at: Dict[int, datetime], loaded_at: float):
+        self.generation = generation
+        self.board = board
+        self.calculated_at = calculated_at
+        self.loaded_at = loaded_at
+
+
+class LeaderboardIndex:
+    """Per-process leaderboards for every scope and metric type, kept in step with scores"""
+
+    def __init__(self, cache: TenantReadCache, clock: Callable[[], float] = time.monotonic):
+        self.cache = cache
+        self.clock = clock
+        self._boards: Dict[Tuple[Optional[int], str], _Board] = {}
+        self._lock = threading.RLock()
+        self.loads = 0
+        self.updates = 0
+
+    def _board(self, db: Session, tenant_id: Optional[int], metric_type: str) -> _Board:
+        if metric_type not in METRIC_TYPES:
+            raise ValueError(f"Unknown metric type: {metric_type}")
+        generation = self.cache.generation(tenant_id)
+        entry = self._boards.get((tenant_id, metric_type))
+        if (entry is None or generation is None or entry.generation != generation
+                or self._expired(entry)):
+            # The replica must already have the writes behind this generation
+            constrain_read(db, written_at=self.cache.last_write(tenant_id))
+            rows = get_score_leaderboard(db, tenant_id, metric_type, limit=None)
+            entity = "tenant_id" if tenant_id is None else "area_id"
+            entry = _Board(
+                generation,
+                Leaderboard({row[entity]: row["score"] for row in rows}),
+                {row[entity]: row["calculated_at"] for row in rows},
+                self.clock(),
+            )
+            self._boards[(tenant_id, metric_type)] = entry
+            self.loads += 1
+        return entry
+
+    def _expired(self, entry: _Board) -> bool:
+        """Past the TTL on a per-process backend, which misses other processes' writes"""
+        return (not self.cache.backend.shared
+                and self.clock() - entry.loaded_at >= self.cache.ttl_seconds)
+
+    @staticmethod
+    def _rows(entry: _Board, ranked, tenant_id: Optional[int]) -> List[dict]:
+        return [
+            {"rank": rank, "tenant_id": entity_id if tenant_id is None else tenant_id,
+             "area_id": None if tenant_id is None else entity_id, "score": score,
+             "percentile": entry.board.percentile(score),
+             "calculated_at": entry.calculated_at.get(entity_id)}
+            for rank, entity_id, score in ranked
+        ]
+
+    def top(self, db: Session, tenant_id: Optional[int] = None, metric_type: str = "overall",
+            k: int = 50, offset: int = 0) -> List[dict]:
+        """Best ``k`` tenants (or areas of ``tenant_id``) with rank and percentile"""
+        with self._lock:
+            entry = self._board(db, tenant_id, metric_type)
+            return self._rows(entry, entry.board.top(k, offset), tenant_id)
+
+    def bottom(self, db: Session, tenant_id: Optional[int] = None,
+               metric_type: str = "overall", k: int = 50) -> List[dict]:
+        """Worst ``k`` tenants (or areas of ``tenant_id``), worst first"""
+        with self._lock:
+            entry = self._board(db, tenant_id, metric_type)
+            return self._rows(entry, entry.board.bottom(k), tenant_id)
+
+    def standing(self, db: Session, entity_id: int, tenant_id: Optional[int] = None,
+                 metric_type: str = "overall") -> Optional[dict]:
+        """Rank and percentile of one tenant (or area of ``tenant_id``); None if unscored"""
+        with self._lock:
+            board = self._board(db, tenant_id, metric_type).board
+            score = board.score(entity_id)
+            if score is None:
+                return None
+            return {"rank": board.rank(entity_id), "of": len(board), "score": score,
+                    "percentile": board.percentile(score)}
+
+    def apply(self, rows: Iterable[dict]):
+        """Fold newly stored score rows into loaded boards and invalidate cached responses
+
+        Rows are ``performance_scores`` dicts. A loaded board stays current only
+        if its generation was current and this invalidation was the only bump;
+        otherwise it is dropped and reloaded on its next read.
+        """
+        rows = list(rows)
+        tenant_ids = {row["tenant_id"] for row in rows}
+        scopes = [None, *tenant_ids]
+        with self._lock:
+            before = {scope: self.cache.generation(scope) for scope in scopes}
+            self.cache.invalidate(tenant_ids)
+            after = {scope: self.cache.generation(scope) for scope in scopes}
+            current = {
+                scope for scope in scopes
+                if before[scope] is not None and after[scope] == before[scope] + 1
+            }
+            for key in [key for key in self._boards if key[0] in before]:
+                entry = self._boards[key]
+                if key[0] in current and entry.generation == before[key[0]]:
+                    entry.generation = after[key[0]]
+                else:
+                    del self._boards[key]
+            for row in rows:
+                scope = None if row["area_id"] is None else row["tenant_id"]
+                entity_id = row["tenant_id"] if scope is None else row["area_id"]
+                entry = self._boards.get((scope, row["metric_type"]))
+                previous = entry and entry.calculated_at.get(entity_id)
+                if entry is not None and (previous is None or row["calculated_at"] >= previous):
+                    entry.board.update(entity_id, float(row["score"]))
+                    entry.calculated_at[entity_id] = row["calculated_at"]
+                    self.updates += 1
+
+    def clear(self):
+        with self._lock:
+            self._boards.clear()
+
+    def stats(self) -> dict:
+        return {"boards": len(self._boards), "loads": self.loads, "updates": self.updates}
+
+
+# Leaderboards for this process, kept in step with scores_cache invalidations
+leaderboards = LeaderboardIndex(scores_cache)
+
+
+def _with_session(db: Optional[Session], fn):
+    owns_session = db is None
+    db = db or ReadSessionLocal()
+    try:
+        return fn(db)
+    finally:
+        if owns_session:
+            db.close()
+
+
+def compute_tenant_rankings(metric_type: str = "overall", db: Optional[Session] = None,
+                            limit: int = 50) -> List[Dict]:
     """Compute rankings across all tenants"""
-    # TODO: Query performance scores
-    # TODO: Rank tenants by score
-    # TODO: Return sorted leaderboard
-    
-    return []
+    return _with_session(db, lambda s: leaderboards.top(s, None, metric_type, limit))
 
 
-def compute_area_rankings(tenant_id: int) -> List[Dict]:
+def compute_area_rankings(tenant_id: int, metric_type: str = "overall",
+                          db: Optional[Session] = None, limit: int = 50) -> List[Dict]:
     """Compute rankings for areas within a tenant"""
-    # TODO: Query area-level scores
-    # TODO: Rank areas by performance
-    
-    return []
+    return _with_session(db, lambda s: leaderboards.top(s, tenant_id, metric_type, limit))
+
+
+def area_rankings(columns: IssueColumns, tenant_id: int) -> List[Dict]:
+    """Areas of a tenant ranked by SLA compliance, then mean resolution time
+
+    Only issues with an SLA result count. A ``map_shared`` kernel.
+    """
+    mask = ((columns.tenant_id == tenant_id) & (columns.area_id != NO_AREA)
+            & (columns.met_sla >= 0))
+    areas, inverse = np.unique(columns.area_id[mask], return_inverse=True)
+    resolved = np.bincount(inverse, minlength=len(areas))
+    met = np.bincount(inverse, weights=columns.met_sla[mask], minlength=len(areas))
+    hours = columns.resolution_hours[mask]
+    timed = ~np.isnan(hours)
+    total_hours = np.bincount(inverse[timed], weights=hours[timed], minlength=len(areas))
+    compliance = met / np.maximum(resolved, 1)
+    average = total_hours / np.maximum(np.bincount(inverse[timed], minlength=len(areas)), 1)
+    order = np.lexsort((areas, average, -compliance))
+    return [
+        {
+            "area_id": int(areas[i]),
+            "rank": rank,
+            "resolved": int(resolved[i]),
+            "compliance_rate": round(float(compliance[i]), 4),
+            "average_resolution_hours": round(float(average[i]), 2),
+        }
+        for rank, i in enumerate(order, 1)
+    ]
 
 
 def get_percentile_rank(score: float, all_scores: List[float]) -> float:
-    """Calculate percentile rank for a score"""
+    """Calculate percentile rank for a score
+
+    One-off helper (sorts ``all_scores``); rank repeatedly with ``Leaderboard``.
+    """
     if not all_scores:
         return 50.0
-    
-    sorted_scores = sorted(all_scores)
-    rank = sum(1 for s in sorted_scores if s <= score)
-    percentile = (rank / len(sorted_scores)) * 100
-    return round(percentile, 1)
+    rank = bisect_right(sorted(all_scores), score)
+    return round(rank / len(all_scores) * 100, 1)
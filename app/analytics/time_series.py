@@ -1,35 +1,472 @@
-"""Historical trend builders"""
-from datetime import datetime, timedelta
-from typing import List, Dict
+"""Historical trend builders
 
+Events (issues created/resolved, SLA results, reports) are bucketed by hour,
+day, week (starting Monday) or month in the tenant's timezone
+(``tenants.timezone``). The zone's UTC offset changes over the range are found
+once (and cached), then applied to every timestamp with ``searchsorted``, so
+bucketing and the per-bucket count/sum/avg/percentiles are a handful of NumPy
+passes. Buckets are local wall-clock periods: a day spanning a DST change has
+23 or 25 hours. Every bucket in the range is present, with zeros when empty.
 
-def build_time_series(tenant_id: int, metric: str, days: int = 30) -> List[Dict]:
-    """Build time series data for a metric"""
-    # TODO: Query historical data points
-    # TODO: Group by time intervals (daily, weekly)
-    # TODO: Return time series array
-    
-    return []
+``load_time_series`` reads counts and sums from the dashboard rollups where
+they cover the range. It uses the daily rows for day-or-longer buckets in zones
+that stay at UTC+0 and the hourly rows for zones whose offsets are whole hours;
+everything else, and anything past the rollup watermark, comes from the raw
+tables. Percentiles need the individual values and always read
+``sla_metrics``.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
 
+import numpy as np
+from sqlalchemy import Integer, cast, func, select
+from sqlalchemy.orm import Session
 
-def aggregate_by_interval(data: List[Dict], interval: str = "daily") -> List[Dict]:
-    """Aggregate data points by time interval"""
-    # TODO: Group data by day/week/month
-    # TODO: Calculate aggregates (sum, avg, etc.)
-    
-    return []
+from app.analytics.columnar import IssueColumns
+from app.db.models import (
+    IssueModel,
+    IssueRollupDailyModel,
+    IssueRollupHourlyModel,
+    ReportModel,
+    SLAMetricModel,
+    TenantModel,
+)
+from app.db.rollups import get_watermark, split_span
+
+INTERVALS = ("hourly", "daily", "weekly", "monthly")
+_UNITS = {"hourly": "h", "daily": "D", "monthly": "M"}
+_DAY = 86400
+
+# metric -> (rollup count column, rollup sum column)
+ROLLUP_METRICS = {
+    "issues_created": ("issues_created", "issues_created"),
+    "issues_resolved": ("issues_resolved", "issues_resolved"),
+    "sla_met": ("sla_met", "sla_met"),
+    "sla_missed": ("sla_missed", "sla_missed"),
+    "resolution_hours": ("resolution_count", "resolution_hours_sum"),
+}
+METRICS = tuple(ROLLUP_METRICS) + ("reports",)
+
+
+@dataclass
+class TimeSeries:
+    """Per-bucket aggregates; ``buckets`` are local bucket starts"""
+    interval: str
+    timezone: str
+    buckets: np.ndarray  # datetime64[s], local wall clock
+    count: np.ndarray
+    sum: np.ndarray
+    percentiles: Dict[float, np.ndarray] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.buckets)
+
+    @property
+    def avg(self) -> np.ndarray:
+        """sum / count, 0 for empty buckets"""
+        return np.divide(self.sum, self.count, out=np.zeros(len(self.sum)),
+                         where=self.count > 0)
+
+    def to_points(self) -> List[Dict]:
+        columns = {
+            "count": self.count.tolist(),
+            "sum": self.sum.tolist(),
+            "avg": self.avg.tolist(),
+            **{f"p{q:g}": values.tolist() for q, values in self.percentiles.items()},
+        }
+        buckets = self.buckets.astype(datetime).tolist()
+        return [
+            {"bucket": bucket.isoformat(), **{name: values[i] for name, values in columns.items()}}
+            for i, bucket in enumerate(buckets)
+        ]
+
+
+# -- Timezones ---------------------------------------------------------------
+
+def _year(second: int) -> int:
+    return int(np.datetime64(int(second), "s").astype("datetime64[Y]").astype(int)) + 1970
+
+
+@lru_cache(maxsize=256)
+def _offset_table(tz: str, first_year: int, last_year: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(UTC second each offset starts at, offset seconds) over whole years
+
+    Samples the offset once per day and bisects the days where it changed,
+    assuming at most one change per day (true for real zones).
+    """
+    zone = ZoneInfo(tz)
+
+    def offset(second: int) -> int:
+        return int(datetime.fromtimestamp(second, zone).utcoffset().total_seconds())
+
+    first_day = (datetime(first_year, 1, 1) - datetime(1970, 1, 1)).days
+    last_day = (datetime(last_year + 1, 1, 1) - datetime(1970, 1, 1)).days
+    starts, offsets = [np.iinfo(np.int64).min], [offset((first_day - 1) * _DAY)]
+    for day in range(first_day, last_day + 1):
+        current = offset(day * _DAY)
+        if current != offsets[-1]:
+            low, high = (day - 1) * _DAY, day * _DAY
+            while high - low > 1:
+                middle = (low + high) // 2
+                if offset(middle) == offsets[-1]:
+                    low = middle
+                else:
+                    high = middle
+            starts.append(high)
+            offsets.append(current)
+    return np.array(starts, dtype=np.int64), np.array(offsets, dtype=np.int64)
+
+
+def utc_offsets(utc_seconds: np.ndarray, tz: str) -> np.ndarray:
+    """UTC offset (seconds) of ``tz`` at each UTC epoch second"""
+    utc_seconds = np.asarray(utc_seconds, dtype=np.int64)
+    if tz == "UTC" or not len(utc_seconds):
+        return np.zeros(len(utc_seconds), dtype=np.int64)
+    starts, offsets = _offset_table(tz, _year(utc_seconds.min()), _year(utc_seconds.max()))
+    return offsets[np.searchsorted(starts, utc_seconds, side="right") - 1]
+
+
+def to_local(utc_seconds: np.ndarray, tz: str) -> np.ndarray:
+    """Local wall-clock epoch seconds for UTC epoch seconds"""
+    utc_seconds = np.asarray(utc_seconds, dtype=np.int64)
+    return utc_seconds + utc_offsets(utc_seconds, tz)
+
+
+def to_utc(local_seconds: np.ndarray, tz: str) -> np.ndarray:
+    """Inverse of ``to_local``; repeated or skipped local times map to one candidate"""
+    local_seconds = np.asarray(local_seconds, dtype=np.int64)
+    guess = local_seconds - utc_offsets(local_seconds, tz)
+    return local_seconds - utc_offsets(guess, tz)
+
+
+def _whole_hour_offsets(tz: str, start: datetime, end: datetime) -> Tuple[bool, bool]:
+    """(offsets are whole hours, offset is always zero) over [start, end]"""
+    if tz == "UTC":
+        return True, True
+    _, offsets = _offset_table(tz, start.year, end.year)
+    return bool(np.all(offsets % 3600 == 0)), bool(np.all(offsets == 0))
+
+
+# -- Bucketing ---------------------------------------------------------------
+
+def floor_buckets(local_seconds: np.ndarray, interval: str) -> np.ndarray:
+    """Start of the bucket containing each local time (datetime64[s])"""
+    stamps = np.asarray(local_seconds, dtype=np.int64).view("datetime64[s]")
+    if interval == "weekly":
+        days = stamps.astype("datetime64[D]")
+        # 1970-01-01 was a Thursday: weekday (Monday = 0) is (days + 3) % 7
+        return (days - (days.view(np.int64) + 3) % 7).astype("datetime64[s]")
+    if interval not in _UNITS:
+        raise ValueError(f"Unknown interval: {interval}")
+    return stamps.astype(f"datetime64[{_UNITS[interval]}]").astype("datetime64[s]")
+
+
+def bucket_range(first: np.datetime64, last: np.datetime64, interval: str) -> np.ndarray:
+    """Every bucket start from ``first`` to ``last`` inclusive (both bucket starts)"""
+    if interval == "weekly":
+        days = np.arange(first.astype("datetime64[D]"), last.astype("datetime64[D]") + 1, 7)
+        return days.astype("datetime64[s]")
+    unit = _UNITS[interval]
+    return np.arange(first.astype(f"datetime64[{unit}]"),
+                     last.astype(f"datetime64[{unit}]") + 1).astype("datetime64[s]")
+
+
+def _epoch_seconds(values) -> np.ndarray:
+    """Epoch seconds from datetimes, datetime64 or numbers"""
+    values = np.asarray(values)
+    if values.dtype.kind in "iuf":
+        return values.astype(np.int64)
+    return values.astype("datetime64[s]").view(np.int64)
+
+
+def _local_in_range(seconds: np.ndarray, start_s: int, end_s: int, tz: str) -> np.ndarray:
+    """``to_local`` for seconds in [start_s, end_s) via a per-hour offset table
+
+    A gather from a small table instead of a binary search per event. Hours in
+    which the offset changes mid-hour (e.g. Newfoundland) are converted exactly.
+    """
+    if tz == "UTC" or not len(seconds):
+        return seconds
+    origin = start_s - start_s % 3600
+    hour = (seconds - origin) // 3600
+    local = seconds + utc_offsets(np.arange(origin, end_s, 3600), tz)[hour]
+    starts, _ = _offset_table(tz, _year(start_s), _year(end_s))
+    for change in starts[(starts > origin) & (starts < end_s) & (starts % 3600 != 0)]:
+        inside = hour == (change - origin) // 3600
+        local[inside] = to_local(seconds[inside], tz)
+    return local
+
+
+def _bucket_index(local: np.ndarray, low: int, high: int, buckets: np.ndarray,
+                  interval: str) -> np.ndarray:
+    """Position in ``buckets`` of each local second in [low, high]
+
+    Maps every local hour (hourly) or day (otherwise) of the range to its
+    bucket once, then looks events up by integer division.
+    """
+    unit = 3600 if interval == "hourly" else _DAY
+    origin = low - low % unit
+    table = np.searchsorted(buckets, floor_buckets(np.arange(origin, high + 1, unit), interval))
+    return table[(local - origin) // unit]
+
+
+def _grouped_percentiles(index: np.ndarray, values: np.ndarray, buckets: int,
+                         percentiles: Iterable[float]) -> Dict[float, np.ndarray]:
+    """Linear-interpolated percentiles of ``values`` per bucket (0 when empty)"""
+    # Sort by value, then stably by bucket: values end up sorted within buckets
+    order = np.argsort(values)
+    order = order[np.argsort(index[order], kind="stable")]
+    ordered = values[order]
+    counts = np.bincount(index, minlength=buckets)
+    starts = np.cumsum(counts) - counts
+    present = counts > 0
+    result = {}
+    for q in percentiles:
+        if not len(ordered):
+            result[q] = np.zeros(buckets)
+            continue
+        position = starts + (np.maximum(counts, 1) - 1) * (q / 100.0)
+        low = np.minimum(np.floor(position).astype(np.int64), len(ordered) - 1)
+        high = np.minimum(np.ceil(position).astype(np.int64), len(ordered) - 1)
+        interpolated = ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+        result[q] = np.where(present, interpolated, 0.0)
+    return result
+
+
+def aggregate(timestamps, start: datetime, end: datetime, interval: str = "daily",
+              tz: str = "UTC", values=None, counts=None,
+              percentiles: Sequence[float] = ()) -> TimeSeries:
+    """Bucket events in [start, end) (naive UTC) by local ``interval``
+
+    ``timestamps`` are UTC (datetime64, datetimes or epoch seconds). Each is one
+    event with ``values`` (default 1) summed per bucket, or with ``counts``
+    a pre-aggregated row of ``counts`` events whose total is ``values``.
+    Percentiles of ``values`` need one row per event.
+    """
+    if percentiles and (counts is not None or values is None):
+        raise ValueError("Percentiles need one value per event")
+    if interval not in INTERVALS:
+        raise ValueError(f"Unknown interval: {interval}")
+    seconds = _epoch_seconds(timestamps)
+    start_s, end_s = (int(s) for s in _epoch_seconds([start, end]))
+    keep = (seconds >= start_s) & (seconds < end_s)
+    everything = bool(keep.all())
+    if not everything:
+        seconds = seconds[keep]
+    local = _local_in_range(seconds, start_s, end_s, tz)
+
+    # Falling back can put events before the start's local time
+    low, high = (int(t) for t in to_local([start_s, end_s - 1], tz))
+    if len(local):
+        low, high = min(low, int(local.min())), max(high, int(local.max()))
+    first, last = floor_buckets([low, high], interval)
+    buckets = bucket_range(first, last, interval)
+    index = _bucket_index(local, low, high, buckets, interval)
+
+    n = len(buckets)
+    weights = None
+    if counts is not None:
+        weights = np.asarray(counts, dtype=np.float64)
+        weights = weights if everything else weights[keep]
+    count = np.bincount(index, weights=weights, minlength=n)
+    if values is None:
+        total = count.astype(np.float64)
+    else:
+        kept = np.asarray(values, dtype=np.float64)
+        kept = kept if everything else kept[keep]
+        total = np.bincount(index, weights=kept, minlength=n)
+    series = TimeSeries(interval, tz, buckets, count.astype(np.int64), total)
+    if percentiles:
+        valid = ~np.isnan(kept)
+        series.percentiles = _grouped_percentiles(index[valid], kept[valid], n, percentiles)
+    return series
+
+
+def aggregate_by_interval(data: List[Dict], interval: str = "daily",
+                          tz: str = "UTC") -> List[Dict]:
+    """Aggregate data points (``timestamp``, optional ``value``) by time interval"""
+    if not data:
+        return []
+    stamps = np.array([point["timestamp"] for point in data], dtype="datetime64[s]")
+    values = np.array([point.get("value", 1) for point in data], dtype=np.float64)
+    start = stamps.min().astype(datetime)
+    end = (stamps.max() + 1).astype(datetime)
+    return aggregate(stamps, start, end, interval, tz, values=values).to_points()
+
+
+# -- Smoothing ---------------------------------------------------------------
+
+def moving_average(values: Sequence[float], window: int) -> np.ndarray:
+    """Trailing mean of up to ``window`` points, O(n) from cumulative sums"""
+    values = np.asarray(values, dtype=np.float64)
+    totals = np.concatenate(([0.0], np.cumsum(values)))
+    ends = np.arange(1, len(values) + 1)
+    starts = np.maximum(ends - window, 0)
+    return (totals[ends] - totals[starts]) / (ends - starts)
+
+
+def ewma(values: Sequence[float], alpha: Optional[float] = None,
+         span: Optional[float] = None) -> np.ndarray:
+    """Exponentially weighted mean ``y[i] = alpha * x[i] + (1 - alpha) * y[i - 1]``
+
+    One streaming pass; ``span`` gives ``alpha = 2 / (span + 1)``.
+    """
+    if alpha is None:
+        if span is None:
+            raise ValueError("ewma needs alpha or span")
+        alpha = 2.0 / (span + 1.0)
+    smoothed = np.empty(len(values))
+    current = None
+    for i, value in enumerate(np.asarray(values, dtype=np.float64).tolist()):
+        current = value if current is None else current + alpha * (value - current)
+        smoothed[i] = current
+    return smoothed
 
 
 def smooth_trend(values: List[float], window_size: int = 7) -> List[float]:
     """Apply moving average smoothing to trend data"""
     if len(values) < window_size:
         return values
-    
-    smoothed = []
-    for i in range(len(values)):
-        start = max(0, i - window_size + 1)
-        end = i + 1
-        window = values[start:end]
-        smoothed.append(sum(window) / len(window))
-    
-    return smoothed
+    return moving_average(values, window_size).tolist()
+
+
+# -- Database ----------------------------------------------------------------
+
+def tenant_timezone(db: Session, tenant_id: int) -> str:
+    return db.execute(
+        select(TenantModel.timezone).where(TenantModel.id == tenant_id)
+    ).scalar() or "UTC"
+
+
+def _epoch(db: Session, column):
+    """SQL expression for a timestamp's UTC epoch seconds"""
+    if db.get_bind().dialect.name == "sqlite":
+        return cast(func.strftime("%s", column), Integer)
+    return func.extract("epoch", column)
+
+
+def _within(column, span) -> list:
+    start, end = span
+    return [column >= start, column < end]
+
+
+def _raw_events(db: Session, tenant_id: int, metric: str, span) -> Tuple[np.ndarray, np.ndarray]:
+    """(epoch seconds, value) per raw event of ``metric`` in ``span``"""
+    if metric == "reports":
+        stamp = ReportModel.submitted_at
+        query = select(_epoch(db, stamp)).where(ReportModel.tenant_id == tenant_id)
+    elif metric in ("issues_created", "issues_resolved"):
+        stamp = IssueModel.created_at if metric == "issues_created" else IssueModel.resolved_at
+        query = select(_epoch(db, stamp)).where(IssueModel.tenant_id == tenant_id,
+                                                stamp.isnot(None))
+    else:
+        stamp = SLAMetricModel.calculated_at
+        hours = SLAMetricModel.resolution_time_hours
+        query = (select(_epoch(db, stamp), hours)
+                 .join(IssueModel, SLAMetricModel.issue_id == IssueModel.id)
+                 .where(IssueModel.tenant_id == tenant_id))
+        if metric == "resolution_hours":
+            query = query.where(hours.isnot(None))
+        else:
+            query = query.with_only_columns(_epoch(db, stamp)).where(
+                SLAMetricModel.met_sla == (metric == "sla_met"))
+    # Core rows: skips the ORM's per-row processing
+    rows = db.connection().execute(query.where(*_within(stamp, span))).all()
+    seconds = np.fromiter((row[0] for row in rows), dtype=np.float64, count=len(rows))
+    if metric == "resolution_hours":
+        values = np.fromiter((float(row[1]) for row in rows), dtype=np.float64, count=len(rows))
+    else:
+        values = np.ones(len(rows))
+    return seconds.astype(np.int64), values
+
+
+def _rollup_rows(db: Session, model, tenant_id: int, metric: str, span):
+    """(bucket epoch seconds, event count, value sum) per rollup bucket in ``span``"""
+    count_column, sum_column = (getattr(model, c) for c in ROLLUP_METRICS[metric])
+    rows = db.connection().execute(
+        select(_epoch(db, model.bucket_start), func.sum(count_column), func.sum(sum_column))
+        .where(model.tenant_id == tenant_id, *_within(model.bucket_start, span))
+        .group_by(model.bucket_start)
+    ).all()
+    return (np.fromiter((r[0] for r in rows), dtype=np.float64, count=len(rows)).astype(np.int64),
+            np.fromiter((r[1] or 0 for r in rows), dtype=np.float64, count=len(rows)),
+            np.fromiter((r[2] or 0 for r in rows), dtype=np.float64, count=len(rows)))
+
+
+def load_time_series(db: Session, tenant_id: int, metric: str, start: datetime, end: datetime,
+                     interval: str = "daily", tz: Optional[str] = None,
+                     percentiles: Sequence[float] = ()) -> TimeSeries:
+    """``metric`` per local ``interval`` over [start, end) (naive UTC)
+
+    ``metric`` is one of ``METRICS``; ``tz`` defaults to the tenant's zone.
+    ``percentiles`` apply to ``resolution_hours`` only.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric: {metric}")
+    if interval not in INTERVALS:
+        raise ValueError(f"Unknown interval: {interval}")
+    tz = tz or tenant_timezone(db, tenant_id)
+    if percentiles:
+        if metric != "resolution_hours":
+            raise ValueError("Percentiles are only available for resolution_hours")
+        seconds, values = _raw_events(db, tenant_id, metric, (start, end))
+        return aggregate(seconds, start, end, interval, tz, values=values,
+                         percentiles=percentiles)
+
+    if metric == "reports":
+        daily, hourly, raw = [], [], [(start, end)]
+    else:
+        daily, hourly, raw = split_span((start, end), get_watermark(db))
+        whole_hours, utc = _whole_hour_offsets(tz, start, end)
+        if not whole_hours:
+            daily, hourly, raw = [], [], [(start, end)]
+        elif not utc or interval == "hourly":
+            hourly = daily + hourly
+            daily = []
+
+    parts = [_raw_events(db, tenant_id, metric, span) + (None,) for span in raw]
+    for model, spans in ((IssueRollupDailyModel, daily), (IssueRollupHourlyModel, hourly)):
+        for span in spans:
+            seconds, counts, sums = _rollup_rows(db, model, tenant_id, metric, span)
+            parts.append((seconds, sums, counts))
+    seconds = np.concatenate([p[0] for p in parts]) if parts else np.zeros(0, dtype=np.int64)
+    values = np.concatenate([p[1] for p in parts]) if parts else np.zeros(0)
+    counts = np.concatenate([np.ones(len(p[0])) if p[2] is None else p[2] for p in parts]) \
+        if parts else np.zeros(0)
+    return aggregate(seconds, start, end, interval, tz, values=values, counts=counts)
+
+
+def build_time_series(db: Session, tenant_id: int, metric: str, days: int = 30,
+                      interval: str = "daily", now: Optional[datetime] = None,
+                      percentiles: Sequence[float] = ()) -> List[Dict]:
+    """Time series points for a metric over the last ``days``
+
+    The first bucket starts at the local bucket boundary on or before
+    ``now - days``; the last one holds the events up to ``now``.
+    """
+    now = now or datetime.utcnow()
+    tz = tenant_timezone(db, tenant_id)
+    first = floor_buckets(to_local([_epoch_seconds([now - timedelta(days=days)])[0]], tz),
+                          interval)
+    start_s = int(to_utc(first.view(np.int64), tz)[0])
+    start = datetime.fromtimestamp(start_s, timezone.utc).replace(tzinfo=None)
+    return load_time_series(db, tenant_id, metric, start, now, interval, tz,
+                            percentiles).to_points()
+
+
+def daily_issue_counts(columns: IssueColumns, tenant_id: int, start: datetime,
+                       days: int) -> Dict[str, np.ndarray]:
+    """Issues opened and resolved per UTC day from ``start`` (a ``map_shared`` kernel)"""
+    mask = columns.tenant_id == tenant_id
+    origin = np.datetime64(start, "s")
+    counts = {}
+    for name, stamps in (("opened", columns.created_at[mask]),
+                         ("resolved", columns.resolved_at[mask])):
+        stamps = stamps[~np.isnat(stamps)]
+        offsets = (stamps - origin) // np.timedelta64(1, "D")
+        offsets = offsets[(offsets >= 0) & (offsets < days)]
+        counts[name] = np.bincount(offsets, minlength=days)
+    return counts
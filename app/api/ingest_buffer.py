@@ -0,0 +1,362 @@
+"""Write-behind buffer for report ingestion
+
+Reports get their id from a pre-reserved block of the ``reports`` sequence,
+are acknowledged immediately and are written to the database in batches by
+a background task, so submit latency no longer includes a commit. Memory is
+bounded: once ``max_pending`` reports are waiting, ``submit`` raises
+``BufferFull`` and the API answers 503. With a spill path, every accepted
+report is appended to a local JSONL log before it is acknowledged and the log
+is replayed on the next start; replays insert with ``skip_existing`` so rows
+that did reach the database are not duplicated.
+
+The log is a series of segment files (``{spill_path}.000001``, ...). A new
+segment starts every ``batch_size`` reports, and a segment is deleted once all
+of its reports are committed, so the log holds roughly the pending reports
+rather than everything accepted since the buffer was last empty.
+
+A batch that fails with one of ``permanent_errors`` (e.g. a foreign key
+violation) is retried in halves down to single rows; rows that still fail are
+appended to the dead-letter log (or printed) and released, so one bad report
+cannot stall the buffer. Other errors retry the rest of the batch with backoff.
+"""
+import asyncio
+import glob
+import json
+import os
+import re
+from collections import deque
+from datetime import datetime
+from typing import Callable, Deque, List, Optional, Tuple, Type
+
+from app.config import settings
+
+
+class BufferFull(Exception):
+    """Raised when the buffer is at capacity; the caller should retry later"""
+
+    def __init__(self, retry_after: float):
+        super().__init__("Ingestion buffer is full")
+        self.retry_after = retry_after
+
+
+class IngestBuffer:
+    """Assigns report ids up front and persists reports in the background
+
+    ``flush_fn(rows)`` writes a batch of row dicts (ids included) and runs in a
+    worker thread; ``reserve_ids(count)`` returns ``count`` fresh ids.
+    ``permanent_errors`` are the exceptions retrying the same rows can't fix.
+    """
+
+    def __init__(
+        self,
+        flush_fn: Callable[[List[dict]], None],
+        reserve_ids: Callable[[int], List[int]],
+        max_pending: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 0.2,
+        spill_path: Optional[str] = None,
+        spill_fsync: bool = False,
+        id_block_size: int = 1000,
+        retry_base_delay: float = 0.5,
+        retry_max_delay: float = 10.0,
+        permanent_errors: Tuple[Type[Exception], ...] = (),
+        dead_letter_path: Optional[str] = None,
+    ):
+        self.flush_fn = flush_fn
+        self.reserve_ids = reserve_ids
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spill_path = spill_path
+        self.spill_fsync = spill_fsync
+        self.id_block_size = id_block_size
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.permanent_errors = permanent_errors
+        self.dead_letter_path = dead_letter_path
+
+        self._pending: Deque[dict] = deque()
+        self._in_flight = 0
+        self._ids: Deque[int] = deque()
+        self._id_lock: Optional[asyncio.Lock] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._spill = None
+        self._segments: Deque[list] = deque()  # [path, unflushed rows]; last is active
+        self._segment_rows = 0  # rows written to the active segment
+        self._closing = False
+        self._failures = 0
+        self.flushed = 0
+        self.rejected = 0
+        self.replayed = 0
+        self.dead_lettered = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def pending(self) -> int:
+        """Accepted reports not yet committed"""
+        return len(self._pending) + self._in_flight
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.pending,
+            "flushed": self.flushed,
+            "rejected": self.rejected,
+            "replayed": self.replayed,
+            "flush_failures": self._failures,
+            "dead_lettered": self.dead_lettered,
+            "spill_segments": len(self._segments),
+        }
+
+    async def start(self):
+        """Replay any spilled reports, then start the background flusher"""
+        if self.running:
+            return
+        self._closing = False
+        self._id_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        if self.spill_path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.spill_path)), exist_ok=True)
+            for path in self._spill_segments():
+                rows = self._read_spill(path)
+                self._pending.extend(rows)
+                self._segments.append([path, len(rows)])
+            self.replayed = len(self._pending)
+            self._open_segment()
+        self._task = asyncio.create_task(self._run())
+        if self._pending:
+            self._wakeup.set()
+
+    async def submit(self, report: dict) -> int:
+        """Accept one report and return its id without waiting for the commit"""
+        return (await self.submit_many([report]))[0]
+
+    async def submit_many(self, reports: List[dict]) -> List[int]:
+        """Accept reports all-or-nothing; raises BufferFull if they don't fit"""
+        if not self.running:
+            raise RuntimeError("IngestBuffer is not running")
+        if self.pending + len(reports) > self.max_pending:
+            self.rejected += len(reports)
+            raise BufferFull(retry_after=max(self.flush_interval, 1.0))
+
+        ids = await self._allocate(len(reports))
+        now = datetime.utcnow()
+        rows = [{**report, "id": report_id, "submitted_at": now}
+                for report, report_id in zip(reports, ids)]
+        if self._spill is not None:
+            self._write_spill(rows)
+        self._pending.extend(rows)
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+        return ids
+
+    async def drain(self, timeout: Optional[float] = None):
+        """Flush everything accepted so far and stop the flusher"""
+        if self._task is None:
+            return
+        self._closing = True
+        self._wakeup.set()
+        drained = True
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout)
+        except asyncio.TimeoutError:
+            # Whatever is left stays in the spill segments for the next start
+            self._task.cancel()
+            drained = False
+        self._task = None
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+            if drained and not self._pending:
+                for path, _ in self._segments:
+                    os.remove(path)
+            self._segments.clear()
+
+    async def _allocate(self, count: int) -> List[int]:
+        async with self._id_lock:
+            while len(self._ids) < count:
+                block = max(self.id_block_size, count - len(self._ids))
+                self._ids.extend(await asyncio.to_thread(self.reserve_ids, block))
+            return [self._ids.popleft() for _ in range(count)]
+
+    async def _run(self):
+        delay = self.retry_base_delay
+        while True:
+            if not self._pending:
+                if self._closing:
+                    return
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            if len(self._pending) < self.batch_size and not self._closing:
+                # Give a partial batch until the interval ends to fill up
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+            batch = [self._pending.popleft()
+                     for _ in range(min(self.batch_size, len(self._pending)))]
+            self._in_flight = len(batch)
+            handled, error = await self._flush_batch(batch)
+            self._in_flight = 0
+            if self._spill is not None and handled:
+                self._release_spill(handled)
+            if error is not None:
+                self._failures += 1
+                self._pending.extendleft(reversed(batch[handled:]))
+                print(f"Error flushing {len(batch) - handled} buffered reports: {error}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.retry_max_delay)
+                continue
+            delay = self.retry_base_delay
+
+    async def _flush_batch(self, batch: List[dict]) -> Tuple[int, Optional[Exception]]:
+        """Flush ``batch``, splitting it to isolate rows that can never be written
+
+        Returns how many leading rows were committed or dead-lettered, and the
+        error that stopped the rest, if any.
+        """
+        handled = 0
+        chunks = [batch]
+        while chunks:
+            chunk = chunks.pop()
+            try:
+                await asyncio.to_thread(self.flush_fn, chunk)
+            except self.permanent_errors as e:
+                if len(chunk) > 1:
+                    middle = len(chunk) // 2
+                    chunks += [chunk[middle:], chunk[:middle]]
+                    continue
+                self._dead_letter(chunk[0], e)
+            except Exception as e:
+                return handled, e
+            else:
+                self.flushed += len(chunk)
+            handled += len(chunk)
+        return handled, None
+
+    def _dead_letter(self, row: dict, error: Exception):
+        self.dead_lettered += 1
+        line = json.dumps({**row, "error": str(error)}, default=_encode)
+        if self.dead_letter_path:
+            with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            print(f"Dead-lettered buffered report {row.get('id')}: {error}")
+        else:
+            print(f"Dropping buffered report that cannot be written: {line}")
+
+    def _spill_segments(self) -> List[str]:
+        """Existing segment files, oldest first (plus a pre-segment spill file)"""
+        numbered = [path for path in glob.glob(glob.escape(self.spill_path) + ".*")
+                    if re.fullmatch(r"\.\d+", path[len(self.spill_path):])]
+        numbered.sort(key=lambda path: int(path[len(self.spill_path) + 1:]))
+        legacy = [self.spill_path] if os.path.exists(self.spill_path) else []
+        return legacy + numbered
+
+    def _open_segment(self):
+        """Start a new active segment after the newest existing one"""
+        last = self._segments[-1][0] if self._segments else self.spill_path
+        number = int(last[len(self.spill_path) + 1:] or 0) + 1
+        path = f"{self.spill_path}.{number:06d}"
+        self._spill = open(path, "a", encoding="utf-8")
+        self._segments.append([path, 0])
+        self._segment_rows = 0
+
+    def _write_spill(self, rows: List[dict]):
+        for row in rows:
+            self._spill.write(json.dumps(row, default=_encode) + "\n")
+        self._spill.flush()
+        if self.spill_fsync:
+            os.fsync(self._spill.fileno())
+        self._segments[-1][1] += len(rows)
+        self._segment_rows += len(rows)
+        if self._segment_rows >= self.batch_size:
+            self._spill.close()
+            self._open_segment()
+            self._release_spill(0)  # drop the old segment if it is already committed
+
+    def _release_spill(self, count: int):
+        """Account for ``count`` committed rows, deleting segments they emptied
+
+        Rows are flushed in the order they were spilled, so they come off the
+        oldest segments first.
+        """
+        while self._segments:
+            path, unflushed = self._segments[0]
+            taken = min(count, unflushed)
+            self._segments[0][1] -= taken
+            count -= taken
+            if self._segments[0][1] or len(self._segments) == 1:
+                break
+            self._segments.popleft()
+            os.remove(path)
+
+    def _read_spill(self, path: str) -> List[dict]:
+        rows = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    # A torn final line from a crash mid-write was never acknowledged
+                    continue
+                if row.get("submitted_at"):
+                    row["submitted_at"] = datetime.fromisoformat(row["submitted_at"])
+                rows.append(row)
+        return rows
+
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _flush_to_database(rows: List[dict]):
+    from app.db.base import SessionLocal
+    from app.db.repositories import ReportRepository
+
+    db = SessionLocal()
+    try:
+        ReportRepository.bulk_create(db, rows, skip_existing=True)
+    finally:
+        db.close()
+
+
+def _reserve_from_database(count: int) -> List[int]:
+    from app.db.base import SessionLocal
+    from app.db.repositories import ReportRepository
+
+    db = SessionLocal()
+    try:
+        ids = ReportRepository.reserve_ids(db, count)
+        db.commit()
+        return ids
+    finally:
+        db.close()
+
+
+def create_ingest_buffer() -> IngestBuffer:
+    """Buffer wired to the application database and ingestion settings"""
+    from sqlalchemy.exc import DataError, IntegrityError
+
+    return IngestBuffer(
+        flush_fn=_flush_to_database,
+        reserve_ids=_reserve_from_database,
+        max_pending=settings.ingest_buffer_max_pending,
+        batch_size=settings.ingest_buffer_batch_size,
+        flush_interval=settings.ingest_buffer_flush_interval_seconds,
+        spill_path=settings.ingest_spill_path,
+        spill_fsync=settings.ingest_spill_fsync,
+        id_block_size=settings.ingest_id_block_size,
+        permanent_errors=(DataError, IntegrityError),
+        dead_letter_path=settings.ingest_dead_letter_path,
+    )
@@ -0,0 +1,33 @@
+"""Shared helpers for paginated and streamed list endpoints"""
+from typing import Iterable, Iterator, Optional, Type
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from app.db.pagination import SortKey, decode_cursor, encode_cursor
+
+
+def parse_cursor(kind: str, cursor: Optional[str]) -> Optional[SortKey]:
+    """Decode a client-supplied cursor, answering 400 if it is not one of ours"""
+    if not cursor:
+        return None
+    try:
+        return decode_cursor(kind, cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def next_cursor(kind: str, key: Optional[SortKey]) -> Optional[str]:
+    return encode_cursor(kind, key) if key is not None else None
+
+
+def ndjson_stream(rows: Iterable, model: Type[BaseModel], chunk_rows: int = 500) -> Iterator[bytes]:
+    """Serialize ORM rows as NDJSON, a few hundred lines per network write"""
+    lines = []
+    for row in rows:
+        lines.append(model.model_validate(row).model_dump_json())
+        if len(lines) >= chunk_rows:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
@@ -0,0 +1,34 @@
+"""Tenant dashboard endpoint definitions
+
+One query (``get_dashboard_counts``) answers the whole dashboard instead of a
+round trip per figure. Responses are cached per tenant in ``dashboard_cache``
+for ``DASHBOARD_CACHE_TTL_SECONDS`` and carry an ETag, like /scores.
+"""
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.orm import Session
+
+from app.analytics.issue_stats import issue_stats_from_counts
+from app.analytics.performance import sla_metrics_from_counts
+from app.db.queries import get_dashboard_counts
+from app.db.routing import get_read_db
+from app.utils.read_cache import cached_response, dashboard_cache
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+
+@router.get("/{tenant_id}")
+async def get_dashboard(tenant_id: int, request: Request, days: int = Query(30, ge=1, le=365),
+                        db: Session = Depends(get_read_db)):
+    """Issue counts, trend and SLA figures for a tenant
+
+    Issue counts cover every issue; ``trend`` compares issues created in the
+    last ``days`` with the ``days`` before, and ``sla`` covers SLA results
+    calculated in the last ``days``.
+    """
+    def load():
+        counts = get_dashboard_counts(db, tenant_id, days)
+        return {"tenant_id": tenant_id, "days": days, **issue_stats_from_counts(counts),
+                "sla": sla_metrics_from_counts(counts)}
+
+    entry = await dashboard_cache.get_or_load(tenant_id, f"summary:{days}", load)
+    return cached_response(request, entry)
@@ -1,6 +1,8 @@
 """Health check endpoints"""
 from fastapi import APIRouter
 
+from app.db.routing import router as db_router
+
 router = APIRouter(tags=["health"])
 
 
@@ -15,3 +17,9 @@ async def readiness_check():
     """Check if service is ready to accept requests"""
     # TODO: Check DB connection, etc.
     return {"status": "ready"}
+
+
+@router.get("/health/db")
+async def database_health():
+    """Reads, lag and checked-out connections per database pool"""
+    return db_router.stats()
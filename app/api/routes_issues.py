@@ -1,15 +1,42 @@
 """Issues endpoint definitions"""
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from app.api.listing import ndjson_stream, next_cursor, parse_cursor
+from app.api.schemas import IssueOut, IssuePage
+from app.db.async_base import get_async_db
+from app.db.async_repositories import AsyncIssueRepository
+from app.db.base import get_db
+from app.db.repositories import IssueRepository
 
 router = APIRouter(prefix="/issues", tags=["issues"])
 
 
-@router.get("/")
-async def list_issues(tenant_id: int = None, status: str = None):
-    """List all issues with optional filtering"""
-    # TODO: Implement issue listing
-    return {"issues": []}
+@router.get("/", response_model=IssuePage)
+async def list_issues(tenant_id: Optional[int] = None, status: Optional[str] = None,
+                      cursor: Optional[str] = None, limit: int = Query(100, ge=1, le=1000),
+                      db: AsyncSession = Depends(get_async_db)):
+    """List issues newest first; pass ``next_cursor`` back as ``cursor`` for the next page"""
+    after = parse_cursor("issues", cursor)
+    issues, last_key = await AsyncIssueRepository.list_page(db, tenant_id, status, after, limit)
+    return IssuePage(
+        issues=[IssueOut.model_validate(issue) for issue in issues],
+        limit=limit,
+        has_more=last_key is not None,
+        next_cursor=next_cursor("issues", last_key),
+        total_estimate=await AsyncIssueRepository.estimate_total(db, tenant_id, status),
+    )
+
+
+@router.get("/export")
+def export_issues(tenant_id: Optional[int] = None, status: Optional[str] = None,
+                  db: Session = Depends(get_db)):
+    """Stream every issue (oldest first) as NDJSON without buffering the result"""
+    rows = IssueRepository.stream(db, tenant_id, status)
+    return StreamingResponse(ndjson_stream(rows, IssueOut), media_type="application/x-ndjson")
 
 
 @router.get("/{issue_id}")
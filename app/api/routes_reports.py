@@ -1,15 +1,110 @@
 """Reports endpoint definitions"""
-from fastapi import APIRouter, HTTPException
-from typing import List
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from app.api.ingest_buffer import BufferFull
+from app.api.listing import ndjson_stream, next_cursor, parse_cursor
+from app.api.schemas import (
+    BulkReportsSubmitted,
+    ReportCreate,
+    ReportOut,
+    ReportPage,
+    ReportSubmitted,
+)
+from app.config import settings
+from app.db.async_base import get_async_db
+from app.db.async_repositories import AsyncReportRepository
+from app.db.base import get_db
+from app.db.repositories import ReportRepository
 
 router = APIRouter(prefix="/reports", tags=["reports"])
 
+_report_list = TypeAdapter(List[ReportCreate])
+
+
+def _parse_bulk_body(body: bytes, content_type: str) -> list:
+    """Decode a JSON array (or {"reports": [...]}) or NDJSON body into raw items"""
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        items = []
+        for line_number, line in enumerate(body.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"Invalid JSON on line {line_number}")
+        return items
+
+    try:
+        payload = json.loads(body or b"[]")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
+    if isinstance(payload, dict):
+        payload = payload.get("reports")
+    if not isinstance(payload, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array of reports")
+    return payload
+
+
+async def _store(request: Request, response: Response, db: AsyncSession,
+                 rows: List[dict]) -> List[int]:
+    """Write reports now, or hand them to the write-behind buffer (202 Accepted)"""
+    buffer = getattr(request.app.state, "ingest_buffer", None)
+    if buffer is None:
+        return await AsyncReportRepository.bulk_create(db, rows)
+    try:
+        ids = await buffer.submit_many(rows)
+    except BufferFull as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Ingestion is at capacity, retry shortly",
+            headers={"Retry-After": str(int(e.retry_after + 0.999))},
+        )
+    response.status_code = 202
+    return ids
 
-@router.post("/")
-async def submit_report(report_data: dict):
+
+@router.post("/", status_code=201, response_model=ReportSubmitted)
+async def submit_report(report: ReportCreate, request: Request, response: Response,
+                        db: AsyncSession = Depends(get_async_db)):
     """Submit a new incident report"""
-    # TODO: Implement report ingestion
-    return {"message": "Report submitted", "id": 1}
+    report_id = (await _store(request, response, db, [report.model_dump()]))[0]
+    return ReportSubmitted(id=report_id)
+
+
+@router.post("/bulk", status_code=201, response_model=BulkReportsSubmitted)
+async def submit_reports_bulk(request: Request, response: Response,
+                              db: AsyncSession = Depends(get_async_db)):
+    """Submit many reports as a JSON array or NDJSON (application/x-ndjson)"""
+    items = _parse_bulk_body(await request.body(), request.headers.get("content-type", ""))
+    if not items:
+        raise HTTPException(status_code=400, detail="No reports in request body")
+    if len(items) > settings.bulk_ingest_max_reports:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.bulk_ingest_max_reports} reports per request"
+        )
+
+    try:
+        reports = _report_list.validate_python(items)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+
+    ids = await _store(request, response, db, [report.model_dump() for report in reports])
+    return BulkReportsSubmitted(count=len(ids), ids=ids)
+
+
+@router.get("/export")
+def export_reports(tenant_id: Optional[int] = None, db: Session = Depends(get_db)):
+    """Stream every report (oldest first) as NDJSON without buffering the result"""
+    rows = ReportRepository.stream(db, tenant_id)
+    return StreamingResponse(ndjson_stream(rows, ReportOut), media_type="application/x-ndjson")
 
 
 @router.get("/{report_id}")
@@ -19,8 +114,17 @@ async def get_report(report_id: int):
     return {"id": report_id, "status": "pending"}
 
 
-@router.get("/")
-async def list_reports(tenant_id: int = None, skip: int = 0, limit: int = 100):
-    """List all reports with optional filtering"""
-    # TODO: Implement report listing
-    return {"reports": []}
+@router.get("/", response_model=ReportPage)
+async def list_reports(tenant_id: Optional[int] = None, cursor: Optional[str] = None,
+                       limit: int = Query(100, ge=1, le=1000),
+                       db: AsyncSession = Depends(get_async_db)):
+    """List reports newest first; pass ``next_cursor`` back as ``cursor`` for the next page"""
+    after = parse_cursor("reports", cursor)
+    reports, last_key = await AsyncReportRepository.list_page(db, tenant_id, after, limit)
+    return ReportPage(
+        reports=[ReportOut.model_validate(report) for report in reports],
+        limit=limit,
+        has_more=last_key is not None,
+        next_cursor=next_cursor("reports", last_key),
+        total_estimate=await AsyncReportRepository.estimate_total(db, tenant_id),
+    )
@@ -1,26 +1,93 @@
-"""Scores and dashboard endpoint definitions"""
-from fastapi import APIRouter
-from typing import List
+"""Scores and dashboard endpoint definitions
+
+Responses are served from ``scores_cache`` (per-tenant namespace, invalidated
+when the score worker writes new rows) and carry an ETag, so dashboards that
+send ``If-None-Match`` get a 304 until the scores change. Misses read from a
+replica that already has the tenant's latest scores (app/db/routing.py).
+"""
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from app.analytics.rankings import leaderboards
+from app.analytics.score_engine import METRIC_TYPES
+from app.db.models import AreaModel
+from app.db.queries import get_latest_scores
+from app.db.routing import constrain_read, get_read_db
+from app.utils.cache import TTLCache
+from app.utils.read_cache import cached_response, scores_cache
 
 router = APIRouter(prefix="/scores", tags=["scores"])
 
+# Areas never change tenant, so this mapping only needs a size bound
+_area_tenants = TTLCache(max_entries=50000)
+
+
+def _score_body(scores: dict, **ids) -> dict:
+    return {
+        **ids,
+        "scores": {metric: value["score"] for metric, value in scores.items()},
+        "calculated_at": max((v["calculated_at"] for v in scores.values()), default=None),
+    }
+
+
+def _area_tenant(db: Session, area_id: int) -> int:
+    tenant_id = _area_tenants.get(area_id)
+    if tenant_id is None:
+        area = db.get(AreaModel, area_id)
+        if area is None:
+            raise HTTPException(status_code=404, detail="Area not found")
+        tenant_id = area.tenant_id
+        _area_tenants.set(area_id, tenant_id)
+    return tenant_id
+
 
 @router.get("/tenant/{tenant_id}")
-async def get_tenant_scores(tenant_id: int):
+async def get_tenant_scores(tenant_id: int, request: Request,
+                            db: Session = Depends(get_read_db)):
     """Get performance scores for a tenant"""
-    # TODO: Implement score retrieval
-    return {"tenant_id": tenant_id, "scores": {}}
+    constrain_read(db, written_at=scores_cache.last_write(tenant_id))
+    entry = await scores_cache.get_or_load(tenant_id, "tenant", lambda: _score_body(
+        get_latest_scores(db, tenant_id), tenant_id=tenant_id
+    ))
+    return cached_response(request, entry)
 
 
 @router.get("/area/{area_id}")
-async def get_area_scores(area_id: int):
+async def get_area_scores(area_id: int, request: Request, db: Session = Depends(get_read_db)):
     """Get performance scores for an area"""
-    # TODO: Implement area score retrieval
-    return {"area_id": area_id, "scores": {}}
+    # The tenant isn't known before the first query, so wait for any scores write
+    constrain_read(db, written_at=scores_cache.last_write(None))
+    tenant_id = await asyncio.to_thread(_area_tenant, db, area_id)
+    entry = await scores_cache.get_or_load(tenant_id, f"area:{area_id}", lambda: _score_body(
+        get_latest_scores(db, tenant_id, area_id), area_id=area_id, tenant_id=tenant_id
+    ))
+    return cached_response(request, entry)
 
 
 @router.get("/leaderboard")
-async def get_leaderboard(tenant_id: int = None):
-    """Get rankings and leaderboard data"""
-    # TODO: Implement leaderboard
-    return {"leaderboard": []}
+async def get_leaderboard(request: Request, tenant_id: Optional[int] = None,
+                          metric_type: str = "overall", limit: int = Query(50, ge=1, le=500),
+                          offset: int = Query(0, ge=0),
+                          order: str = Query("top", pattern="^(top|bottom)$"),
+                          db: Session = Depends(get_read_db)):
+    """Get rankings and leaderboard data
+
+    ``order=top`` pages best first from ``offset``; ``order=bottom`` lists the
+    worst ``limit`` entries, worst first. Tied scores share a rank.
+    """
+    if metric_type not in METRIC_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unknown metric type: {metric_type}")
+
+    def load():
+        if order == "bottom":
+            rows = leaderboards.bottom(db, tenant_id, metric_type, limit)
+        else:
+            rows = leaderboards.top(db, tenant_id, metric_type, limit, offset)
+        return {"leaderboard": rows, "metric": metric_type}
+
+    key = f"leaderboard:{metric_type}:{order}:{offset}:{limit}"
+    entry = await scores_cache.get_or_load(tenant_id, key, load)
+    return cached_response(request, entry)
@@ -0,0 +1,65 @@
+"""Request/response models shared by the API routes"""
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class ReportCreate(BaseModel):
+    """Incoming incident report"""
+    tenant_id: int = Field(gt=0)
+    description: str = Field(min_length=10)
+    location: Optional[str] = Field(default=None, max_length=255)
+
+
+class ReportSubmitted(BaseModel):
+    message: str = "Report submitted"
+    id: int
+
+
+class BulkReportsSubmitted(BaseModel):
+    message: str = "Reports submitted"
+    count: int
+    ids: List[int]
+
+
+class ReportOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    tenant_id: Optional[int] = None
+    issue_id: Optional[int] = None
+    description: str
+    location: Optional[str] = None
+    submitted_at: Optional[datetime] = None
+    processed: Optional[bool] = None
+
+
+class IssueOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    tenant_id: Optional[int] = None
+    area_id: Optional[int] = None
+    category: Optional[str] = None
+    severity: Optional[str] = None
+    summary: Optional[str] = None
+    status: Optional[str] = None
+    created_at: Optional[datetime] = None
+    resolved_at: Optional[datetime] = None
+
+
+class ReportPage(BaseModel):
+    reports: List[ReportOut]
+    limit: int
+    has_more: bool
+    next_cursor: Optional[str] = None
+    total_estimate: int
+
+
+class IssuePage(BaseModel):
+    issues: List[IssueOut]
+    limit: int
+    has_more: bool
+    next_cursor: Optional[str] = None
+    total_estimate: int
@@ -1,6 +1,6 @@
 """Env-based app config loader"""
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -9,7 +9,116 @@ class Settings(BaseSettings):
     openai_base_url: str = "https://api.openai.com/v1"
     log_level: str = "INFO"
     environment: str = "development"
-    
+
+    # Database pools (sync engine, async engine and the psycopg2 pool share these).
+    # async_database_url defaults to database_url with the asyncpg/aiosqlite driver;
+    # set db_prepared_statement_cache_size to 0 behind PgBouncer in transaction mode.
+    async_database_url: Optional[str] = None
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout_seconds: float = 30.0
+    db_pool_recycle_seconds: int = 1800
+    db_statement_timeout_ms: Optional[int] = 30000
+    db_prepared_statement_cache_size: int = 100
+
+    # Read replicas for analytic reads (app/db/routing.py), e.g.
+    # DATABASE_REPLICA_URLS='["postgresql://...@replica-1/civicpulse"]'. A read uses a
+    # replica only while its lag is within the query's tolerance (default below).
+    database_replica_urls: List[str] = []
+    replica_max_lag_seconds: float = 5.0
+    replica_lag_check_seconds: float = 1.0
+
+    # Report ingestion
+    bulk_ingest_max_reports: int = 5000
+
+    # Write-behind ingestion buffer (ingest_spill_path enables crash recovery)
+    ingest_write_behind_enabled: bool = False
+    ingest_buffer_max_pending: int = 10000
+    ingest_buffer_batch_size: int = 500
+    ingest_buffer_flush_interval_seconds: float = 0.2
+    ingest_buffer_drain_timeout_seconds: float = 30.0
+    ingest_id_block_size: int = 1000
+    ingest_spill_path: Optional[str] = None
+    ingest_spill_fsync: bool = False
+    ingest_dead_letter_path: Optional[str] = None  # rows that can never be written
+
+    # Async LLM client limits
+    llm_timeout_seconds: float = 60.0
+    llm_max_concurrency: int = 8
+    llm_requests_per_minute: int = 500
+    llm_tokens_per_minute: int = 90000
+    llm_max_retries: int = 5
+    llm_retry_base_delay: float = 0.5
+    llm_retry_max_delay: float = 30.0
+
+    # LLM micro-batching
+    llm_batch_max_size: int = 20
+    llm_batch_max_wait_seconds: float = 0.5
+
+    # LLM result cache (llm_cache_url enables the shared SQL tier)
+    llm_cache_enabled: bool = True
+    llm_cache_max_entries: int = 10000
+    llm_cache_ttl_seconds: float = 7 * 24 * 3600
+    llm_cache_url: Optional[str] = None
+
+    # Deduplication candidate retrieval
+    llm_embedding_model: str = "text-embedding-3-small"
+    dedup_top_k: int = 10
+    dedup_candidate_threshold: float = 0.75  # below: no match, skip the LLM
+    dedup_match_threshold: float = 0.92  # at or above: match, skip the LLM
+    vector_index_ann_threshold: int = 5000
+    dedup_batch_size: int = 100
+
+    # Near-duplicate MinHash/LSH pre-filter (lsh_index_dir enables warm starts)
+    dedup_near_duplicate_jaccard: float = 0.8
+    minhash_num_perm: int = 128
+    lsh_bands: int = 32
+    lsh_index_dir: Optional[str] = None
+    dedup_index_sync_overlap_seconds: float = 300.0  # covers batches that commit late
+
+    # Worker runtime (pool sizes default to the CPU count)
+    worker_thread_pool_size: Optional[int] = None
+    worker_process_pool_size: Optional[int] = None
+    worker_jitter_ratio: float = 0.1  # each interval varies by up to this fraction
+    worker_shutdown_timeout_seconds: float = 60.0
+    worker_metrics_log_seconds: Optional[float] = 300.0
+    dedup_interval_seconds: float = 300.0
+    sla_interval_seconds: float = 900.0
+    score_interval_seconds: float = 3600.0
+    rollup_interval_seconds: float = 600.0
+
+    # Incremental SLA worker
+    sla_batch_size: int = 1000
+    sla_watermark_overlap_seconds: int = 300  # rescan for transactions that commit late
+    sla_breach_horizon_minutes: int = 60  # alert this long before a deadline
+
+    # SLA thresholds: rules match any of tenant_id/category/severity, most specific wins,
+    # e.g. SLA_THRESHOLD_RULES='[{"tenant_id": 3, "category": "water", "hours": 12}]'
+    sla_default_threshold_hours: float = 72.0
+    sla_threshold_rules: List[dict] = [{"severity": "critical", "hours": 24}]
+
+    # In-memory SLA breach scheduler (sla_scheduler_snapshot_path enables warm restarts)
+    sla_breach_scheduler_enabled: bool = False
+    sla_scheduler_max_issues: int = 1_000_000
+    sla_scheduler_sync_seconds: float = 5.0
+    sla_scheduler_snapshot_path: Optional[str] = None
+    sla_scheduler_snapshot_seconds: float = 300.0
+
+    # Performance scoring
+    score_window_days: int = 30
+
+    # /scores response cache (scores_cache_url: redis://... for a shared cache)
+    scores_cache_url: Optional[str] = None
+    scores_cache_ttl_seconds: float = 300.0
+    scores_cache_max_entries: int = 10000
+    # /dashboard responses share that backend. Nothing invalidates them when
+    # issues change, so this TTL bounds how stale a dashboard can be.
+    dashboard_cache_ttl_seconds: float = 60.0
+
+    # Dashboard rollups
+    rollup_grace_minutes: int = 5  # hours closer to now than this stay raw
+    rollup_chunk_hours: int = 24
+
     class Config:
         env_file = ".env"
 
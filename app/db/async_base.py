@@ -0,0 +1,93 @@
+"""Async SQLAlchemy engine and sessions for ``async def`` routes
+
+Postgres runs on asyncpg and SQLite on aiosqlite. The engine is created on
+first use, so sync-only processes (workers, scripts) never import either
+driver. Pool sizing, statement timeout and prepared-statement caching come
+from ``Settings`` (``db_*``).
+
+Sessions do not expire objects on commit: loading an expired attribute would
+need I/O outside an ``await``, which raises under asyncio.
+"""
+import threading
+from typing import AsyncIterator, Optional
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.config import settings
+from app.db.base import pool_options
+
+_ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+_engine: Optional[AsyncEngine] = None
+_session_factory: Optional[async_sessionmaker] = None
+_lock = threading.Lock()
+
+
+def async_url(url: str) -> str:
+    """``url`` with its driver swapped for the async one (asyncpg/aiosqlite)"""
+    parsed = make_url(url)
+    driver = _ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver for {parsed.get_backend_name()}")
+    parsed = parsed.set(drivername=f"{parsed.get_backend_name()}+{driver}")
+    if driver == "asyncpg":
+        # SQLAlchemy's own cache of asyncpg prepared statements, per connection
+        parsed = parsed.update_query_dict(
+            {"prepared_statement_cache_size": str(settings.db_prepared_statement_cache_size)}
+        )
+    return parsed.render_as_string(hide_password=False)
+
+
+def _connect_args(url: str) -> dict:
+    if make_url(url).get_backend_name() != "postgresql":
+        return {}
+    args = {"statement_cache_size": settings.db_prepared_statement_cache_size}
+    if settings.db_statement_timeout_ms:
+        args["server_settings"] = {"statement_timeout": str(settings.db_statement_timeout_ms)}
+    return args
+
+
+def create_async_db_engine(url: Optional[str] = None, **kwargs) -> AsyncEngine:
+    """Async engine for ``url`` (default: async_database_url, else database_url)"""
+    url = async_url(url or settings.async_database_url or settings.database_url)
+    options = {"pool_pre_ping": True, "connect_args": _connect_args(url), **pool_options(url)}
+    options.update(kwargs)
+    return create_async_engine(url, **options)
+
+
+def get_async_engine() -> AsyncEngine:
+    """The process-wide async engine, created on first use"""
+    global _engine, _session_factory
+    with _lock:
+        if _engine is None:
+            _engine = create_async_db_engine()
+            _session_factory = async_sessionmaker(_engine, expire_on_commit=False,
+                                                  autoflush=False)
+        return _engine
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    """New session on the process-wide async engine"""
+    get_async_engine()
+    return _session_factory()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Dependency for getting an async DB session"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def dispose_async_engine():
+    """Close pooled connections (app shutdown); the next use creates a new engine"""
+    global _engine, _session_factory
+    with _lock:
+        engine, _engine, _session_factory = _engine, None, None
+    if engine is not None:
+        await engine.dispose()
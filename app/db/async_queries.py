@@ -0,0 +1,52 @@
+"""Analytic queries on async sessions
+
+The queries in app/db/queries.py read through the rollup helpers
+(app/db/rollups.py), which take a sync ``Session``. Rather than fork that
+logic, each function runs through ``AsyncSession.run_sync``: the sync code
+executes on the session's async connection, and every database round trip
+is still awaited on the event loop (no worker thread involved).
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import queries
+
+
+async def get_issue_counts_by_category(db: AsyncSession, tenant_id: int) -> dict:
+    """Get issue counts grouped by category"""
+    return await db.run_sync(queries.get_issue_counts_by_category, tenant_id)
+
+
+async def get_sla_compliance_rate(db: AsyncSession, tenant_id: int, days: int = 30) -> float:
+    """Calculate SLA compliance rate for a tenant"""
+    return await db.run_sync(queries.get_sla_compliance_rate, tenant_id, days)
+
+
+async def get_average_resolution_time(db: AsyncSession, tenant_id: int, days: int = 30) -> float:
+    """Get average resolution time in hours"""
+    return await db.run_sync(queries.get_average_resolution_time, tenant_id, days)
+
+
+async def get_resolution_time_stats(db: AsyncSession, tenant_id: int, days: int = 30) -> dict:
+    """Count, mean and standard deviation of resolution time in hours"""
+    return await db.run_sync(queries.get_resolution_time_stats, tenant_id, days)
+
+
+async def get_open_issues_count(db: AsyncSession, tenant_id: int) -> int:
+    """Get count of open issues"""
+    return await db.run_sync(queries.get_open_issues_count, tenant_id)
+
+
+async def get_dashboard_counts(db: AsyncSession, tenant_id: int, days: int = 30) -> dict:
+    """Dashboard figures for a tenant in one round trip"""
+    return await db.run_sync(queries.get_dashboard_counts, tenant_id, days)
+
+
+async def get_latest_scores(db: AsyncSession, tenant_id: int, area_id: int = None) -> dict:
+    """Latest score per metric type for a tenant, or one of its areas"""
+    return await db.run_sync(queries.get_latest_scores, tenant_id, area_id)
+
+
+async def get_score_leaderboard(db: AsyncSession, tenant_id: int = None,
+                                metric_type: str = "overall", limit: int = 50) -> list:
+    """Areas of a tenant (or tenants, without ``tenant_id``) by latest score, best first"""
+    return await db.run_sync(queries.get_score_leaderboard, tenant_id, metric_type, limit)
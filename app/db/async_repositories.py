@@ -0,0 +1,211 @@
+"""CRUD SQL methods on async sessions
+
+Same operations and statements as app/db/repositories.py, awaited on an
+``AsyncSession`` (app/db/async_base.py) so ``async def`` routes never block
+the event loop on the database.
+"""
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import TenantModel, IssueModel, ReportModel
+from app.db.pagination import SortKey, estimate_count_async, keyset_page_async
+from app.db.repositories import IssueRepository, ReportRepository, SLAMetricRepository
+from app.db.rollups import mark_stale
+
+
+def _dialect(db: AsyncSession) -> str:
+    return db.get_bind().dialect.name
+
+
+class AsyncTenantRepository:
+    """Repository for tenant operations"""
+
+    @staticmethod
+    async def create(db: AsyncSession, name: str, type: str) -> TenantModel:
+        """Create a new tenant"""
+        tenant = TenantModel(name=name, type=type)
+        db.add(tenant)
+        await db.commit()
+        await db.refresh(tenant)
+        return tenant
+
+    @staticmethod
+    async def get_by_id(db: AsyncSession, tenant_id: int) -> Optional[TenantModel]:
+        """Get tenant by ID"""
+        return await db.get(TenantModel, tenant_id)
+
+    @staticmethod
+    async def list_all(db: AsyncSession) -> List[TenantModel]:
+        """List all tenants"""
+        return list((await db.execute(select(TenantModel))).scalars())
+
+
+class AsyncIssueRepository:
+    """Repository for issue operations"""
+
+    @staticmethod
+    async def create(db: AsyncSession, tenant_id: int, category: str, severity: str,
+                     area_id: Optional[int] = None, summary: Optional[str] = None) -> IssueModel:
+        """Create a new issue"""
+        issue = IssueModel(tenant_id=tenant_id, area_id=area_id, category=category,
+                           severity=severity, summary=summary)
+        db.add(issue)
+        await db.commit()
+        await db.refresh(issue)
+        return issue
+
+    @staticmethod
+    async def get_by_id(db: AsyncSession, issue_id: int) -> Optional[IssueModel]:
+        """Get issue by ID"""
+        return await db.get(IssueModel, issue_id)
+
+    @staticmethod
+    async def list_by_tenant(db: AsyncSession, tenant_id: int,
+                             status: Optional[str] = None) -> List[IssueModel]:
+        """List issues for a tenant"""
+        query = IssueRepository._tenant_query(tenant_id, status)
+        return list((await db.execute(query)).scalars())
+
+    @staticmethod
+    async def list_page(db: AsyncSession, tenant_id: Optional[int] = None,
+                        status: Optional[str] = None, after: Optional[SortKey] = None,
+                        limit: int = 100) -> Tuple[List[IssueModel], Optional[SortKey]]:
+        """One page of issues, newest first, after the (created_at, id) key ``after``"""
+        query = IssueRepository._tenant_query(tenant_id, status)
+        return await keyset_page_async(db, query, IssueModel.created_at, IssueModel.id,
+                                       after, limit)
+
+    @staticmethod
+    async def estimate_total(db: AsyncSession, tenant_id: Optional[int] = None,
+                             status: Optional[str] = None) -> int:
+        """Planner estimate of the number of matching issues"""
+        return await estimate_count_async(db, IssueRepository._tenant_query(tenant_id, status))
+
+    @staticmethod
+    async def stream(db: AsyncSession, tenant_id: Optional[int] = None,
+                     status: Optional[str] = None,
+                     batch_size: int = 1000) -> AsyncIterator[IssueModel]:
+        """Every matching issue, oldest first, fetched through a server-side cursor"""
+        query = IssueRepository._tenant_query(tenant_id, status).order_by(
+            IssueModel.created_at, IssueModel.id
+        )
+        return await db.stream_scalars(query.execution_options(yield_per=batch_size))
+
+    @staticmethod
+    async def set_status(db: AsyncSession, issue_id: int, status: str) -> Optional[IssueModel]:
+        """Change an issue's status; resolving stamps ``resolved_at``, reopening clears it"""
+        issue = await db.get(IssueModel, issue_id)
+        if issue is None:
+            return None
+        issue.status = status
+        if status == "resolved":
+            if issue.resolved_at is None:
+                issue.resolved_at = datetime.utcnow()
+                await db.run_sync(mark_stale, issue.resolved_at)
+        elif issue.resolved_at is not None:
+            await db.run_sync(mark_stale, issue.resolved_at)
+            issue.resolved_at = None
+        await db.commit()
+        return issue
+
+
+class AsyncReportRepository:
+    """Repository for report operations"""
+
+    @staticmethod
+    async def create(db: AsyncSession, tenant_id: int, description: str,
+                     location: Optional[str] = None) -> ReportModel:
+        """Create a new report"""
+        report_id = (await AsyncReportRepository.bulk_create(db, [{
+            "tenant_id": tenant_id,
+            "description": description,
+            "location": location,
+        }]))[0]
+        return await db.get(ReportModel, report_id)
+
+    @staticmethod
+    async def bulk_create(db: AsyncSession, rows: List[dict], commit: bool = True,
+                          skip_existing: bool = False) -> List[int]:
+        """Insert many reports, returning their ids in input order (see ReportRepository)"""
+        if not rows:
+            return []
+        stmt = ReportRepository._insert_stmt(_dialect(db), skip_existing)
+        ids = list((await db.execute(stmt, rows)).scalars())
+        if commit:
+            await db.commit()
+        return ids
+
+    @staticmethod
+    async def list_page(db: AsyncSession, tenant_id: Optional[int] = None,
+                        after: Optional[SortKey] = None,
+                        limit: int = 100) -> Tuple[List[ReportModel], Optional[SortKey]]:
+        """One page of reports, newest first, after the (submitted_at, id) key ``after``"""
+        query = ReportRepository._tenant_query(tenant_id)
+        return await keyset_page_async(db, query, ReportModel.submitted_at, ReportModel.id,
+                                       after, limit)
+
+    @staticmethod
+    async def estimate_total(db: AsyncSession, tenant_id: Optional[int] = None) -> int:
+        """Planner estimate of the number of matching reports"""
+        return await estimate_count_async(db, ReportRepository._tenant_query(tenant_id))
+
+    @staticmethod
+    async def stream(db: AsyncSession, tenant_id: Optional[int] = None,
+                     batch_size: int = 1000) -> AsyncIterator[ReportModel]:
+        """Every matching report, oldest first, fetched through a server-side cursor"""
+        query = ReportRepository._tenant_query(tenant_id).order_by(
+            ReportModel.submitted_at, ReportModel.id
+        )
+        return await db.stream_scalars(query.execution_options(yield_per=batch_size))
+
+    @staticmethod
+    async def reserve_ids(db: AsyncSession, count: int) -> List[int]:
+        """Reserve a block of report ids from the Postgres sequence"""
+        return list((await db.execute(ReportRepository._reserve_ids_query(count))).scalars())
+
+    @staticmethod
+    async def get_unprocessed(db: AsyncSession, limit: int = 100) -> List[ReportModel]:
+        """Get unprocessed reports"""
+        query = select(ReportModel).where(ReportModel.processed == False).limit(limit)  # noqa: E712
+        return list((await db.execute(query)).scalars())
+
+    @staticmethod
+    async def claim_unprocessed(db: AsyncSession, limit: int = 100) -> List[ReportModel]:
+        """Lock a batch of unprocessed reports, skipping rows other workers hold"""
+        return list((await db.execute(ReportRepository._claim_query(limit))).scalars())
+
+    @staticmethod
+    async def bulk_link(db: AsyncSession, links: List[Tuple[int, int]]) -> int:
+        """Link (report_id, issue_id) pairs and mark them processed in one UPDATE"""
+        if not links:
+            return 0
+        await db.execute(*ReportRepository._link_statement(_dialect(db), links))
+        return len(links)
+
+    @staticmethod
+    async def link_to_issue(db: AsyncSession, report_id: int, issue_id: int):
+        """Link a report to an issue"""
+        report = await db.get(ReportModel, report_id)
+        if report:
+            report.issue_id = issue_id
+            report.processed = True
+            await db.commit()
+
+
+class AsyncSLAMetricRepository:
+    """Repository for SLA results (one row per issue)"""
+
+    @staticmethod
+    async def upsert_many(db: AsyncSession, rows: List[dict]):
+        """Insert or update SLA results keyed on ``issue_id`` (see SLAMetricRepository)"""
+        if rows:
+            await db.run_sync(SLAMetricRepository.upsert_many, rows)
+
+    @staticmethod
+    async def delete_for_issues(db: AsyncSession, issue_ids: List[int]):
+        """Drop SLA results of issues that are no longer resolved"""
+        if issue_ids:
+            await db.run_sync(SLAMetricRepository.delete_for_issues, issue_ids)
@@ -1,13 +1,36 @@
 """SQLAlchemy Base"""
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
 
 Base = declarative_base()
 
+
+def pool_options(url: str) -> dict:
+    """Pool sizing from settings; SQLite keeps SQLAlchemy's defaults"""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+    }
+
+
+def connect_args(url: str) -> dict:
+    """Driver connect arguments (Postgres statement timeout)"""
+    if make_url(url).get_backend_name() != "postgresql" or not settings.db_statement_timeout_ms:
+        return {}
+    return {"options": f"-c statement_timeout={settings.db_statement_timeout_ms}"}
+
+
 # Create engine
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+engine = create_engine(settings.database_url, pool_pre_ping=True,
+                       connect_args=connect_args(settings.database_url),
+                       **pool_options(settings.database_url))
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -1,35 +1,59 @@
 """Postgres connection pool"""
+from contextlib import contextmanager
+
 import psycopg2
 from psycopg2 import pool
 from app.config import settings
 
 
 class DatabasePool:
-    """PostgreSQL connection pool manager"""
-    
+    """PostgreSQL connection pool manager
+
+    Uses ``ThreadedConnectionPool``: ``SimpleConnectionPool`` must not be
+    shared between threads, and every FastAPI threadpool route and worker
+    thread would share this one.
+    """
+
     def __init__(self):
         self.connection_pool = None
-    
+
     def initialize(self):
         """Initialize connection pool"""
+        options = {}
+        if settings.db_statement_timeout_ms:
+            options["options"] = f"-c statement_timeout={settings.db_statement_timeout_ms}"
         try:
-            self.connection_pool = psycopg2.pool.SimpleConnectionPool(
-                1, 20,  # min and max connections
-                settings.database_url
+            self.connection_pool = psycopg2.pool.ThreadedConnectionPool(
+                1, settings.db_pool_size + settings.db_max_overflow,  # min and max connections
+                settings.database_url,
+                **options
             )
             print("Database connection pool created")
         except Exception as e:
             print(f"Error creating connection pool: {e}")
             raise
-    
+
     def get_connection(self):
         """Get a connection from the pool"""
         return self.connection_pool.getconn()
-    
+
     def return_connection(self, connection):
         """Return a connection to the pool"""
         self.connection_pool.putconn(connection)
-    
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; commits on success, rolls back on error, always returns it"""
+        conn = self.get_connection()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.return_connection(conn)
+
     def close_all(self):
         """Close all connections"""
         if self.connection_pool:
@@ -0,0 +1,181 @@
+"""Versioned SQL migrations
+
+``sql/schema.sql`` is the idempotent baseline; files in ``sql/migrations``
+named ``NNN_description.sql`` are applied once each, in version order, and
+recorded in ``schema_migrations`` with a checksum so edits to an applied file
+are caught. A file whose first line is ``-- migrate: no-transaction`` runs
+statement by statement in autocommit mode, which ``CREATE INDEX CONCURRENTLY``
+requires; such files must be safe to rerun (``IF NOT EXISTS``), since a failure
+part-way leaves the earlier statements applied.
+"""
+import hashlib
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+SQL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "sql")
+SCHEMA_PATH = os.path.join(SQL_DIR, "schema.sql")
+MIGRATIONS_DIR = os.path.join(SQL_DIR, "migrations")
+
+NO_TRANSACTION_MARKER = "-- migrate: no-transaction"
+# Arbitrary key for pg_advisory_lock so concurrent deploys don't race
+_LOCK_KEY = 4_224_001
+
+_FILENAME = re.compile(r"^(\d+)_([\w-]+)\.sql$")
+_CONCURRENT_INDEX = re.compile(
+    r"CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+IF\s+NOT\s+EXISTS\s+(\w+)", re.IGNORECASE
+)
+
+
+class MigrationError(Exception):
+    """Raised for malformed, edited or failed migrations"""
+
+
+@dataclass
+class Migration:
+    version: int
+    name: str
+    sql: str
+
+    @property
+    def checksum(self) -> str:
+        return hashlib.sha256(self.sql.encode("utf-8")).hexdigest()
+
+    @property
+    def transactional(self) -> bool:
+        return not self.sql.lstrip().startswith(NO_TRANSACTION_MARKER)
+
+
+def load_migrations(directory: str = MIGRATIONS_DIR) -> List[Migration]:
+    """Parse migration files, ordered by version"""
+    migrations = []
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith(".sql"):
+            continue
+        match = _FILENAME.match(filename)
+        if not match:
+            raise MigrationError(f"Migration file name must look like 001_name.sql: {filename}")
+        with open(os.path.join(directory, filename), encoding="utf-8") as f:
+            migrations.append(Migration(int(match.group(1)), match.group(2), f.read()))
+    migrations.sort(key=lambda m: m.version)
+    versions = [m.version for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise MigrationError("Duplicate migration version")
+    return migrations
+
+
+def split_statements(sql: str) -> List[str]:
+    """Split a script on semicolons, dropping ``--`` comments
+
+    Good enough for DDL files; not for function bodies or quoted semicolons.
+    """
+    lines = [line.split("--", 1)[0] for line in sql.splitlines()]
+    statements = [s.strip() for s in "\n".join(lines).split(";")]
+    return [s for s in statements if s]
+
+
+def _ensure_table(conn: Connection):
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        " version INTEGER PRIMARY KEY,"
+        " name VARCHAR(255) NOT NULL,"
+        " checksum VARCHAR(64) NOT NULL,"
+        " applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+    ))
+
+
+def applied_migrations(conn: Connection) -> Dict[int, str]:
+    """Applied version -> checksum"""
+    rows = conn.execute(text("SELECT version, checksum FROM schema_migrations"))
+    return {row.version: row.checksum for row in rows}
+
+
+def _record(conn: Connection, migration: Migration):
+    conn.execute(
+        text("INSERT INTO schema_migrations (version, name, checksum) "
+             "VALUES (:version, :name, :checksum)"),
+        {"version": migration.version, "name": migration.name,
+         "checksum": migration.checksum},
+    )
+
+
+def _drop_invalid_index(conn: Connection, index_name: str):
+    """Remove an INVALID index left by an interrupted CONCURRENTLY build
+
+    ``IF NOT EXISTS`` would otherwise skip it and leave it unusable.
+    """
+    invalid = conn.execute(
+        text("SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"),
+        {"name": index_name},
+    ).scalar()
+    if invalid:
+        print(f"  dropping invalid index {index_name}")
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}"))
+
+
+def _apply(engine: Engine, migration: Migration):
+    if migration.transactional:
+        with engine.begin() as conn:
+            for statement in split_statements(migration.sql):
+                conn.execute(text(statement))
+            _record(conn, migration)
+        return
+
+    postgres = engine.dialect.name == "postgresql"
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for statement in split_statements(migration.sql):
+            index = _CONCURRENT_INDEX.search(statement)
+            if postgres and index:
+                _drop_invalid_index(conn, index.group(1))
+            conn.execute(text(statement))
+        _record(conn, migration)
+
+
+def run_migrations(engine: Engine, directory: str = MIGRATIONS_DIR,
+                   schema_path: str = SCHEMA_PATH, dry_run: bool = False) -> List[Migration]:
+    """Apply the baseline schema and every pending migration; returns those applied"""
+    migrations = load_migrations(directory)
+    postgres = engine.dialect.name == "postgresql"
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as lock_conn:
+        if postgres:
+            lock_conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": _LOCK_KEY})
+        try:
+            if schema_path and not dry_run:
+                with open(schema_path, encoding="utf-8") as f:
+                    baseline = f.read()
+                with engine.begin() as conn:
+                    for statement in split_statements(baseline):
+                        conn.execute(text(statement))
+            with engine.begin() as conn:
+                _ensure_table(conn)
+                applied = applied_migrations(conn)
+
+            pending = []
+            for migration in migrations:
+                checksum = applied.get(migration.version)
+                if checksum is None:
+                    pending.append(migration)
+                elif checksum != migration.checksum:
+                    raise MigrationError(
+                        f"Migration {migration.version}_{migration.name} was edited after "
+                        "it was applied; add a new migration instead"
+                    )
+
+            for migration in pending:
+                print(f"Applying {migration.version:03d}_{migration.name}"
+                      f"{'' if migration.transactional else ' (no transaction)'}")
+                if not dry_run:
+                    try:
+                        _apply(engine, migration)
+                    except Exception as e:
+                        raise MigrationError(
+                            f"Migration {migration.version}_{migration.name} failed: {e}"
+                        ) from e
+            return pending
+        finally:
+            if postgres:
+                lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _LOCK_KEY})
@@ -1,5 +1,5 @@
 """ORM models per table"""
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, DECIMAL, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, DECIMAL, Text, Float, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base import Base
@@ -11,6 +11,7 @@ class TenantModel(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
     type = Column(String(50), nullable=False)
+    timezone = Column(String(64), nullable=False, default="UTC")  # IANA name, for reporting
     created_at = Column(DateTime, default=datetime.utcnow)
     
     areas = relationship("AreaModel", back_populates="tenant")
@@ -31,15 +32,20 @@ class AreaModel(Base):
 
 class IssueModel(Base):
     __tablename__ = "issues"
+    __table_args__ = (
+        Index("idx_issues_updated", "updated_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     tenant_id = Column(Integer, ForeignKey("tenants.id"), index=True)
     area_id = Column(Integer, ForeignKey("areas.id"))
     category = Column(String(100))
     severity = Column(String(50))
+    summary = Column(Text, nullable=True)
     status = Column(String(50), default="open", index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     resolved_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     tenant = relationship("TenantModel", back_populates="issues")
     area = relationship("AreaModel", back_populates="issues")
@@ -65,7 +71,7 @@ class SLAMetricModel(Base):
     __tablename__ = "sla_metrics"
     
     id = Column(Integer, primary_key=True, index=True)
-    issue_id = Column(Integer, ForeignKey("issues.id"), index=True)
+    issue_id = Column(Integer, ForeignKey("issues.id"), index=True, unique=True)
     resolution_time_hours = Column(DECIMAL)
     met_sla = Column(Boolean)
     calculated_at = Column(DateTime, default=datetime.utcnow)
@@ -82,3 +88,60 @@ class PerformanceScoreModel(Base):
     score = Column(DECIMAL, nullable=False)
     metric_type = Column(String(100))
     calculated_at = Column(DateTime, default=datetime.utcnow)
+
+
+class LLMCacheModel(Base):
+    __tablename__ = "llm_cache"
+    
+    cache_key = Column(String(64), primary_key=True)
+    value = Column(Text, nullable=False)
+    expires_at = Column(DateTime, nullable=True, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class _IssueRollupColumns:
+    """Event totals for one tenant/area/category/severity bucket"""
+    id = Column(Integer, primary_key=True)
+    tenant_id = Column(Integer, nullable=False)
+    area_id = Column(Integer, nullable=True)
+    category = Column(String(100))
+    severity = Column(String(50))
+    bucket_start = Column(DateTime, nullable=False)
+    issues_created = Column(Integer, nullable=False, default=0)
+    issues_resolved = Column(Integer, nullable=False, default=0)
+    sla_met = Column(Integer, nullable=False, default=0)
+    sla_missed = Column(Integer, nullable=False, default=0)
+    resolution_count = Column(Integer, nullable=False, default=0)
+    resolution_hours_sum = Column(Float, nullable=False, default=0.0)
+    resolution_hours_sq_sum = Column(Float, nullable=False, default=0.0)
+
+
+class IssueRollupHourlyModel(_IssueRollupColumns, Base):
+    __tablename__ = "issue_rollups_hourly"
+    __table_args__ = (
+        Index("idx_rollups_hourly_tenant_bucket", "tenant_id", "bucket_start"),
+        Index("idx_rollups_hourly_bucket", "bucket_start"),
+    )
+
+
+class IssueRollupDailyModel(_IssueRollupColumns, Base):
+    __tablename__ = "issue_rollups_daily"
+    __table_args__ = (
+        Index("idx_rollups_daily_tenant_bucket", "tenant_id", "bucket_start"),
+        Index("idx_rollups_daily_bucket", "bucket_start"),
+    )
+
+
+class RollupWatermarkModel(Base):
+    __tablename__ = "rollup_watermarks"
+    
+    name = Column(String(100), primary_key=True)
+    watermark = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+class RollupStaleHourModel(Base):
+    __tablename__ = "rollup_stale_hours"
+    
+    bucket_start = Column(DateTime, primary_key=True)
+    marked_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -0,0 +1,91 @@
+"""Keyset pagination helpers
+
+List endpoints page newest first on ``(timestamp, id)``. A page ends with an
+opaque cursor holding the last row's sort key; the next page is the rows
+strictly before it, which an index on ``(tenant_id, timestamp DESC, id DESC)``
+serves without skipping over earlier pages. Totals come from the planner's
+row estimate rather than ``COUNT(*)``.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+SortKey = Tuple[datetime, int]
+
+
+def encode_cursor(kind: str, key: SortKey) -> str:
+    """Opaque, URL-safe cursor for the row with sort key ``key``"""
+    payload = json.dumps({"k": kind, "t": key[0].isoformat(), "i": key[1]},
+                         separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(kind: str, cursor: str) -> SortKey:
+    """Sort key from a cursor; raises ValueError if it is malformed or for another list"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if payload["k"] != kind:
+            raise ValueError(f"Cursor is not for {kind}")
+        return datetime.fromisoformat(payload["t"]), int(payload["i"])
+    except (KeyError, TypeError, UnicodeError, json.JSONDecodeError, binascii.Error) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def _keyset_query(query: Select, timestamp_column, id_column, after: Optional[SortKey],
+                  limit: int) -> Select:
+    if after is not None:
+        query = query.where(tuple_(timestamp_column, id_column) < tuple_(*after))
+    return query.order_by(timestamp_column.desc(), id_column.desc()).limit(limit + 1)
+
+
+def _keyset_result(rows: List, timestamp_column, id_column,
+                   limit: int) -> Tuple[list, Optional[SortKey]]:
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, (getattr(last, timestamp_column.key), getattr(last, id_column.key))
+
+
+def keyset_page(db: Session, query: Select, timestamp_column, id_column,
+                after: Optional[SortKey], limit: int) -> Tuple[list, Optional[SortKey]]:
+    """One page newest first, plus the sort key to continue from (None on the last page)"""
+    query = _keyset_query(query, timestamp_column, id_column, after, limit)
+    return _keyset_result(list(db.execute(query).scalars()), timestamp_column, id_column, limit)
+
+
+async def keyset_page_async(db: AsyncSession, query: Select, timestamp_column, id_column,
+                            after: Optional[SortKey], limit: int) -> Tuple[list, Optional[SortKey]]:
+    """``keyset_page`` on an async session"""
+    query = _keyset_query(query, timestamp_column, id_column, after, limit)
+    rows = list((await db.execute(query)).scalars())
+    return _keyset_result(rows, timestamp_column, id_column, limit)
+
+
+def estimate_count(db: Session, query: Select) -> int:
+    """Row count estimate for ``query``
+
+    On Postgres this is the planner's estimate from table statistics (no scan);
+    other databases get an exact count.
+    """
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return db.execute(select(func.count()).select_from(query.subquery())).scalar() or 0
+    compiled = query.compile(dialect=bind.dialect)
+    plan = db.connection().exec_driver_sql(
+        "EXPLAIN (FORMAT JSON) " + str(compiled), compiled.params
+    ).scalar()
+    plan = json.loads(plan) if isinstance(plan, str) else plan
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def estimate_count_async(db: AsyncSession, query: Select) -> int:
+    """``estimate_count`` on an async session"""
+    return await db.run_sync(estimate_count, query)
@@ -1,12 +1,30 @@
-"""Optimized analytic SQL queries"""
-from sqlalchemy import func, case
+"""Optimized analytic SQL queries
+
+Dashboard aggregates read the hourly/daily rollups (app/db/rollups.py) and
+only touch the raw tables for the span after the rollup watermark. Until the
+rollups have been built they fall back to the raw-table queries.
+"""
+import math
+
+from sqlalchemy import and_, func, case, select
 from sqlalchemy.orm import Session
 from app.db.models import IssueModel, ReportModel, SLAMetricModel, PerformanceScoreModel
+from app.db.rollups import get_watermark, rollup_totals
 from datetime import datetime, timedelta
 
 
 def get_issue_counts_by_category(db: Session, tenant_id: int) -> dict:
     """Get issue counts grouped by category"""
+    if get_watermark(db) is None:
+        return _issue_counts_by_category_raw(db, tenant_id)
+    totals = rollup_totals(db, tenant_id, group_by="category")
+    return {
+        category: values["issues_created"]
+        for category, values in totals.items() if values["issues_created"]
+    }
+
+
+def _issue_counts_by_category_raw(db: Session, tenant_id: int) -> dict:
     results = db.query(
         IssueModel.category,
         func.count(IssueModel.id).label('count')
@@ -22,6 +40,10 @@ def get_issue_counts_by_category(db: Session, tenant_id: int) -> dict:
 def get_sla_compliance_rate(db: Session, tenant_id: int, days: int = 30) -> float:
     """Calculate SLA compliance rate for a tenant"""
     cutoff_date = datetime.utcnow() - timedelta(days=days)
+    if get_watermark(db) is not None:
+        totals = rollup_totals(db, tenant_id, start=cutoff_date).get(None)
+        checked = totals["sla_met"] + totals["sla_missed"] if totals else 0
+        return totals["sla_met"] / checked if checked else 0.0
     
     result = db.query(
         func.avg(case((SLAMetricModel.met_sla == True, 1.0), else_=0.0)).label('compliance_rate')
@@ -38,6 +60,8 @@ def get_sla_compliance_rate(db: Session, tenant_id: int, days: int = 30) -> floa
 def get_average_resolution_time(db: Session, tenant_id: int, days: int = 30) -> float:
     """Get average resolution time in hours"""
     cutoff_date = datetime.utcnow() - timedelta(days=days)
+    if get_watermark(db) is not None:
+        return get_resolution_time_stats(db, tenant_id, days)["mean"]
     
     result = db.query(
         func.avg(SLAMetricModel.resolution_time_hours).label('avg_time')
@@ -51,9 +75,132 @@ def get_average_resolution_time(db: Session, tenant_id: int, days: int = 30) ->
     return result or 0.0
 
 
+def get_resolution_time_stats(db: Session, tenant_id: int, days: int = 30) -> dict:
+    """Count, mean and standard deviation of resolution time in hours"""
+    cutoff_date = datetime.utcnow() - timedelta(days=days)
+    totals = rollup_totals(db, tenant_id, start=cutoff_date).get(None)
+    count = totals["resolution_count"] if totals else 0
+    if not count:
+        return {"count": 0, "mean": 0.0, "stddev": 0.0}
+    mean = totals["resolution_hours_sum"] / count
+    variance = max(totals["resolution_hours_sq_sum"] / count - mean * mean, 0.0)
+    return {"count": count, "mean": mean, "stddev": math.sqrt(variance)}
+
+
 def get_open_issues_count(db: Session, tenant_id: int) -> int:
     """Get count of open issues"""
     return db.query(func.count(IssueModel.id)).filter(
         IssueModel.tenant_id == tenant_id,
         IssueModel.status == 'open'
     ).scalar()
+
+
+# Per-group figures of the dashboard query, summed across groups
+_DASHBOARD_COUNTS = ("issues", "open", "resolved", "current_period", "previous_period",
+                    "sla_checked", "sla_met", "resolution_count", "resolution_hours_sum")
+
+
+def _dashboard_query(tenant_id: int, cutoff: datetime, previous_cutoff: datetime):
+    """One pass over the tenant's issues and their SLA results
+
+    Every figure is a ``FILTER``ed aggregate per (category, severity); callers
+    add the few resulting rows up into totals and per-dimension counts.
+    """
+    in_window = SLAMetricModel.calculated_at >= cutoff
+    met = SLAMetricModel.met_sla == True  # noqa: E712
+    created = IssueModel.created_at
+    return select(
+        IssueModel.category,
+        IssueModel.severity,
+        func.count().label("issues"),
+        func.count().filter(IssueModel.status == "open").label("open"),
+        func.count().filter(IssueModel.status == "resolved").label("resolved"),
+        func.count().filter(created >= cutoff).label("current_period"),
+        func.count().filter(created >= previous_cutoff, created < cutoff).label("previous_period"),
+        func.count().filter(in_window).label("sla_checked"),
+        func.count().filter(in_window, met).label("sla_met"),
+        func.count(SLAMetricModel.resolution_time_hours).filter(in_window)
+        .label("resolution_count"),
+        func.sum(SLAMetricModel.resolution_time_hours).filter(in_window)
+        .label("resolution_hours_sum"),
+    ).outerjoin(
+        SLAMetricModel, SLAMetricModel.issue_id == IssueModel.id
+    ).where(
+        IssueModel.tenant_id == tenant_id
+    ).group_by(IssueModel.category, IssueModel.severity)
+
+
+def _add_counts(into: dict, row):
+    for name in _DASHBOARD_COUNTS:
+        into[name] = into.get(name, 0) + (row[name] or 0)
+
+
+def get_dashboard_counts(db: Session, tenant_id: int, days: int = 30,
+                         now: datetime = None) -> dict:
+    """Dashboard figures for a tenant in one round trip
+
+    Returns ``{"totals": counts, "by_category": {category: counts},
+    "by_severity": {severity: counts}}``. Issue counts cover every issue,
+    like ``get_issue_counts_by_category`` and ``get_open_issues_count``.
+    ``current_period``/``previous_period`` count issues created in the last
+    ``days`` and the ``days`` before that, and the SLA figures cover results
+    calculated in the last ``days`` (``get_sla_compliance_rate``).
+    """
+    cutoff = (now or datetime.utcnow()) - timedelta(days=days)
+    rows = db.execute(_dashboard_query(tenant_id, cutoff, cutoff - timedelta(days=days)))
+    totals, by_category, by_severity = dict.fromkeys(_DASHBOARD_COUNTS, 0), {}, {}
+    for row in rows.mappings():
+        _add_counts(totals, row)
+        _add_counts(by_category.setdefault(row["category"], {}), row)
+        _add_counts(by_severity.setdefault(row["severity"], {}), row)
+    for values in [totals, *by_category.values(), *by_severity.values()]:
+        hours, resolved = float(values.pop("resolution_hours_sum")), values["resolution_count"]
+        values["avg_resolution_hours"] = hours / resolved if resolved else 0.0
+    return {"totals": totals, "by_category": by_category, "by_severity": by_severity}
+
+
+def _latest_scores_query(entity_column, *filters):
+    """Each entity's most recent score per metric type"""
+    latest = select(
+        entity_column.label("entity_id"),
+        PerformanceScoreModel.metric_type,
+        func.max(PerformanceScoreModel.calculated_at).label("calculated_at"),
+    ).where(*filters).group_by(entity_column, PerformanceScoreModel.metric_type).subquery()
+    return select(PerformanceScoreModel).join(latest, and_(
+        entity_column == latest.c.entity_id,
+        PerformanceScoreModel.metric_type == latest.c.metric_type,
+        PerformanceScoreModel.calculated_at == latest.c.calculated_at,
+    )).where(*filters)
+
+
+def get_latest_scores(db: Session, tenant_id: int, area_id: int = None) -> dict:
+    """Latest score per metric type for a tenant, or one of its areas"""
+    scope = (PerformanceScoreModel.area_id == area_id if area_id is not None
+             else PerformanceScoreModel.area_id.is_(None))
+    query = _latest_scores_query(
+        PerformanceScoreModel.tenant_id, PerformanceScoreModel.tenant_id == tenant_id, scope
+    )
+    return {
+        row.metric_type: {"score": float(row.score), "calculated_at": row.calculated_at}
+        for row in db.execute(query).scalars()
+    }
+
+
+def get_score_leaderboard(db: Session, tenant_id: int = None, metric_type: str = "overall",
+                          limit: int = 50) -> list:
+    """Areas of a tenant (or tenants, without ``tenant_id``) by latest score, best first"""
+    filters = [PerformanceScoreModel.metric_type == metric_type]
+    if tenant_id is not None:
+        entity = PerformanceScoreModel.area_id
+        filters += [PerformanceScoreModel.tenant_id == tenant_id, entity.isnot(None)]
+    else:
+        entity = PerformanceScoreModel.tenant_id
+        filters.append(PerformanceScoreModel.area_id.is_(None))
+    query = _latest_scores_query(entity, *filters).order_by(
+        PerformanceScoreModel.score.desc(), entity
+    ).limit(limit)
+    return [
+        {"tenant_id": row.tenant_id, "area_id": row.area_id, "score": float(row.score),
+         "calculated_at": row.calculated_at}
+        for row in db.execute(query).scalars()
+    ]
@@ -1,7 +1,12 @@
 """CRUD SQL methods"""
+from datetime import datetime
+from sqlalchemy import Integer, column, delete, func, insert, or_, select, update, values
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
-from app.db.models import TenantModel, AreaModel, IssueModel, ReportModel
-from typing import List, Optional
+from app.db.models import TenantModel, AreaModel, IssueModel, ReportModel, SLAMetricModel
+from app.db.pagination import SortKey, estimate_count, keyset_page
+from app.db.rollups import mark_stale
+from typing import Iterator, List, Optional, Tuple
 
 
 class TenantRepository:
@@ -32,13 +37,14 @@ class IssueRepository:
     
     @staticmethod
     def create(db: Session, tenant_id: int, category: str, severity: str, 
-               area_id: Optional[int] = None) -> IssueModel:
+               area_id: Optional[int] = None, summary: Optional[str] = None) -> IssueModel:
         """Create a new issue"""
         issue = IssueModel(
             tenant_id=tenant_id,
             area_id=area_id,
             category=category,
-            severity=severity
+            severity=severity,
+            summary=summary
         )
         db.add(issue)
         db.commit()
@@ -57,6 +63,58 @@ class IssueRepository:
         if status:
             query = query.filter(IssueModel.status == status)
         return query.all()
+    
+    @staticmethod
+    def _tenant_query(tenant_id: Optional[int], status: Optional[str]):
+        query = select(IssueModel)
+        if tenant_id is not None:
+            query = query.where(IssueModel.tenant_id == tenant_id)
+        if status:
+            query = query.where(IssueModel.status == status)
+        return query
+    
+    @staticmethod
+    def list_page(db: Session, tenant_id: Optional[int] = None, status: Optional[str] = None,
+                  after: Optional[SortKey] = None,
+                  limit: int = 100) -> Tuple[List[IssueModel], Optional[SortKey]]:
+        """One page of issues, newest first, after the (created_at, id) key ``after``"""
+        query = IssueRepository._tenant_query(tenant_id, status)
+        return keyset_page(db, query, IssueModel.created_at, IssueModel.id, after, limit)
+    
+    @staticmethod
+    def estimate_total(db: Session, tenant_id: Optional[int] = None,
+                       status: Optional[str] = None) -> int:
+        """Planner estimate of the number of matching issues"""
+        return estimate_count(db, IssueRepository._tenant_query(tenant_id, status))
+    
+    @staticmethod
+    def stream(db: Session, tenant_id: Optional[int] = None, status: Optional[str] = None,
+               batch_size: int = 1000) -> Iterator[IssueModel]:
+        """Every matching issue, oldest first, fetched through a server-side cursor"""
+        query = IssueRepository._tenant_query(tenant_id, status).order_by(
+            IssueModel.created_at, IssueModel.id
+        )
+        return db.execute(query.execution_options(yield_per=batch_size)).scalars()
+    
+    @staticmethod
+    def set_status(db: Session, issue_id: int, status: str) -> Optional[IssueModel]:
+        """Change an issue's status; resolving stamps ``resolved_at``, reopening clears it
+
+        A set or cleared ``resolved_at`` marks its hour stale in the rollups.
+        """
+        issue = db.get(IssueModel, issue_id)
+        if issue is None:
+            return None
+        issue.status = status
+        if status == "resolved":
+            if issue.resolved_at is None:
+                issue.resolved_at = datetime.utcnow()
+                mark_stale(db, issue.resolved_at)
+        elif issue.resolved_at is not None:
+            mark_stale(db, issue.resolved_at)
+            issue.resolved_at = None
+        db.commit()
+        return issue
 
 
 class ReportRepository:
@@ -66,15 +124,83 @@ class ReportRepository:
     def create(db: Session, tenant_id: int, description: str, 
                location: Optional[str] = None) -> ReportModel:
         """Create a new report"""
-        report = ReportModel(
-            tenant_id=tenant_id,
-            description=description,
-            location=location
+        report_id = ReportRepository.bulk_create(db, [{
+            "tenant_id": tenant_id,
+            "description": description,
+            "location": location
+        }])[0]
+        return db.get(ReportModel, report_id)
+    
+    @staticmethod
+    def bulk_create(db: Session, rows: List[dict], commit: bool = True,
+                    skip_existing: bool = False) -> List[int]:
+        """Insert many reports, returning their ids in input order
+        
+        Rows are sent as multi-row ``INSERT ... VALUES ... RETURNING id``
+        statements (SQLAlchemy "insertmanyvalues"), so a batch costs a few
+        round trips and one commit instead of one transaction per report.
+        With ``skip_existing``, rows whose pre-assigned id already exists are
+        ignored (and left out of the result), which makes replays idempotent.
+        """
+        if not rows:
+            return []
+        stmt = ReportRepository._insert_stmt(db.get_bind().dialect.name, skip_existing)
+        ids = list(db.execute(stmt, rows).scalars())
+        if commit:
+            db.commit()
+        return ids
+    
+    @staticmethod
+    def _insert_stmt(dialect: str, skip_existing: bool):
+        if skip_existing:
+            if dialect == "postgresql":
+                stmt = postgresql.insert(ReportModel).on_conflict_do_nothing(index_elements=["id"])
+            elif dialect == "sqlite":
+                stmt = sqlite.insert(ReportModel).on_conflict_do_nothing(index_elements=["id"])
+            else:
+                raise NotImplementedError(f"skip_existing is not supported on {dialect}")
+        else:
+            stmt = insert(ReportModel)
+        return stmt.returning(ReportModel.id, sort_by_parameter_order=True)
+    
+    @staticmethod
+    def _tenant_query(tenant_id: Optional[int]):
+        query = select(ReportModel)
+        if tenant_id is not None:
+            query = query.where(ReportModel.tenant_id == tenant_id)
+        return query
+    
+    @staticmethod
+    def list_page(db: Session, tenant_id: Optional[int] = None, after: Optional[SortKey] = None,
+                  limit: int = 100) -> Tuple[List[ReportModel], Optional[SortKey]]:
+        """One page of reports, newest first, after the (submitted_at, id) key ``after``"""
+        query = ReportRepository._tenant_query(tenant_id)
+        return keyset_page(db, query, ReportModel.submitted_at, ReportModel.id, after, limit)
+    
+    @staticmethod
+    def estimate_total(db: Session, tenant_id: Optional[int] = None) -> int:
+        """Planner estimate of the number of matching reports"""
+        return estimate_count(db, ReportRepository._tenant_query(tenant_id))
+    
+    @staticmethod
+    def stream(db: Session, tenant_id: Optional[int] = None,
+               batch_size: int = 1000) -> Iterator[ReportModel]:
+        """Every matching report, oldest first, fetched through a server-side cursor"""
+        query = ReportRepository._tenant_query(tenant_id).order_by(
+            ReportModel.submitted_at, ReportModel.id
         )
-        db.add(report)
-        db.commit()
-        db.refresh(report)
-        return report
+        return db.execute(query.execution_options(yield_per=batch_size)).scalars()
+    
+    @staticmethod
+    def _reserve_ids_query(count: int):
+        sequence = func.pg_get_serial_sequence("reports", "id")
+        series = func.generate_series(1, count).table_valued("n")
+        return select(func.nextval(sequence)).select_from(series)
+    
+    @staticmethod
+    def reserve_ids(db: Session, count: int) -> List[int]:
+        """Reserve a block of report ids from the Postgres sequence"""
+        return list(db.execute(ReportRepository._reserve_ids_query(count)).scalars())
     
     @staticmethod
     def get_unprocessed(db: Session, limit: int = 100) -> List[ReportModel]:
@@ -83,6 +209,47 @@ class ReportRepository:
             ReportModel.processed == False
         ).limit(limit).all()
     
+    @staticmethod
+    def _claim_query(limit: int):
+        return select(ReportModel).where(
+            ReportModel.processed == False
+        ).order_by(
+            ReportModel.submitted_at, ReportModel.id
+        ).limit(limit).with_for_update(skip_locked=True)
+    
+    @staticmethod
+    def claim_unprocessed(db: Session, limit: int = 100) -> List[ReportModel]:
+        """Lock a batch of unprocessed reports, skipping rows other workers hold
+
+        Rows stay locked until the caller's transaction ends, so concurrent
+        workers always receive disjoint batches.
+        """
+        return list(db.execute(ReportRepository._claim_query(limit)).scalars())
+    
+    @staticmethod
+    def _link_statement(dialect: str, links: List[Tuple[int, int]]) -> tuple:
+        """``(statement, parameters)`` linking the pairs and marking them processed"""
+        if dialect == "postgresql":
+            pairs = values(
+                column("id", Integer), column("issue_id", Integer), name="links"
+            ).data(links)
+            table = ReportModel.__table__
+            return update(table).where(table.c.id == pairs.c.id).values(
+                issue_id=pairs.c.issue_id, processed=True
+            ), None
+        return update(ReportModel), [
+            {"id": report_id, "issue_id": issue_id, "processed": True}
+            for report_id, issue_id in links
+        ]
+    
+    @staticmethod
+    def bulk_link(db: Session, links: List[Tuple[int, int]]) -> int:
+        """Link (report_id, issue_id) pairs and mark them processed in one UPDATE"""
+        if not links:
+            return 0
+        db.execute(*ReportRepository._link_statement(db.get_bind().dialect.name, links))
+        return len(links)
+    
     @staticmethod
     def link_to_issue(db: Session, report_id: int, issue_id: int):
         """Link a report to an issue"""
@@ -91,3 +258,79 @@ class ReportRepository:
             report.issue_id = issue_id
             report.processed = True
             db.commit()
+
+
+class SLAMetricRepository:
+    """Repository for SLA results (one row per issue)"""
+    
+    @staticmethod
+    def upsert_many(db: Session, rows: List[dict]):
+        """Insert or update SLA results keyed on ``issue_id``
+        
+        A conflicting row is only rewritten when its result changed, so
+        re-evaluating the same issues leaves ``calculated_at`` alone. The old
+        and new ``calculated_at`` hours of rewritten rows are marked stale in
+        the rollups.
+        """
+        if not rows:
+            return
+        new = {row["issue_id"]: row for row in rows}
+        existing = {
+            row.issue_id: row for row in db.execute(
+                select(SLAMetricModel.issue_id, SLAMetricModel.resolution_time_hours,
+                       SLAMetricModel.met_sla, SLAMetricModel.calculated_at)
+                .where(SLAMetricModel.issue_id.in_(list(new)))
+            )
+        }
+        replaced = [(existing.get(issue_id), row) for issue_id, row in new.items()
+                    if SLAMetricRepository._changed(existing.get(issue_id), row)]
+        mark_stale(db, *(old.calculated_at for old, _ in replaced if old is not None),
+                   *(row["calculated_at"] for _, row in replaced))
+        db.execute(SLAMetricRepository._upsert_stmt(db.get_bind().dialect.name), rows)
+
+    @staticmethod
+    def _changed(old, row: dict) -> bool:
+        """Whether the upsert writes ``row`` (mirrors its conflict condition)"""
+        if old is None:
+            return True
+        old_hours, hours = old.resolution_time_hours, row["resolution_time_hours"]
+        if (old_hours is None) != (hours is None):
+            return True
+        return old.met_sla != row["met_sla"] or (
+            hours is not None and float(old_hours) != float(hours))
+    
+    @staticmethod
+    def _upsert_stmt(dialect: str):
+        if dialect == "postgresql":
+            stmt = postgresql.insert(SLAMetricModel)
+        elif dialect == "sqlite":
+            stmt = sqlite.insert(SLAMetricModel)
+        else:
+            raise NotImplementedError(f"SLA upserts are not supported on {dialect}")
+        table = SLAMetricModel.__table__
+        excluded = stmt.excluded
+        return stmt.on_conflict_do_update(
+            index_elements=["issue_id"],
+            set_={
+                "resolution_time_hours": excluded.resolution_time_hours,
+                "met_sla": excluded.met_sla,
+                "calculated_at": excluded.calculated_at,
+            },
+            where=or_(
+                table.c.resolution_time_hours.is_distinct_from(excluded.resolution_time_hours),
+                table.c.met_sla.is_distinct_from(excluded.met_sla),
+            ),
+        )
+    
+    @staticmethod
+    def delete_for_issues(db: Session, issue_ids: List[int]):
+        """Drop SLA results of issues that are no longer resolved
+
+        Their ``calculated_at`` hours are marked stale in the rollups.
+        """
+        if issue_ids:
+            deleted = db.execute(
+                delete(SLAMetricModel).where(SLAMetricModel.issue_id.in_(issue_ids))
+                .returning(SLAMetricModel.calculated_at)
+            )
+            mark_stale(db, *deleted.scalars())
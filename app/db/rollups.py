@@ -0,0 +1,406 @@
+"""Hourly/daily issue rollups for dashboard aggregates
+
+Each rollup row holds the events of one tenant/area/category/severity in one
+hour (or day): issues created (by ``created_at``), issues resolved (by
+``resolved_at``) and SLA results (by ``sla_metrics.calculated_at``), with the
+resolution-time count, sum and sum of squares so means and variances can be
+combined across rows.
+
+Rollups are complete up to a watermark. ``refresh_rollups`` advances it to the
+last whole hour (minus a grace period) by rebuilding only the hours since the
+previous watermark; ``rebuild_rollups`` recomputes any range in bounded chunks
+(backfills, or after bulk SQL updates). Readers combine daily rows, hourly rows
+and the raw tables for whatever the rollups don't cover, so results include
+events newer than the watermark.
+
+An hour below the watermark is not read again unless it is marked stale, so
+the rollups match the raw tables (as of the last refresh) only while every
+change to an already rolled-up issue marks the hours it affects, in the same
+transaction:
+
+- setting, clearing or moving a timestamp marks the old and new values' hours
+  (``mark_stale``; done by ``IssueRepository.set_status``, and by
+  ``SLAMetricRepository`` when the SLA pass deletes or re-evaluates a result);
+- changing ``category``, ``severity`` or ``area_id`` marks every hour the
+  issue is counted in (``mark_issues_stale``).
+
+``refresh_rollups`` rebuilds the marked hours; until then readers see the old
+totals. Updates that skip the marking need ``rebuild_rollups`` over the range.
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import case, delete, func, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.models import (
+    IssueModel,
+    IssueRollupDailyModel,
+    IssueRollupHourlyModel,
+    RollupStaleHourModel,
+    RollupWatermarkModel,
+    SLAMetricModel,
+)
+
+WATERMARK_NAME = "issue_rollups"
+
+METRICS = (
+    "issues_created",
+    "issues_resolved",
+    "sla_met",
+    "sla_missed",
+    "resolution_count",
+    "resolution_hours_sum",
+    "resolution_hours_sq_sum",
+)
+
+Span = Tuple[Optional[datetime], Optional[datetime]]
+
+
+def floor_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def ceil_hour(value: datetime) -> datetime:
+    floored = floor_hour(value)
+    return floored if floored == value else floored + timedelta(hours=1)
+
+
+def floor_day(value: datetime) -> datetime:
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def ceil_day(value: datetime) -> datetime:
+    floored = floor_day(value)
+    return floored if floored == value else floored + timedelta(days=1)
+
+
+def _truncate(db: Session, unit: str, column):
+    """SQL expression truncating a timestamp to the hour or day"""
+    if db.get_bind().dialect.name == "sqlite":
+        pattern = "%Y-%m-%d %H:00:00" if unit == "hour" else "%Y-%m-%d 00:00:00"
+        return func.strftime(pattern, column)
+    return func.date_trunc(unit, column)
+
+
+def _as_datetime(value) -> datetime:
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _in_span(column, span: Span):
+    start, end = span
+    conditions = []
+    if start is not None:
+        conditions.append(column >= start)
+    if end is not None:
+        conditions.append(column < end)
+    return conditions
+
+
+def empty_totals() -> dict:
+    return {metric: 0 for metric in METRICS}
+
+
+def aggregate_raw(db: Session, span: Span, tenant_id: Optional[int] = None) -> Dict[tuple, dict]:
+    """Totals from the raw tables keyed by (tenant, area, category, severity, hour)"""
+    groups: Dict[tuple, dict] = defaultdict(empty_totals)
+    dims = (IssueModel.tenant_id, IssueModel.area_id, IssueModel.category, IssueModel.severity)
+    tenant_filter = [IssueModel.tenant_id == tenant_id] if tenant_id is not None else []
+
+    for metric, column in (("issues_created", IssueModel.created_at),
+                           ("issues_resolved", IssueModel.resolved_at)):
+        bucket = _truncate(db, "hour", column).label("bucket")
+        rows = db.execute(
+            select(*dims, bucket, func.count().label("n"))
+            .where(*tenant_filter, column.isnot(None), *_in_span(column, span))
+            .group_by(*dims, bucket)
+        )
+        for row in rows:
+            groups[tuple(row[:4]) + (_as_datetime(row.bucket),)][metric] += row.n
+
+    hours = SLAMetricModel.resolution_time_hours
+    bucket = _truncate(db, "hour", SLAMetricModel.calculated_at).label("bucket")
+    rows = db.execute(
+        select(
+            *dims, bucket,
+            func.count().label("total"),
+            func.sum(case((SLAMetricModel.met_sla == True, 1), else_=0)).label("met"),  # noqa: E712
+            func.count(hours).label("resolution_count"),
+            func.sum(hours).label("hours_sum"),
+            func.sum(hours * hours).label("hours_sq_sum"),
+        )
+        .join(IssueModel, SLAMetricModel.issue_id == IssueModel.id)
+        .where(*tenant_filter, *_in_span(SLAMetricModel.calculated_at, span))
+        .group_by(*dims, bucket)
+    )
+    for row in rows:
+        totals = groups[tuple(row[:4]) + (_as_datetime(row.bucket),)]
+        met = int(row.met or 0)
+        totals["sla_met"] += met
+        totals["sla_missed"] += row.total - met
+        totals["resolution_count"] += row.resolution_count
+        totals["resolution_hours_sum"] += float(row.hours_sum or 0.0)
+        totals["resolution_hours_sq_sum"] += float(row.hours_sq_sum or 0.0)
+    return groups
+
+
+def get_watermark(db: Session, for_update: bool = False,
+                  name: str = WATERMARK_NAME) -> Optional[datetime]:
+    """How far the ``name``d job (default: the rollups) has processed; None if never run"""
+    query = select(RollupWatermarkModel).where(RollupWatermarkModel.name == name)
+    if for_update:
+        query = query.with_for_update()
+    row = db.execute(query).scalar_one_or_none()
+    return row.watermark if row else None
+
+
+def set_watermark(db: Session, watermark: datetime, name: str = WATERMARK_NAME):
+    row = db.get(RollupWatermarkModel, name)
+    if row is None:
+        row = RollupWatermarkModel(name=name)
+        db.add(row)
+    row.watermark = watermark
+    row.updated_at = datetime.utcnow()
+    db.flush()
+
+
+def earliest_event(db: Session) -> Optional[datetime]:
+    candidates = [
+        db.execute(select(func.min(IssueModel.created_at))).scalar(),
+        db.execute(select(func.min(SLAMetricModel.calculated_at))).scalar(),
+    ]
+    candidates = [_as_datetime(value) for value in candidates if value is not None]
+    return min(candidates) if candidates else None
+
+
+def _rebuild_hourly(db: Session, start: datetime, end: datetime):
+    db.execute(delete(IssueRollupHourlyModel).where(
+        IssueRollupHourlyModel.bucket_start >= start,
+        IssueRollupHourlyModel.bucket_start < end,
+    ))
+    rows = [
+        {"tenant_id": tenant_id, "area_id": area_id, "category": category,
+         "severity": severity, "bucket_start": bucket, **totals}
+        for (tenant_id, area_id, category, severity, bucket), totals
+        in aggregate_raw(db, (start, end)).items()
+    ]
+    if rows:
+        db.execute(IssueRollupHourlyModel.__table__.insert(), rows)
+
+
+def _rebuild_daily(db: Session, start: datetime, end: datetime):
+    """Recompute whole days in [start, end) from the hourly rows"""
+    hourly = IssueRollupHourlyModel
+    dims = (hourly.tenant_id, hourly.area_id, hourly.category, hourly.severity)
+    bucket = _truncate(db, "day", hourly.bucket_start).label("bucket")
+    result = db.execute(
+        select(*dims, bucket, *(func.sum(getattr(hourly, m)).label(m) for m in METRICS))
+        .where(hourly.bucket_start >= start, hourly.bucket_start < end)
+        .group_by(*dims, bucket)
+    )
+    rows = [
+        {"tenant_id": row.tenant_id, "area_id": row.area_id, "category": row.category,
+         "severity": row.severity, "bucket_start": _as_datetime(row.bucket),
+         **{m: getattr(row, m) or 0 for m in METRICS}}
+        for row in result
+    ]
+    db.execute(delete(IssueRollupDailyModel).where(
+        IssueRollupDailyModel.bucket_start >= start,
+        IssueRollupDailyModel.bucket_start < end,
+    ))
+    if rows:
+        db.execute(IssueRollupDailyModel.__table__.insert(), rows)
+
+
+def rebuild_rollups(db: Session, start: datetime, end: datetime,
+                    chunk_hours: Optional[int] = None) -> int:
+    """Recompute rollups for [start, end), committing one chunk at a time
+
+    The watermark moves forward whenever a chunk extends the contiguous covered
+    range. Returns the number of chunks processed.
+    """
+    chunk = timedelta(hours=chunk_hours or settings.rollup_chunk_hours)
+    start, end = floor_hour(start), ceil_hour(end)
+    chunks = 0
+    chunk_start = start
+    while chunk_start < end:
+        chunk_end = min(chunk_start + chunk, end)
+        # Row lock serializes concurrent refreshes (no-op on SQLite)
+        watermark = get_watermark(db, for_update=True)
+        if watermark is None:
+            earliest = earliest_event(db)
+            if earliest is not None and start <= earliest:
+                watermark = start
+        _rebuild_hourly(db, chunk_start, chunk_end)
+        _rebuild_daily(db, floor_day(chunk_start), ceil_day(chunk_end))
+        if watermark is not None and chunk_start <= watermark < chunk_end:
+            set_watermark(db, chunk_end)
+        db.commit()
+        chunks += 1
+        chunk_start = chunk_end
+    return chunks
+
+
+def refresh_rollups(db: Session, now: Optional[datetime] = None) -> Optional[datetime]:
+    """Roll up every whole hour since the watermark and rebuild stale hours
+
+    Returns the new watermark.
+    """
+    now = now or datetime.utcnow()
+    target = floor_hour(now - timedelta(minutes=settings.rollup_grace_minutes))
+    watermark = get_watermark(db)
+    if watermark is None:
+        watermark = earliest_event(db)
+        if watermark is None:
+            set_watermark(db, target)
+            db.commit()
+            return target
+    if floor_hour(watermark) < target:
+        rebuild_rollups(db, watermark, target)
+    rebuild_stale_hours(db)
+    return get_watermark(db)
+
+
+def mark_stale(db: Session, *timestamps: Optional[datetime]):
+    """Queue the rolled-up hours among ``timestamps`` for a rebuild by the next refresh
+
+    Call it with the event times an update moves or clears, old and new, in
+    the update's transaction. Hours at or past the watermark are skipped: the
+    refresh that covers them reads the raw tables anyway. (So, as for new
+    events, a change must commit within ``ROLLUP_GRACE_MINUTES``.)
+    """
+    watermark = get_watermark(db)
+    hours = {floor_hour(_as_datetime(value)) for value in timestamps if value is not None}
+    hours = {hour for hour in hours if watermark is not None and hour < watermark}
+    if not hours:
+        return
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        stmt = postgresql.insert(RollupStaleHourModel)
+    elif dialect == "sqlite":
+        stmt = sqlite.insert(RollupStaleHourModel)
+    else:
+        raise NotImplementedError(f"Stale rollup hours are not supported on {dialect}")
+    # A fresh marked_at tells a concurrent rebuild that the hour changed again
+    stmt = stmt.on_conflict_do_update(index_elements=["bucket_start"],
+                                      set_={"marked_at": stmt.excluded.marked_at})
+    marked_at = datetime.utcnow()
+    db.execute(stmt, [{"bucket_start": hour, "marked_at": marked_at} for hour in sorted(hours)])
+
+
+def mark_issues_stale(db: Session, issue_ids: List[int]):
+    """Mark every hour these issues are counted in (before changing their dimensions)"""
+    if not issue_ids:
+        return
+    rows = db.execute(
+        select(IssueModel.created_at, IssueModel.resolved_at, SLAMetricModel.calculated_at)
+        .outerjoin(SLAMetricModel, SLAMetricModel.issue_id == IssueModel.id)
+        .where(IssueModel.id.in_(issue_ids))
+    ).all()
+    mark_stale(db, *(value for row in rows for value in row))
+
+
+def rebuild_stale_hours(db: Session) -> int:
+    """Rebuild the marked hours below the watermark; returns the hours rebuilt
+
+    A mark is removed only if nobody re-marked the hour meanwhile, so a change
+    committed during the rebuild is picked up by the next one.
+    """
+    watermark = get_watermark(db, for_update=True)
+    marks = db.execute(
+        select(RollupStaleHourModel.bucket_start, RollupStaleHourModel.marked_at)
+        .order_by(RollupStaleHourModel.bucket_start)
+    ).all()
+    if not marks:
+        db.commit()
+        return 0
+    hours = [mark.bucket_start for mark in marks
+             if watermark is not None and mark.bucket_start < watermark]
+    runs: List[List[datetime]] = []
+    for hour in hours:
+        if runs and runs[-1][1] == hour:
+            runs[-1][1] = hour + timedelta(hours=1)
+        else:
+            runs.append([hour, hour + timedelta(hours=1)])
+    for start, end in runs:
+        _rebuild_hourly(db, start, end)
+    for day in sorted({floor_day(hour) for hour in hours}):
+        _rebuild_daily(db, day, day + timedelta(days=1))
+    db.execute(delete(RollupStaleHourModel).where(
+        tuple_(RollupStaleHourModel.bucket_start, RollupStaleHourModel.marked_at)
+        .in_([tuple(mark) for mark in marks])
+    ))
+    db.commit()
+    return len(hours)
+
+
+def split_span(span: Span,
+               watermark: Optional[datetime]) -> Tuple[List[Span], List[Span], List[Span]]:
+    """Split [start, end) into (daily, hourly, raw) sub-spans
+
+    ``None`` bounds are open-ended. Whole days below the watermark come from
+    the daily rollups, whole hours from the hourly rollups, and the ragged
+    edges plus everything at or after the watermark from the raw tables.
+    """
+    start, end = span
+    if watermark is None:
+        return [], [], [span]
+    covered_end = watermark if end is None else min(end, watermark)
+    hour_start = None if start is None else ceil_hour(start)
+    if hour_start is not None and hour_start >= covered_end:
+        return [], [], [span]
+
+    raw: List[Span] = []
+    if start is not None and start < hour_start:
+        raw.append((start, hour_start))
+    if end is None or covered_end < end:
+        raw.append((covered_end, end))
+
+    day_start = None if hour_start is None else ceil_day(hour_start)
+    day_end = floor_day(covered_end)
+    if day_start is not None and day_start >= day_end:
+        return [], [(hour_start, covered_end)], raw
+
+    hourly: List[Span] = []
+    if hour_start is not None and hour_start < day_start:
+        hourly.append((hour_start, day_start))
+    if day_end < covered_end:
+        hourly.append((day_end, covered_end))
+    return [(day_start, day_end)], hourly, raw
+
+
+def rollup_totals(db: Session, tenant_id: int, start: Optional[datetime] = None,
+                  end: Optional[datetime] = None,
+                  group_by: Optional[str] = None) -> Dict[Optional[str], dict]:
+    """Event totals for a tenant over [start, end), optionally per ``group_by``
+
+    ``group_by`` is ``"category"``, ``"severity"`` or ``"area_id"``; without it
+    the single key is ``None``.
+    """
+    daily, hourly, raw = split_span((start, end), get_watermark(db))
+    totals: Dict[Optional[str], dict] = defaultdict(empty_totals)
+
+    for model, spans in ((IssueRollupDailyModel, daily), (IssueRollupHourlyModel, hourly)):
+        key_column = getattr(model, group_by) if group_by else None
+        for span in spans:
+            columns = [func.sum(getattr(model, m)).label(m) for m in METRICS]
+            query = select(*([key_column.label("key")] if group_by else []), *columns).where(
+                model.tenant_id == tenant_id, *_in_span(model.bucket_start, span)
+            )
+            if group_by:
+                query = query.group_by(key_column)
+            for row in db.execute(query):
+                key = row.key if group_by else None
+                for metric in METRICS:
+                    totals[key][metric] += getattr(row, metric) or 0
+
+    key_index = {"area_id": 1, "category": 2, "severity": 3}.get(group_by)
+    for span in raw:
+        for group, values in aggregate_raw(db, span, tenant_id).items():
+            key = group[key_index] if group_by else None
+            for metric in METRICS:
+                totals[key][metric] += values[metric]
+    return dict(totals)
@@ -0,0 +1,243 @@
+"""Primary/replica routing for analytic reads
+
+Writes, and reads that must see them (the workers' watermarks, anything in
+the same transaction as a write), stay on the primary through ``SessionLocal``.
+Analytic reads (app/db/queries.py, app/analytics/*) take a ``ReadSessionLocal``
+session instead: its first statement binds it to a replica whose replication
+lag is within the query's tolerance, and to the primary when none is.
+
+- Lag is measured on the replica itself (0 while its WAL receiver is streaming
+  and it has replayed everything received, else the age of the last replayed
+  transaction) at most every ``REPLICA_LAG_CHECK_SECONDS``. Between checks it
+  is assumed to grow in real time, so a stale measurement never looks better
+  than the truth.
+- Tolerance defaults to ``REPLICA_MAX_LAG_SECONDS``. ``constrain_read`` narrows
+  it for one session, with a maximum lag and/or the time of a write the read
+  must see (read-your-writes: only a replica lagging less than the time since
+  that write can have it).
+- A replica whose lag can't be measured is skipped until the next check.
+
+``router.stats()`` reports reads, fallbacks, lag and checked-out connections
+per pool. With no ``DATABASE_REPLICA_URLS`` every read goes to the primary.
+"""
+import itertools
+import threading
+import time
+from collections import Counter
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import Delete, Insert, Update, create_engine, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config import settings
+from app.db.base import connect_args, engine, pool_options
+
+PRIMARY = "primary"
+
+# pg_stat_wal_receiver.status is only visible to pg_read_all_stats (pg_monitor)
+# members; without it the receiver never looks streaming and lag is replay age.
+_POSTGRES_REPLICATION = text("""
+    SELECT pg_is_in_recovery() AS in_recovery,
+           EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming')
+               AS streaming,
+           pg_last_wal_receive_lsn() IS NOT DISTINCT FROM pg_last_wal_replay_lsn()
+               AS replayed_all,
+           EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) AS replay_age
+""")
+
+
+class ReplicationStatus(NamedTuple):
+    in_recovery: bool
+    streaming: bool  # WAL receiver connected to its upstream
+    replayed_all: bool  # replayed everything received so far
+    replay_age: Optional[float]  # seconds since the last replayed transaction
+
+
+def replica_lag(status: ReplicationStatus) -> Optional[float]:
+    """Lag in seconds for a replication status; None if it can't be told
+
+    Replaying everything received only means no lag while the receiver is
+    streaming; a stalled or disconnected receiver has nothing new to replay, so
+    its lag is the age of the last replayed transaction.
+    """
+    if not status.in_recovery:
+        return 0.0
+    if status.streaming and status.replayed_all:
+        return 0.0
+    return None if status.replay_age is None else float(status.replay_age)
+
+
+def measure_lag(conn: Connection) -> Optional[float]:
+    """Replication lag in seconds as seen by the server on ``conn`` (0 on a primary)"""
+    if conn.dialect.name != "postgresql":
+        return 0.0
+    row = conn.execute(_POSTGRES_REPLICATION).one()
+    return replica_lag(ReplicationStatus(
+        bool(row.in_recovery), bool(row.streaming), bool(row.replayed_all),
+        None if row.replay_age is None else float(row.replay_age),
+    ))
+
+
+class Replica:
+    """A replica engine and its most recent lag measurement"""
+
+    def __init__(self, name: str, engine: Engine, check_seconds: float,
+                 measure: Callable[[Connection], Optional[float]] = measure_lag,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.engine = engine
+        self.check_seconds = check_seconds
+        self._measure = measure
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._lag: Optional[float] = None
+        self._checked_at: Optional[float] = None
+        self.errors = 0
+
+    def lag(self) -> Optional[float]:
+        """Current lag estimate in seconds; None if the replica is unreachable"""
+        now = self._clock()
+        stale = self._checked_at is None or now - self._checked_at >= self.check_seconds
+        # One thread re-measures; the rest use the previous value meanwhile
+        if stale and self._lock.acquire(blocking=self._checked_at is None):
+            try:
+                with self.engine.connect() as conn:
+                    self._lag = self._measure(conn)
+            except Exception as e:
+                self.errors += 1
+                self._lag = None
+                print(f"Error measuring lag on {self.name}: {e}")
+            finally:
+                self._checked_at = now = self._clock()
+                self._lock.release()
+        if self._lag is None:
+            return None
+        return self._lag + (now - self._checked_at)
+
+
+class DatabaseRouter:
+    """Chooses the engine for each read session"""
+
+    def __init__(self, primary: Engine, replicas: List[Replica],
+                 max_lag_seconds: float = 5.0):
+        self.primary = primary
+        self.replicas = replicas
+        self.max_lag_seconds = max_lag_seconds
+        self._next = itertools.count()
+        self.reads: Counter = Counter()
+        self.fallbacks: Counter = Counter()
+
+    def choose(self, max_lag_seconds: Optional[float] = None,
+               written_at: Optional[float] = None) -> Tuple[str, Engine]:
+        """``(pool name, engine)`` for a read; replicas round-robin, primary as fallback
+
+        ``written_at`` is the wall-clock time of a write the read must see.
+        """
+        if not self.replicas:
+            self.reads[PRIMARY] += 1
+            return PRIMARY, self.primary
+        max_lag = self.max_lag_seconds if max_lag_seconds is None else max_lag_seconds
+        tolerance = max_lag if written_at is None else min(max_lag, time.time() - written_at)
+        start = next(self._next)
+        measured = []
+        for i in range(len(self.replicas)):
+            replica = self.replicas[(start + i) % len(self.replicas)]
+            lag = replica.lag()
+            if lag is not None and lag <= tolerance:
+                self.reads[replica.name] += 1
+                return replica.name, replica.engine
+            if lag is not None:
+                measured.append(lag)
+        if not measured:
+            reason = "unavailable"
+        elif min(measured) <= max_lag:
+            reason = "read_your_writes"
+        else:
+            reason = "lag"
+        self.reads[PRIMARY] += 1
+        self.fallbacks[reason] += 1
+        return PRIMARY, self.primary
+
+    def stats(self) -> dict:
+        """Per-pool reads, lag and connections, plus primary fallbacks by reason"""
+        pools = {PRIMARY: self._pool_stats(self.primary, self.reads[PRIMARY])}
+        for replica in self.replicas:
+            lag = replica.lag()
+            pools[replica.name] = {
+                **self._pool_stats(replica.engine, self.reads[replica.name]),
+                "lag_seconds": None if lag is None else round(lag, 3),
+                "lag_errors": replica.errors,
+            }
+        return {"pools": pools, "fallbacks": dict(self.fallbacks)}
+
+    @staticmethod
+    def _pool_stats(engine: Engine, reads: int) -> dict:
+        pool = engine.pool
+        checked_out = getattr(pool, "checkedout", None)
+        size = getattr(pool, "size", None)
+        return {"reads": reads,
+                "checked_out": checked_out() if callable(checked_out) else None,
+                "pool_size": size() if callable(size) else None}
+
+
+class RoutingSession(Session):
+    """Read session that binds to a replica (or the primary) on its first statement
+
+    Anything that would write (a flush, INSERT/UPDATE/DELETE) goes to the
+    primary regardless of where the reads went.
+    """
+
+    def __init__(self, router: "DatabaseRouter" = None, **kwargs):
+        super().__init__(**kwargs)
+        self.router = router
+        self.pool_name: Optional[str] = None
+        self._routed: Optional[Engine] = None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            return self.router.primary
+        if self._routed is None:
+            self.pool_name, self._routed = self.router.choose(
+                self.info.get("max_lag_seconds"), self.info.get("written_at")
+            )
+        return self._routed
+
+
+def constrain_read(db: Session, max_lag_seconds: Optional[float] = None,
+                   written_at: Optional[float] = None):
+    """Tighten where a read session may go; call before its first statement
+
+    Plain sessions ignore it, so callers may pass either kind.
+    """
+    if max_lag_seconds is not None:
+        db.info["max_lag_seconds"] = max_lag_seconds
+    if written_at is not None:
+        db.info["written_at"] = written_at
+
+
+def _create_router() -> DatabaseRouter:
+    replicas = [
+        Replica(f"replica-{i}",
+                create_engine(url, pool_pre_ping=True, connect_args=connect_args(url),
+                              **pool_options(url)),
+                check_seconds=settings.replica_lag_check_seconds)
+        for i, url in enumerate(settings.database_replica_urls)
+    ]
+    return DatabaseRouter(engine, replicas, max_lag_seconds=settings.replica_max_lag_seconds)
+
+
+# Process-wide router over the primary engine and DATABASE_REPLICA_URLS
+router = _create_router()
+
+ReadSessionLocal = sessionmaker(class_=RoutingSession, router=router, autocommit=False,
+                                autoflush=False)
+
+
+def get_read_db():
+    """Dependency for getting a replica-routed read session"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
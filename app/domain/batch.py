@@ -0,0 +1,180 @@
+"""Struct-of-arrays containers for bulk analytics
+
+One NumPy array per field instead of one object per issue/report: a million
+issues take ~46 MB rather than ~150 MB as dataclasses, and ``is_open``, resolution
+times and the like are single vectorized operations. String fields with few
+distinct values (category, severity, status) are stored as int16 codes into a
+vocabulary tuple (``NO_CODE`` for None). Indexing a batch materializes the
+slotted read record.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from app.domain.issue import IssueRecord
+from app.domain.report import ReportRecord
+from app.domain.sla import SLA
+
+NO_ID = -1  # area_id / issue_id not set
+NO_CODE = -1  # category / severity / status not set
+_TIME = "datetime64[us]"
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_NAT = np.iinfo(np.int64).min
+
+
+def _ids(values: Iterable[Optional[int]]) -> np.ndarray:
+    return np.array([NO_ID if v is None else v for v in values], dtype=np.int64)
+
+
+def _optional_id(value: int) -> Optional[int]:
+    return None if value == NO_ID else int(value)
+
+
+def encode_strings(values: List[Optional[str]]) -> Tuple[np.ndarray, Tuple[str, ...]]:
+    """int16 codes into a sorted vocabulary of the distinct values (``NO_CODE`` for None)"""
+    vocabulary = tuple(sorted({v for v in values if v is not None}))
+    index = {value: code for code, value in enumerate(vocabulary)}
+    codes = np.fromiter((NO_CODE if v is None else index[v] for v in values),
+                        dtype=np.int16, count=len(values))
+    return codes, vocabulary
+
+
+def _times(values: Iterable[Optional[datetime]]) -> np.ndarray:
+    """Naive datetimes as datetime64[us] (NaT for None)
+
+    Integer arithmetic in Python is ~5x faster than NumPy's per-object
+    datetime conversion.
+    """
+    micros = [_NAT if v is None else (v - _EPOCH) // _MICROSECOND for v in values]
+    return np.array(micros, dtype=np.int64).view(_TIME)
+
+
+def _decode(vocabulary: Tuple[str, ...], code: int) -> Optional[str]:
+    return None if code == NO_CODE else vocabulary[code]
+
+
+def _datetime(value: np.datetime64):
+    return None if np.isnat(value) else value.astype(object)
+
+
+@dataclass
+class IssueBatch:
+    """Issues as aligned arrays; see ``from_records``"""
+    id: np.ndarray
+    tenant_id: np.ndarray
+    area_id: np.ndarray  # NO_ID when unassigned
+    category: np.ndarray  # codes into categories
+    severity: np.ndarray  # codes into severities
+    status: np.ndarray  # codes into statuses
+    created_at: np.ndarray
+    resolved_at: np.ndarray  # NaT while unresolved
+    categories: Tuple[str, ...] = ()
+    severities: Tuple[str, ...] = ()
+    statuses: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_records(cls, records: Iterable) -> "IssueBatch":
+        """Build from anything with ``Issue``'s attributes (records, ORM rows, ...)"""
+        records = list(records)
+        categories, category_names = encode_strings([r.category for r in records])
+        severities, severity_names = encode_strings([r.severity for r in records])
+        statuses, status_names = encode_strings([r.status for r in records])
+        return cls(
+            id=np.array([r.id for r in records], dtype=np.int64),
+            tenant_id=np.array([r.tenant_id for r in records], dtype=np.int64),
+            area_id=_ids(r.area_id for r in records),
+            category=categories,
+            severity=severities,
+            status=statuses,
+            created_at=_times(r.created_at for r in records),
+            resolved_at=_times(r.resolved_at for r in records),
+            categories=category_names,
+            severities=severity_names,
+            statuses=status_names,
+        )
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    def __getitem__(self, index: int) -> IssueRecord:
+        return IssueRecord(
+            id=int(self.id[index]),
+            tenant_id=int(self.tenant_id[index]),
+            area_id=_optional_id(self.area_id[index]),
+            category=_decode(self.categories, self.category[index]),
+            severity=_decode(self.severities, self.severity[index]),
+            status=_decode(self.statuses, self.status[index]),
+            created_at=_datetime(self.created_at[index]),
+            resolved_at=_datetime(self.resolved_at[index]),
+        )
+
+    def __iter__(self) -> Iterator[IssueRecord]:
+        return (self[i] for i in range(len(self)))
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in (
+            "id", "tenant_id", "area_id", "category", "severity", "status",
+            "created_at", "resolved_at",
+        ))
+
+    def is_open(self) -> np.ndarray:
+        """Vectorized ``Issue.is_open``"""
+        if "open" not in self.statuses:
+            return np.zeros(len(self), dtype=bool)
+        return self.status == self.statuses.index("open")
+
+    def resolution_hours(self) -> np.ndarray:
+        """Vectorized ``SLA.calculate_resolution_time`` (NaN while unresolved)"""
+        return SLA.calculate_resolution_times(self.created_at, self.resolved_at)
+
+
+@dataclass
+class ReportBatch:
+    """Reports as aligned arrays; free text stays as Python strings"""
+    id: np.ndarray
+    issue_id: np.ndarray  # NO_ID until processed
+    tenant_id: np.ndarray
+    submitted_at: np.ndarray
+    processed: np.ndarray
+    description: Tuple[str, ...] = ()
+    location: Tuple[Optional[str], ...] = ()
+
+    @classmethod
+    def from_records(cls, records: Iterable) -> "ReportBatch":
+        """Build from anything with ``Report``'s attributes (records, ORM rows, ...)"""
+        records = list(records)
+        return cls(
+            id=np.array([r.id for r in records], dtype=np.int64),
+            issue_id=_ids(r.issue_id for r in records),
+            tenant_id=np.array([r.tenant_id for r in records], dtype=np.int64),
+            submitted_at=_times(r.submitted_at for r in records),
+            processed=np.array([bool(r.processed) for r in records], dtype=bool),
+            description=tuple(r.description for r in records),
+            location=tuple(r.location for r in records),
+        )
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    def __getitem__(self, index: int) -> ReportRecord:
+        return ReportRecord(
+            id=int(self.id[index]),
+            issue_id=_optional_id(self.issue_id[index]),
+            tenant_id=int(self.tenant_id[index]),
+            description=self.description[index],
+            location=self.location[index],
+            submitted_at=_datetime(self.submitted_at[index]),
+            processed=bool(self.processed[index]),
+        )
+
+    def __iter__(self) -> Iterator[ReportRecord]:
+        return (self[i] for i in range(len(self)))
+
+    def reports_per_issue(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(issue ids, report counts) for the processed reports"""
+        linked = self.issue_id[self.issue_id != NO_ID]
+        return np.unique(linked, return_counts=True)
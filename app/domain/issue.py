@@ -28,3 +28,20 @@ class Issue:
     def is_open(self) -> bool:
         """Check if issue is still open"""
         return self.status == "open"
+
+
+@dataclass(frozen=True, slots=True)
+class IssueRecord:
+    """Immutable, slotted ``Issue`` for read paths (no per-instance dict or defaults)"""
+    id: int
+    tenant_id: int
+    area_id: Optional[int]
+    category: str
+    severity: str
+    status: str
+    created_at: datetime
+    resolved_at: Optional[datetime] = None
+    
+    def is_open(self) -> bool:
+        """Check if issue is still open"""
+        return self.status == "open"
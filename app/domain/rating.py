@@ -3,6 +3,8 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
+import numpy as np
+
 
 @dataclass
 class Rating:
@@ -21,13 +23,46 @@ class Rating:
     @property
     def letter_grade(self) -> str:
         """Convert numeric score to letter grade"""
-        if self.score >= 90:
-            return "A"
-        elif self.score >= 80:
-            return "B"
-        elif self.score >= 70:
-            return "C"
-        elif self.score >= 60:
-            return "D"
-        else:
-            return "F"
+        return letter_grade(self.score)
+
+
+@dataclass(frozen=True, slots=True)
+class RatingRecord:
+    """Immutable, slotted ``Rating`` for read paths (no per-instance dict or defaults)"""
+    id: int
+    tenant_id: int
+    area_id: Optional[int]
+    score: float
+    metric_type: str
+    calculated_at: datetime
+    
+    @property
+    def letter_grade(self) -> str:
+        """Convert numeric score to letter grade"""
+        return letter_grade(self.score)
+
+
+# Lower bounds of D, C, B and A
+_GRADE_BOUNDS = np.array([60.0, 70.0, 80.0, 90.0])
+_GRADES = np.array(["F", "D", "C", "B", "A"])
+
+
+def letter_grade(score: float) -> str:
+    """Convert numeric score to letter grade"""
+    if score >= 90:
+        return "A"
+    elif score >= 80:
+        return "B"
+    elif score >= 70:
+        return "C"
+    elif score >= 60:
+        return "D"
+    else:
+        return "F"
+
+
+def letter_grades(scores: np.ndarray) -> np.ndarray:
+    """Vectorized letter_grade (NaN scores get "F", like the scalar version)"""
+    scores = np.asarray(scores, dtype=np.float64)
+    grades = _GRADES[np.searchsorted(_GRADE_BOUNDS, scores, side="right")]
+    return np.where(np.isnan(scores), "F", grades)
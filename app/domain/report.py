@@ -23,3 +23,15 @@ class Report:
         """Mark report as processed and link to issue"""
         self.processed = True
         self.issue_id = issue_id
+
+
+@dataclass(frozen=True, slots=True)
+class ReportRecord:
+    """Immutable, slotted ``Report`` for read paths (no per-instance dict or defaults)"""
+    id: int
+    issue_id: Optional[int]
+    tenant_id: int
+    description: str
+    location: Optional[str]
+    submitted_at: datetime
+    processed: bool = False
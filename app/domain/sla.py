@@ -1,7 +1,12 @@
 """SLA domain model"""
+import hashlib
+import itertools
+import json
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Iterable, Optional, Set
+
+import numpy as np
 
 
 @dataclass
@@ -23,7 +28,87 @@ class SLA:
         delta = resolved_at - created_at
         return delta.total_seconds() / 3600
     
+    @staticmethod
+    def calculate_resolution_times(created_at: np.ndarray, resolved_at: np.ndarray) -> np.ndarray:
+        """Vectorized calculate_resolution_time over datetime64 arrays (NaN where NaT)"""
+        delta = (resolved_at - created_at) / np.timedelta64(1, "us")
+        return delta / 3_600_000_000
+    
     @staticmethod
     def check_sla_compliance(resolution_hours: float, threshold_hours: float) -> bool:
         """Check if resolution met SLA threshold"""
         return resolution_hours <= threshold_hours
+
+
+@dataclass(frozen=True, slots=True)
+class SLARecord:
+    """Immutable, slotted ``SLA`` for read paths (no per-instance dict or defaults)"""
+    id: int
+    issue_id: int
+    resolution_time_hours: Optional[float]
+    met_sla: bool
+    calculated_at: datetime
+
+
+@dataclass(frozen=True)
+class SLARule:
+    """Threshold for issues matching every field that is set (None matches anything)"""
+    hours: float
+    tenant_id: Optional[int] = None
+    category: Optional[str] = None
+    severity: Optional[str] = None
+
+
+# Wildcard patterns over (tenant, category, severity), most specific first;
+# among equally specific ones tenant beats category beats severity
+_PATTERNS = sorted(itertools.product((True, False), repeat=3), key=lambda p: -sum(p))
+
+
+class SLAPolicy:
+    """Resolution-time thresholds per tenant/category/severity
+    
+    The most specific matching rule wins; issues no rule matches get
+    ``default_hours``.
+    """
+    
+    def __init__(self, rules: Iterable[SLARule] = (), default_hours: float = 72.0):
+        self.default_hours = default_hours
+        self.rules: Dict[tuple, SLARule] = {
+            (rule.tenant_id, rule.category, rule.severity): rule for rule in rules
+        }
+        self._resolved: Dict[tuple, timedelta] = {}
+    
+    @classmethod
+    def from_dicts(cls, rules: Iterable[dict], default_hours: float = 72.0) -> "SLAPolicy":
+        """Policy from ``{"hours": 24, "severity": "critical", ...}`` dicts"""
+        return cls([SLARule(**rule) for rule in rules], default_hours)
+    
+    def threshold(self, tenant_id: Optional[int], category: Optional[str],
+                  severity: Optional[str]) -> timedelta:
+        """Allowed resolution time for an issue"""
+        key = (tenant_id, category, severity)
+        cached = self._resolved.get(key)
+        if cached is None:
+            hours = self.default_hours
+            for pattern in _PATTERNS:
+                rule = self.rules.get(tuple(v if keep else None for v, keep in zip(key, pattern)))
+                if rule is not None:
+                    hours = rule.hours
+                    break
+            cached = self._resolved[key] = timedelta(hours=hours)
+        return cached
+    
+    def thresholds(self) -> Set[timedelta]:
+        """Every threshold this policy can return"""
+        return {timedelta(hours=rule.hours) for rule in self.rules.values()} | {
+            timedelta(hours=self.default_hours)
+        }
+    
+    @property
+    def fingerprint(self) -> str:
+        """Stable hash of the rules, to tell whether stored deadlines are still valid"""
+        payload = json.dumps(
+            [self.default_hours, sorted(([str(v) for v in key], rule.hours)
+                                        for key, rule in self.rules.items())]
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
@@ -11,6 +11,7 @@ class Tenant:
     name: str
     type: str  # city, building, campus, hotel, facility
     created_at: datetime = None
+    timezone: str = "UTC"  # IANA name, for reporting
     
     def __post_init__(self):
         if self.created_at is None:
@@ -0,0 +1,142 @@
+"""Micro-batching front end for report classification"""
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from queue import Empty, Queue
+from typing import Callable, Dict, List, Optional
+
+from app.config import settings
+from app.llm.classify_report import classify_reports_batch
+
+
+@dataclass
+class PendingReport:
+    """A report waiting to be classified"""
+    report_id: int
+    tenant_id: Optional[int]
+    description: str
+    location: Optional[str]
+    future: Future
+
+
+class BatchClassifier:
+    """Collects reports from many producers and classifies them in batches
+
+    A batch is sent as soon as ``max_batch_size`` reports are pending or the
+    oldest pending report has waited ``max_wait_seconds``, whichever comes
+    first. Larger batches mean fewer LLM round trips; a shorter wait means
+    lower per-report latency.
+
+    ``submit`` raises unless the batching thread is running, and ``stop``
+    fails any report it could not flush, so no future is left unresolved.
+    """
+
+    def __init__(self, max_batch_size: int = None, max_wait_seconds: float = None,
+                 classify_batch: Callable[[List[dict]], Dict[int, dict]] = classify_reports_batch):
+        self.max_batch_size = max_batch_size or settings.llm_batch_max_size
+        self.max_wait_seconds = (
+            settings.llm_batch_max_wait_seconds if max_wait_seconds is None else max_wait_seconds
+        )
+        self.classify_batch = classify_batch
+        self._queue: "Queue[PendingReport]" = Queue()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()  # orders submits against stop()
+        self.batches_sent = 0
+        self.reports_classified = 0
+
+    def start(self):
+        """Start the background batching thread"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="batch-classifier",
+                                            daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = None):
+        """Stop the batching thread after flushing pending reports
+
+        Reports still queued when ``timeout`` runs out fail with RuntimeError.
+        """
+        with self._lock:
+            self._stop.set()
+            thread, self._thread = self._thread, None
+        if thread:
+            thread.join(timeout)
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except Empty:
+                break
+            item.future.set_exception(RuntimeError("BatchClassifier stopped before classifying"))
+
+    def submit(self, report_id: int, description: str, location: str = None,
+               tenant_id: int = None) -> Future:
+        """Queue a report; the returned future resolves to its classification"""
+        future: Future = Future()
+        with self._lock:
+            if self._thread is None or self._stop.is_set():
+                raise RuntimeError("BatchClassifier is not running; call start() first")
+            self._queue.put(PendingReport(report_id, tenant_id, description, location, future))
+        return future
+
+    def classify_many(self, reports: List[dict]) -> Dict[int, dict]:
+        """Submit reports and block until all of them are classified"""
+        futures = {
+            report["id"]: self.submit(
+                report["id"], report["description"], report.get("location"),
+                report.get("tenant_id"),
+            )
+            for report in reports
+        }
+        return {report_id: future.result() for report_id, future in futures.items()}
+
+    def _collect_batch(self) -> List[PendingReport]:
+        """Block for the first report, then fill the batch until size or deadline"""
+        try:
+            first = self._queue.get(timeout=0.1)
+        except Empty:
+            return []
+
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait_seconds
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._collect_batch()
+            if batch:
+                self._dispatch(batch)
+
+    def _dispatch(self, batch: List[PendingReport]):
+        reports = [
+            {"id": item.report_id, "description": item.description, "location": item.location}
+            for item in batch
+        ]
+        try:
+            results = self.classify_batch(reports)
+        except Exception as e:
+            for item in batch:
+                item.future.set_exception(e)
+            return
+
+        self.batches_sent += 1
+        for item in batch:
+            if item.report_id in results:
+                item.future.set_result(results[item.report_id])
+                self.reports_classified += 1
+            else:
+                item.future.set_exception(
+                    KeyError(f"No classification returned for report {item.report_id}")
+                )
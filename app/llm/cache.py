@@ -0,0 +1,177 @@
+"""Content-addressed cache for LLM results
+
+Keys are a SHA-256 over the model, the prompt template version and the
+normalized input, so identical complaints ("streetlight out on Main St") share
+one LLM round trip. The template version is itself a hash of the template
+text, so editing a prompt invalidates its old entries automatically.
+
+Lookups go to an in-process LRU tier first and then, if configured, to a
+shared SQL tier (SQLite or Postgres) that every worker pod can read.
+"""
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional
+
+from sqlalchemy import create_engine, delete, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.config import settings
+from app.db.models import LLMCacheModel
+from app.utils.cache import TTLCache
+from app.utils.geo import normalize_location
+from app.utils.text import normalize_text
+
+_MISSING = object()
+
+
+def template_version(template: str) -> str:
+    """Short, stable fingerprint of a prompt template"""
+    return hashlib.sha256(template.encode("utf-8")).hexdigest()[:12]
+
+
+def make_cache_key(kind: str, model: str, version: str, payload: Any) -> str:
+    """Hash a request into a content-addressed cache key"""
+    material = json.dumps(
+        {"kind": kind, "model": model, "version": version, "input": payload},
+        sort_keys=True, separators=(",", ":"), default=str,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def normalize_report_input(description: str, location: Optional[str] = None) -> dict:
+    """Canonical form of a report used for cache keys"""
+    return {
+        "description": normalize_text(description or ""),
+        "location": normalize_location(location) if location else None,
+    }
+
+
+class SQLCacheTier:
+    """Shared cache tier stored in the ``llm_cache`` table"""
+
+    def __init__(self, url: str, ttl_seconds: Optional[float] = None):
+        self.engine = create_engine(url, pool_pre_ping=True)
+        self.ttl_seconds = ttl_seconds
+        LLMCacheModel.__table__.create(self.engine, checkfirst=True)
+
+    def get(self, key: str) -> Any:
+        table = LLMCacheModel.__table__
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                select(table.c.value, table.c.expires_at).where(table.c.cache_key == key)
+            ).first()
+        if row is None:
+            return _MISSING
+        if row.expires_at is not None and row.expires_at <= datetime.utcnow():
+            return _MISSING
+        return json.loads(row.value)
+
+    def set(self, key: str, value: Any):
+        table = LLMCacheModel.__table__
+        values = {
+            "value": json.dumps(value),
+            "expires_at": (
+                datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+                if self.ttl_seconds else None
+            ),
+        }
+        with self.engine.begin() as conn:
+            try:
+                with conn.begin_nested():
+                    conn.execute(table.insert().values(cache_key=key, **values))
+            except IntegrityError:
+                conn.execute(update(table).where(table.c.cache_key == key).values(**values))
+
+    def purge_expired(self) -> int:
+        """Delete expired rows; returns the number removed"""
+        table = LLMCacheModel.__table__
+        with self.engine.begin() as conn:
+            result = conn.execute(delete(table).where(table.c.expires_at <= datetime.utcnow()))
+        return result.rowcount
+
+
+class LLMResultCache:
+    """Two-tier (memory, then shared SQL) cache for LLM results"""
+
+    def __init__(self, memory: TTLCache, shared: Optional[SQLCacheTier] = None,
+                 enabled: bool = True):
+        self.memory = memory
+        self.shared = shared
+        self.enabled = enabled
+        self.shared_hits = 0
+        self.shared_errors = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Look a key up in memory, then in the shared tier"""
+        if not self.enabled:
+            return default
+        value = self.memory.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        if self.shared is not None:
+            try:
+                value = self.shared.get(key)
+            except Exception as e:
+                self.shared_errors += 1
+                print(f"Error reading shared LLM cache: {e}")
+                value = _MISSING
+            if value is not _MISSING:
+                self.shared_hits += 1
+                self.memory.set(key, value)
+                return value
+        return default
+
+    def set(self, key: str, value: Any):
+        """Store a value in every tier"""
+        if not self.enabled:
+            return
+        self.memory.set(key, value)
+        if self.shared is not None:
+            try:
+                self.shared.set(key, value)
+            except Exception as e:
+                self.shared_errors += 1
+                print(f"Error writing shared LLM cache: {e}")
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any],
+                       should_cache: Callable[[Any], bool] = lambda value: True) -> Any:
+        """Return the cached value or compute, cache and return it"""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        value = compute()
+        if should_cache(value):
+            self.set(key, value)
+        return value
+
+    def stats(self) -> dict:
+        """Hit/miss/eviction counters across both tiers"""
+        memory = self.memory.stats()
+        return {
+            "memory_hits": memory["hits"],
+            "shared_hits": self.shared_hits,
+            "misses": memory["misses"] - self.shared_hits,
+            "evictions": memory["evictions"],
+            "expirations": memory["expirations"],
+            "size": memory["size"],
+            "shared_errors": self.shared_errors,
+        }
+
+
+def _build_default_cache() -> LLMResultCache:
+    shared = None
+    if settings.llm_cache_enabled and settings.llm_cache_url:
+        shared = SQLCacheTier(settings.llm_cache_url, ttl_seconds=settings.llm_cache_ttl_seconds)
+    return LLMResultCache(
+        memory=TTLCache(
+            max_entries=settings.llm_cache_max_entries,
+            ttl_seconds=settings.llm_cache_ttl_seconds,
+        ),
+        shared=shared,
+        enabled=settings.llm_cache_enabled,
+    )
+
+
+# Global cache instance
+llm_cache = _build_default_cache()
@@ -1,15 +1,16 @@
 """Category + severity detection prompts"""
-from app.llm.client import llm_client
+import json
+from typing import Dict, List
 
+from app.llm.cache import llm_cache, make_cache_key, normalize_report_input, template_version
+from app.llm.client import DEFAULT_MODEL, llm_client
+from app.llm.validators import validate_classification
 
-def classify_report(description: str, location: str = None) -> dict:
-    """Classify a report using LLM"""
-    
-    prompt = f"""
+CLASSIFY_PROMPT_TEMPLATE = """
 You are analyzing a civic incident report. Classify it and extract key information.
 
 Report Description: {description}
-Location: {location or "Not specified"}
+Location: {location}
 
 Respond with JSON containing:
 - category: One of [infrastructure, sanitation, safety, noise, maintenance, other]
@@ -25,15 +26,146 @@ Example response format:
     "suggested_area": "downtown"
 }}
 """
-    
+
+BATCH_CLASSIFY_PROMPT_TEMPLATE = """
+You are analyzing civic incident reports. Classify each report independently.
+
+Reports (JSON array):
+{reports}
+
+Respond with a JSON object with a single key "results" holding one entry per report.
+Each entry must contain:
+- report_id: The report_id of the report being classified, copied exactly
+- category: One of [infrastructure, sanitation, safety, noise, maintenance, other]
+- severity: One of [low, medium, high, critical]
+- summary: A brief 1-sentence summary
+- suggested_area: If you can infer a specific area/zone from the description
+
+Example response format:
+{{
+    "results": [
+        {{
+            "report_id": 17,
+            "category": "infrastructure",
+            "severity": "high",
+            "summary": "Broken traffic light at Main St intersection",
+            "suggested_area": "downtown"
+        }}
+    ]
+}}
+"""
+
+# Single and batched prompts produce interchangeable results, so they share
+# cache entries; changing either template invalidates both.
+CLASSIFY_TEMPLATE_VERSION = template_version(
+    CLASSIFY_PROMPT_TEMPLATE + BATCH_CLASSIFY_PROMPT_TEMPLATE
+)
+
+
+def classification_cache_key(description: str, location: str = None) -> str:
+    """Cache key for the classification of a report"""
+    return make_cache_key(
+        "classification", DEFAULT_MODEL, CLASSIFY_TEMPLATE_VERSION,
+        normalize_report_input(description, location),
+    )
+
+
+def classify_report(description: str, location: str = None) -> dict:
+    """Classify a report using LLM"""
+    cache_key = classification_cache_key(description, location)
+    cached = llm_cache.get(cache_key)
+    if cached is not None:
+        return dict(cached)
+
+    prompt = CLASSIFY_PROMPT_TEMPLATE.format(
+        description=description,
+        location=location or "Not specified",
+    )
+
     try:
         result = llm_client.complete_json(prompt)
-        return result
     except Exception as e:
         print(f"Error classifying report: {e}")
-        return {
-            "category": "other",
-            "severity": "medium",
-            "summary": description[:100],
-            "suggested_area": None
+        return fallback_classification(description)
+
+    if validate_classification(result):
+        llm_cache.set(cache_key, result)
+    return result
+
+
+def fallback_classification(description: str) -> dict:
+    """Default classification used when the LLM cannot produce a valid one"""
+    return {
+        "category": "other",
+        "severity": "medium",
+        "summary": description[:100],
+        "suggested_area": None
+    }
+
+
+def build_batch_prompt(reports: List[dict]) -> str:
+    """Build a single prompt classifying several reports at once"""
+    items = [
+        {
+            "report_id": report["id"],
+            "description": report["description"],
+            "location": report.get("location") or "Not specified",
         }
+        for report in reports
+    ]
+    return BATCH_CLASSIFY_PROMPT_TEMPLATE.format(reports=json.dumps(items, indent=2))
+
+
+def classify_reports_batch(reports: List[dict]) -> Dict[int, dict]:
+    """Classify several reports in one LLM call, keyed by report id
+
+    Each report is a dict with ``id``, ``description`` and optional ``location``.
+    Cached classifications are served without a call; entries the LLM omits or
+    returns in an invalid shape are retried one at a time with ``classify_report``.
+    """
+    if not reports:
+        return {}
+
+    results: Dict[int, dict] = {}
+    pending = []
+    for report in reports:
+        cached = llm_cache.get(classification_cache_key(report["description"],
+                                                        report.get("location")))
+        if cached is not None:
+            results[report["id"]] = dict(cached)
+        else:
+            pending.append(report)
+
+    if pending:
+        by_id = {str(report["id"]): report for report in pending}
+        try:
+            response = llm_client.complete_json(build_batch_prompt(pending))
+            entries = response.get("results", []) if isinstance(response, dict) else []
+        except Exception as e:
+            print(f"Error classifying report batch: {e}")
+            entries = []
+
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            report = by_id.get(str(entry.get("report_id")))
+            if report is None or report["id"] in results:
+                continue
+            if validate_classification(entry):
+                classification = {k: v for k, v in entry.items() if k != "report_id"}
+                classification.setdefault("suggested_area", None)
+                results[report["id"]] = classification
+                llm_cache.set(
+                    classification_cache_key(report["description"], report.get("location")),
+                    classification,
+                )
+
+    for report in reports:
+        if report["id"] in results:
+            continue
+        classification = classify_report(report["description"], report.get("location"))
+        if not validate_classification(classification):
+            classification = fallback_classification(report["description"])
+        results[report["id"]] = classification
+
+    return results
@@ -1,18 +1,28 @@
 """Generic OpenAI-style client wrapper"""
-from openai import OpenAI
+import asyncio
+import json
+import random
+from typing import List, Optional
+
+import openai
+from openai import AsyncOpenAI, OpenAI
+
 from app.config import settings
+from app.llm.rate_limit import AsyncTokenBucket
+
+DEFAULT_MODEL = "gpt-4"
 
 
 class LLMClient:
     """Wrapper for OpenAI-compatible API"""
-    
+
     def __init__(self):
         self.client = OpenAI(
             api_key=settings.openai_api_key,
             base_url=settings.openai_base_url
         )
-    
-    def complete(self, prompt: str, model: str = "gpt-4", temperature: float = 0.0) -> str:
+
+    def complete(self, prompt: str, model: str = DEFAULT_MODEL, temperature: float = 0.0) -> str:
         """Send a completion request"""
         response = self.client.chat.completions.create(
             model=model,
@@ -20,8 +30,8 @@ class LLMClient:
             temperature=temperature
         )
         return response.choices[0].message.content
-    
-    def complete_json(self, prompt: str, model: str = "gpt-4") -> dict:
+
+    def complete_json(self, prompt: str, model: str = DEFAULT_MODEL) -> dict:
         """Send a completion request expecting JSON response"""
         response = self.client.chat.completions.create(
             model=model,
@@ -29,9 +39,172 @@ class LLMClient:
             temperature=0.0,
             response_format={"type": "json_object"}
         )
-        import json
         return json.loads(response.choices[0].message.content)
 
+    def embed(self, texts: List[str], model: str = None) -> List[List[float]]:
+        """Embed a batch of texts, returning one vector per input"""
+        response = self.client.embeddings.create(
+            model=model or settings.llm_embedding_model,
+            input=texts
+        )
+        return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) used for quota accounting"""
+    return max(1, len(text) // 4)
+
+
+def _is_retryable(error: Exception) -> bool:
+    """429s, 5xx responses and connection failures are worth retrying"""
+    if isinstance(error, openai.APIConnectionError):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds requested by a Retry-After header, if any"""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class AsyncLLMClient:
+    """Asyncio wrapper for OpenAI-compatible API
+
+    All calls share one ``AsyncOpenAI`` instance (and so one HTTP connection
+    pool). Concurrency is bounded by a semaphore, and request/token budgets are
+    enforced with token buckets before each attempt. 429/5xx responses are
+    retried with full-jitter exponential backoff.
+    """
+
+    def __init__(self, api_key: str = None, base_url: str = None,
+                 max_concurrency: int = None, requests_per_minute: int = None,
+                 tokens_per_minute: int = None, max_retries: int = None,
+                 retry_base_delay: float = None, retry_max_delay: float = None,
+                 client=None):
+        self.client = client or AsyncOpenAI(
+            api_key=api_key or settings.openai_api_key,
+            base_url=base_url or settings.openai_base_url,
+            timeout=settings.llm_timeout_seconds,
+            max_retries=0,  # retries are handled here so they respect the rate limits
+        )
+        self.max_retries = settings.llm_max_retries if max_retries is None else max_retries
+        self.retry_base_delay = (
+            settings.llm_retry_base_delay if retry_base_delay is None else retry_base_delay
+        )
+        self.retry_max_delay = (
+            settings.llm_retry_max_delay if retry_max_delay is None else retry_max_delay
+        )
+
+        rpm = requests_per_minute
+        if rpm is None:
+            rpm = settings.llm_requests_per_minute
+        tpm = tokens_per_minute
+        if tpm is None:
+            tpm = settings.llm_tokens_per_minute
+        self._request_bucket = AsyncTokenBucket.per_minute(rpm) if rpm else None
+        self._token_bucket = AsyncTokenBucket.per_minute(tpm) if tpm else None
+        self._semaphore = asyncio.Semaphore(max_concurrency or settings.llm_max_concurrency)
+
+        self.in_flight = 0
+        self.queued = 0
+        self.throttled = 0
+        self.retries = 0
+        self.failures = 0
+
+    def stats(self) -> dict:
+        """Current load and throttling counters"""
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "throttled": self.throttled,
+            "retries": self.retries,
+            "failures": self.failures,
+        }
+
+    async def complete(self, prompt: str, model: str = DEFAULT_MODEL,
+                       temperature: float = 0.0) -> str:
+        """Send a completion request"""
+        response = await self._create(
+            prompt,
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature
+        )
+        return response.choices[0].message.content
+
+    async def complete_json(self, prompt: str, model: str = DEFAULT_MODEL) -> dict:
+        """Send a completion request expecting JSON response"""
+        response = await self._create(
+            prompt,
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.0,
+            response_format={"type": "json_object"}
+        )
+        return json.loads(response.choices[0].message.content)
+
+    async def aclose(self):
+        """Close the underlying HTTP connection pool"""
+        await self.client.close()
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        delay = random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * 2 ** attempt))
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.retry_max_delay))
+        return delay
+
+    async def _throttle(self, estimated_tokens: int):
+        throttled = False
+        if self._request_bucket:
+            throttled |= await self._request_bucket.acquire(1)
+        if self._token_bucket:
+            throttled |= await self._token_bucket.acquire(estimated_tokens)
+        if throttled:
+            self.throttled += 1
+
+    async def _create(self, prompt: str, **kwargs):
+        estimated_tokens = estimate_tokens(prompt)
+        self.queued += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        try:
+            attempt = 0
+            while True:
+                await self._throttle(estimated_tokens)
+                self.in_flight += 1
+                try:
+                    response = await self.client.chat.completions.create(**kwargs)
+                except Exception as e:
+                    if not _is_retryable(e) or attempt >= self.max_retries:
+                        self.failures += 1
+                        raise
+                    delay = self._backoff(attempt, e)
+                else:
+                    usage = getattr(response, "usage", None)
+                    if self._token_bucket and usage and usage.total_tokens:
+                        self._token_bucket.consume(max(0, usage.total_tokens - estimated_tokens))
+                    return response
+                finally:
+                    self.in_flight -= 1
+
+                attempt += 1
+                self.retries += 1
+                await asyncio.sleep(delay)
+        finally:
+            self._semaphore.release()
+
 
 # Global client instance
 llm_client = LLMClient()
@@ -0,0 +1,40 @@
+"""Text embeddings for candidate retrieval"""
+from typing import List
+
+import numpy as np
+
+from app.config import settings
+from app.llm.cache import llm_cache, make_cache_key
+from app.llm.client import llm_client
+from app.utils.text import normalize_text
+
+
+def embedding_cache_key(text: str) -> str:
+    """Cache key for the embedding of a text"""
+    return make_cache_key("embedding", settings.llm_embedding_model, "1", normalize_text(text))
+
+
+def embed_texts(texts: List[str], batch_size: int = 100) -> np.ndarray:
+    """Embed texts as unit-length float32 rows, reusing cached vectors"""
+    vectors: List = [None] * len(texts)
+    missing = []
+    for i, text in enumerate(texts):
+        cached = llm_cache.get(embedding_cache_key(text))
+        if cached is not None:
+            vectors[i] = cached
+        else:
+            missing.append(i)
+
+    for start in range(0, len(missing), batch_size):
+        chunk = missing[start:start + batch_size]
+        embedded = llm_client.embed([texts[i] for i in chunk])
+        for i, vector in zip(chunk, embedded):
+            vectors[i] = vector
+            llm_cache.set(embedding_cache_key(texts[i]), vector)
+
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+    matrix = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
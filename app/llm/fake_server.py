@@ -0,0 +1,204 @@
+"""Minimal OpenAI-compatible server for tests and load runs
+
+Serves ``POST /v1/chat/completions`` and ``POST /v1/embeddings`` over plain
+asyncio streams so the real ``openai`` client can be exercised end to end
+without network access. Latency and error responses can be injected to test
+retries and rate limiting.
+
+Run standalone with ``python -m app.llm.fake_server --port 8089``.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import re
+import time
+from typing import Callable, Optional
+
+DEFAULT_CLASSIFICATION = {
+    "category": "infrastructure",
+    "severity": "medium",
+    "summary": "Fake classification",
+    "suggested_area": None,
+}
+
+
+def default_responder(prompt: str, request: dict) -> str:
+    """Return a valid classification (or a batch of them) for any prompt"""
+    if '"results"' in prompt:
+        try:
+            items = json.loads(prompt.split("Reports (JSON array):", 1)[1].split("\n\n", 1)[0])
+        except (IndexError, ValueError):
+            items = []
+        return json.dumps({"results": [
+            dict(DEFAULT_CLASSIFICATION, report_id=item["report_id"]) for item in items
+        ]})
+    return json.dumps(DEFAULT_CLASSIFICATION)
+
+
+def fake_embedding(text: str, dim: int = 256) -> list:
+    """Deterministic hashed bag-of-words vector; shared words mean similar vectors"""
+    vector = [0.0] * dim
+    for word in re.findall(r"\w+", text.lower()):
+        bucket = int(hashlib.md5(word.encode()).hexdigest(), 16) % dim
+        vector[bucket] += 1.0
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+class FakeOpenAIServer:
+    """In-process fake of the chat completions endpoint"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 responder: Callable[[str, dict], str] = default_responder):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.responder = responder
+        self.request_count = 0
+        self.active = 0
+        self.max_active = 0
+        self._failures: list = []
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: dict = {}
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    def fail_next(self, count: int, status: int = 429, retry_after: float = None):
+        """Answer the next ``count`` requests with an error status"""
+        self._failures.extend([(status, retry_after)] * count)
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            # Idle keep-alive connections would otherwise outlive the server
+            for writer in list(self._connections.values()):
+                writer.close()
+            if self._connections:
+                await asyncio.wait(list(self._connections), timeout=1.0)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._connections[asyncio.current_task()] = writer
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode().split(" ", 2)
+                headers = {}
+                while True:
+                    line = (await reader.readline()).decode().strip()
+                    if not line:
+                        break
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                status, payload, extra = await self._respond(method, path, body)
+                self._write(writer, status, payload, extra)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            self._connections.pop(asyncio.current_task(), None)
+            writer.close()
+
+    async def _respond(self, method: str, path: str, body: bytes):
+        self.request_count += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            if method != "POST" or not path.endswith(("/chat/completions", "/embeddings")):
+                return 404, {"error": {"message": f"Unknown route {path}"}}, {}
+            if self._failures:
+                status, retry_after = self._failures.pop(0)
+                extra = {"retry-after": str(retry_after)} if retry_after is not None else {}
+                return status, {"error": {"message": "Injected failure", "type": "fake"}}, extra
+
+            request = json.loads(body or b"{}")
+            if path.endswith("/embeddings"):
+                return 200, self._embeddings(request), {}
+            prompt = request["messages"][-1]["content"]
+            content = self.responder(prompt, request)
+            prompt_tokens = max(1, len(prompt) // 4)
+            completion_tokens = max(1, len(content) // 4)
+            return 200, {
+                "id": f"chatcmpl-fake-{self.request_count}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "fake"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            }, {}
+        finally:
+            self.active -= 1
+
+    @staticmethod
+    def _embeddings(request: dict) -> dict:
+        inputs = request["input"]
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        tokens = sum(max(1, len(text) // 4) for text in inputs)
+        return {
+            "object": "list",
+            "model": request.get("model", "fake"),
+            "data": [
+                {"object": "embedding", "index": i, "embedding": fake_embedding(text)}
+                for i, text in enumerate(inputs)
+            ],
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        }
+
+    @staticmethod
+    def _write(writer: asyncio.StreamWriter, status: int, payload: dict, extra: dict):
+        body = json.dumps(payload).encode()
+        lines = [
+            f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+        ]
+        lines.extend(f"{name}: {value}" for name, value in extra.items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + body)
+
+
+async def _serve(host: str, port: int, latency: float):
+    server = FakeOpenAIServer(host=host, port=port, latency=latency)
+    await server.start()
+    print(f"Fake OpenAI server listening on {server.base_url}")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per response")
+    args = parser.parse_args()
+    asyncio.run(_serve(args.host, args.port, args.latency))
@@ -0,0 +1,60 @@
+"""Token-bucket rate limiting for provider quotas"""
+import asyncio
+import time
+from typing import Callable
+
+
+class AsyncTokenBucket:
+    """Async token bucket refilled continuously at ``refill_rate`` tokens/second
+
+    ``acquire`` waits until enough tokens are available. ``consume`` takes
+    tokens without waiting and may drive the balance negative, which is how
+    actual usage reported after a request is reconciled against an estimate.
+    """
+
+    def __init__(self, capacity: float, refill_rate: float,
+                 clock: Callable[[], float] = time.monotonic):
+        if capacity <= 0 or refill_rate <= 0:
+            raise ValueError("capacity and refill_rate must be positive")
+        self.capacity = float(capacity)
+        self.refill_rate = float(refill_rate)
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def per_minute(cls, limit: float) -> "AsyncTokenBucket":
+        """Bucket allowing ``limit`` units per minute with a one-minute burst"""
+        return cls(capacity=limit, refill_rate=limit / 60.0)
+
+    @property
+    def available(self) -> float:
+        """Tokens currently available (may be negative while in debt)"""
+        self._refill()
+        return self._tokens
+
+    def _refill(self):
+        now = self._clock()
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_rate)
+            self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> bool:
+        """Take ``amount`` tokens, waiting if needed; returns True if throttled"""
+        amount = min(float(amount), self.capacity)
+        throttled = False
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return throttled
+                throttled = True
+                await asyncio.sleep((amount - self._tokens) / self.refill_rate)
+
+    def consume(self, amount: float):
+        """Take ``amount`` tokens immediately, allowing the balance to go negative"""
+        self._refill()
+        self._tokens -= amount
@@ -1,19 +1,10 @@
 """Matching reports to existing issues"""
-from app.llm.client import llm_client
+from app.llm.cache import llm_cache, make_cache_key, template_version
+from app.llm.client import DEFAULT_MODEL, llm_client
+from app.llm.validators import validate_similarity_result
+from app.utils.text import normalize_text
 
-
-def find_similar_report(new_report: str, existing_issues: list) -> dict:
-    """Find which existing issue (if any) matches a new report"""
-    
-    if not existing_issues:
-        return {"match": False, "issue_id": None, "confidence": 0.0}
-    
-    issues_text = "\n".join([
-        f"Issue {issue['id']}: {issue['description']}"
-        for issue in existing_issues[:10]  # Limit to avoid token limits
-    ])
-    
-    prompt = f"""
+SIMILARITY_PROMPT_TEMPLATE = """
 You are matching a new incident report to existing open issues.
 
 New Report: {new_report}
@@ -35,10 +26,46 @@ Example:
     "reasoning": "Both reports describe the same pothole at Main and 1st"
 }}
 """
-    
+
+SIMILARITY_TEMPLATE_VERSION = template_version(SIMILARITY_PROMPT_TEMPLATE)
+
+
+def similarity_cache_key(new_report: str, existing_issues: list) -> str:
+    """Cache key for matching a report against a specific candidate set"""
+    candidates = sorted(
+        (issue["id"], normalize_text(issue["description"] or "")) for issue in existing_issues
+    )
+    return make_cache_key(
+        "similarity", DEFAULT_MODEL, SIMILARITY_TEMPLATE_VERSION,
+        {"report": normalize_text(new_report), "candidates": candidates},
+    )
+
+
+def find_similar_report(new_report: str, existing_issues: list) -> dict:
+    """Find which existing issue (if any) matches a new report"""
+
+    if not existing_issues:
+        return {"match": False, "issue_id": None, "confidence": 0.0}
+
+    candidates = existing_issues[:10]  # Limit to avoid token limits
+    cache_key = similarity_cache_key(new_report, candidates)
+    cached = llm_cache.get(cache_key)
+    if cached is not None:
+        return dict(cached)
+
+    issues_text = "\n".join([
+        f"Issue {issue['id']}: {issue['description']}"
+        for issue in candidates
+    ])
+
+    prompt = SIMILARITY_PROMPT_TEMPLATE.format(new_report=new_report, issues_text=issues_text)
+
     try:
         result = llm_client.complete_json(prompt)
-        return result
     except Exception as e:
         print(f"Error finding similar reports: {e}")
         return {"match": False, "issue_id": None, "confidence": 0.0}
+
+    if validate_similarity_result(result):
+        llm_cache.set(cache_key, result)
+    return result
@@ -0,0 +1,162 @@
+"""Per-tenant in-memory vector index over open issues
+
+Small tenants are searched with a brute-force dot product over a contiguous
+float32 matrix. Once a tenant grows past ``ann_threshold`` issues an
+approximate HNSW index is built, if the optional ``hnswlib`` package is
+installed, and maintained alongside the matrix.
+"""
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import hnswlib
+except ImportError:  # optional dependency
+    hnswlib = None
+
+
+class TenantVectorIndex:
+    """Vectors for one tenant's open issues, updated in place"""
+
+    def __init__(self, dim: int, ann_threshold: Optional[int] = None, capacity: int = 64):
+        self.dim = dim
+        self.ann_threshold = ann_threshold
+        self._vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._rows: Dict[int, int] = {}
+        self._ann = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, issue_id: int) -> bool:
+        return issue_id in self._rows
+
+    @property
+    def approximate(self) -> bool:
+        return self._ann is not None
+
+    def add(self, issue_id: int, vector: np.ndarray):
+        """Insert or replace the vector for an issue"""
+        vector = _unit(vector)
+        row = self._rows.get(issue_id)
+        if row is None:
+            row = len(self._rows)
+            if row == len(self._ids):
+                self._grow()
+            self._rows[issue_id] = row
+            self._ids[row] = issue_id
+        self._vectors[row] = vector
+
+        if self._ann is not None:
+            self._ann_add(np.array([issue_id]), vector[None, :])
+        elif self.ann_threshold and hnswlib is not None and len(self) >= self.ann_threshold:
+            self._build_ann()
+
+    def remove(self, issue_id: int) -> bool:
+        """Drop an issue, moving the last row into its slot"""
+        row = self._rows.pop(issue_id, None)
+        if row is None:
+            return False
+        last = len(self._rows)
+        if row != last:
+            moved_id = int(self._ids[last])
+            self._vectors[row] = self._vectors[last]
+            self._ids[row] = moved_id
+            self._rows[moved_id] = row
+        if self._ann is not None:
+            self._ann.mark_deleted(issue_id)
+        return True
+
+    def query(self, vector: np.ndarray, k: int = 10) -> List[Tuple[int, float]]:
+        """Return up to ``k`` (issue_id, cosine score) pairs, best first"""
+        n = len(self._rows)
+        if n == 0 or k <= 0:
+            return []
+        vector = _unit(vector)
+        k = min(k, n)
+
+        if self._ann is not None:
+            self._ann.set_ef(max(k * 4, 50))
+            labels, distances = self._ann.knn_query(vector, k=k)
+            return [(int(i), float(1.0 - d)) for i, d in zip(labels[0], distances[0])]
+
+        scores = self._vectors[:n] @ vector
+        if k < n:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(n)
+        top = top[np.argsort(-scores[top])]
+        return [(int(self._ids[i]), float(scores[i])) for i in top]
+
+    def _grow(self):
+        capacity = len(self._ids) * 2
+        vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+        vectors[:len(self._ids)] = self._vectors
+        ids = np.zeros(capacity, dtype=np.int64)
+        ids[:len(self._ids)] = self._ids
+        self._vectors, self._ids = vectors, ids
+
+    def _build_ann(self):
+        n = len(self._rows)
+        self._ann = hnswlib.Index(space="ip", dim=self.dim)
+        self._ann.init_index(max_elements=max(1024, n * 2), ef_construction=200, M=16)
+        self._ann.add_items(self._vectors[:n], self._ids[:n])
+
+    def _ann_add(self, ids: np.ndarray, vectors: np.ndarray):
+        if self._ann.get_current_count() + len(ids) > self._ann.get_max_elements():
+            self._ann.resize_index(self._ann.get_max_elements() * 2)
+        # Re-adding a deleted label un-deletes and updates it in place
+        self._ann.add_items(vectors, ids)
+
+
+class IssueVectorIndex:
+    """Thread-safe collection of per-tenant vector indexes"""
+
+    def __init__(self, ann_threshold: Optional[int] = None):
+        self.ann_threshold = ann_threshold
+        self._tenants: Dict[int, TenantVectorIndex] = {}
+        self._lock = threading.RLock()
+
+    def has_tenant(self, tenant_id: int) -> bool:
+        return tenant_id in self._tenants
+
+    def load_tenant(self, tenant_id: int, issue_ids: List[int], vectors: np.ndarray):
+        """Replace a tenant's index with the given issues (used on first access)"""
+        with self._lock:
+            dim = vectors.shape[1] if len(issue_ids) else 0
+            index = TenantVectorIndex(dim, self.ann_threshold, capacity=max(64, len(issue_ids)))
+            for issue_id, vector in zip(issue_ids, vectors):
+                index.add(issue_id, vector)
+            self._tenants[tenant_id] = index
+
+    def add(self, tenant_id: int, issue_id: int, vector: np.ndarray):
+        with self._lock:
+            index = self._tenants.get(tenant_id)
+            if index is None or index.dim == 0:
+                index = TenantVectorIndex(len(vector), self.ann_threshold)
+                self._tenants[tenant_id] = index
+            index.add(issue_id, vector)
+
+    def remove(self, tenant_id: int, issue_id: int) -> bool:
+        with self._lock:
+            index = self._tenants.get(tenant_id)
+            return index.remove(issue_id) if index is not None else False
+
+    def query(self, tenant_id: int, vector: np.ndarray, k: int = 10) -> List[Tuple[int, float]]:
+        with self._lock:
+            index = self._tenants.get(tenant_id)
+            if index is None or index.dim == 0:
+                return []
+            return index.query(vector, k)
+
+    def size(self, tenant_id: int) -> int:
+        index = self._tenants.get(tenant_id)
+        return len(index) if index is not None else 0
+
+
+def _unit(vector) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
@@ -1,14 +1,37 @@
 """FastAPI app startup"""
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from app.api import routes_reports, routes_issues, routes_scores, routes_health
+from app.api import (routes_dashboard, routes_health, routes_issues, routes_reports,
+                     routes_scores)
+from app.api.ingest_buffer import create_ingest_buffer
+from app.config import settings
+from app.db.async_base import dispose_async_engine
+from app.utils.concurrency import executors
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    buffer = create_ingest_buffer() if settings.ingest_write_behind_enabled else None
+    if buffer is not None:
+        await buffer.start()
+    app.state.ingest_buffer = buffer
+    yield
+    if buffer is not None:
+        # Flush acknowledged reports before the process exits
+        await buffer.drain(settings.ingest_buffer_drain_timeout_seconds)
+    await dispose_async_engine()
+    executors.shutdown(wait=False, cancel_futures=True)
+
 
-app = FastAPI(title="CivicPulse Engine", version="0.1.0")
+app = FastAPI(title="CivicPulse Engine", version="0.1.0", lifespan=lifespan)
 
 # Include routers
 app.include_router(routes_health.router)
 app.include_router(routes_reports.router)
 app.include_router(routes_issues.router)
 app.include_router(routes_scores.router)
+app.include_router(routes_dashboard.router)
 
 @app.get("/")
 async def root():
@@ -0,0 +1,79 @@
+"""Shared pytest setup"""
+import os
+
+import pytest
+
+# Settings() is instantiated at import time, so provide harmless defaults
+# before any app module is imported by a test.
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    """Per-test SQLite file, so sync and async engines see the same data"""
+    return f"sqlite:///{tmp_path / 'test.db'}"
+
+
+@pytest.fixture
+def session_factory(database_url):
+    """Session factory bound to a SQLite database with the ORM schema"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.db.base import Base
+    import app.db.models  # noqa: F401  (registers tables)
+
+    engine = create_engine(database_url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def async_session_factory(database_url, session_factory):
+    """Async sessions (aiosqlite) on the same database as ``session_factory``"""
+    import asyncio
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    from sqlalchemy.pool import NullPool
+    from app.db.async_base import create_async_db_engine
+
+    # NullPool: TestClient runs the app on its own event loop
+    engine = create_async_db_engine(database_url, poolclass=NullPool)
+    yield async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+    # Sync fixture (api_client uses it too), so dispose on a loop of its own
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture
+def db_session(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def api_client(session_factory, async_session_factory):
+    """TestClient for the app with its session dependencies bound to the SQLite test database"""
+    from fastapi.testclient import TestClient
+    from app.db.async_base import get_async_db
+    from app.db.base import get_db
+    from app.db.routing import get_read_db
+    from app.main import app
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with async_session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(app) as client:
+        yield client
+    app.dependency_overrides.clear()
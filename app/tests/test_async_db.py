@@ -0,0 +1,110 @@
+"""Test the async engine settings, repositories and queries against the sync ones"""
+from datetime import datetime, timedelta
+
+import pytest
+
+
+def test_async_url_and_pool_options(monkeypatch):
+    from app.config import settings
+    from app.db.async_base import _connect_args, async_url
+    from app.db.base import pool_options
+
+    monkeypatch.setattr(settings, "db_prepared_statement_cache_size", 0)
+    monkeypatch.setattr(settings, "db_statement_timeout_ms", 5000)
+    url = async_url("postgresql://app:secret@db/civicpulse")
+
+    assert url == ("postgresql+asyncpg://app:secret@db/civicpulse"
+                   "?prepared_statement_cache_size=0")
+    assert async_url("sqlite:///x.db") == "sqlite+aiosqlite:///x.db"
+    assert _connect_args(url) == {"statement_cache_size": 0,
+                                  "server_settings": {"statement_timeout": "5000"}}
+    assert pool_options(url)["pool_size"] == settings.db_pool_size
+    assert pool_options("sqlite://") == {}
+    with pytest.raises(ValueError):
+        async_url("mysql://db/x")
+
+
+async def test_async_repositories_match_sync(session_factory, async_session_factory):
+    """Pages, totals, streams and writes agree with the sync repositories"""
+    from app.db.async_repositories import (
+        AsyncIssueRepository,
+        AsyncReportRepository,
+        AsyncSLAMetricRepository,
+        AsyncTenantRepository,
+    )
+    from app.db.models import SLAMetricModel
+    from app.db.repositories import IssueRepository, ReportRepository
+
+    start = datetime(2026, 1, 1)
+    async with async_session_factory() as db:
+        tenant = await AsyncTenantRepository.create(db, "City", "city")
+        ids = await AsyncReportRepository.bulk_create(db, [
+            {"tenant_id": tenant.id, "description": f"report {i}",
+             "submitted_at": start + timedelta(minutes=i % 7)}
+            for i in range(25)
+        ])
+        issue = await AsyncIssueRepository.create(db, tenant.id, "road", "high")
+        await AsyncReportRepository.bulk_link(db, [(ids[0], issue.id), (ids[1], issue.id)])
+        await AsyncSLAMetricRepository.upsert_many(db, [
+            {"issue_id": issue.id, "met_sla": True, "resolution_time_hours": 2,
+             "calculated_at": start}
+        ])
+        await db.commit()
+        resolved = await AsyncIssueRepository.set_status(db, issue.id, "resolved")
+
+        pages, after = [], None
+        while True:
+            page, after = await AsyncReportRepository.list_page(db, tenant.id, after, limit=10)
+            pages.append([report.id for report in page])
+            if after is None:
+                break
+        streamed = [report.id async for report in await AsyncReportRepository.stream(db)]
+        total = await AsyncReportRepository.estimate_total(db, tenant.id)
+        claimed = await AsyncReportRepository.claim_unprocessed(db, limit=100)
+        open_issues = await AsyncIssueRepository.list_by_tenant(db, tenant.id, "open")
+
+    sync_db = session_factory()
+    expected, after = [], None
+    while True:
+        page, after = ReportRepository.list_page(sync_db, tenant.id, after, limit=10)
+        expected.append([report.id for report in page])
+        if after is None:
+            break
+    assert pages == expected and [len(page) for page in pages] == [10, 10, 5]
+    assert streamed == [report.id for report in ReportRepository.stream(sync_db)]
+    assert total == 25 and len(claimed) == 23 and open_issues == []
+    assert resolved.resolved_at is not None
+    assert IssueRepository.get_by_id(sync_db, issue.id).status == "resolved"
+    assert sync_db.query(SLAMetricModel).one().met_sla is True
+    sync_db.close()
+
+
+async def test_async_queries_match_sync(db_session, async_session_factory):
+    from app.db import async_queries, queries
+    from app.db.models import IssueModel, SLAMetricModel
+    from app.workers.score_worker import store_scores
+
+    now = datetime.utcnow()
+    for i in range(12):
+        issue = IssueModel(tenant_id=1, category=["road", "water"][i % 2], severity="high",
+                           status="open" if i % 3 == 0 else "resolved",
+                           created_at=now - timedelta(days=i))
+        db_session.add(issue)
+        db_session.flush()
+        db_session.add(SLAMetricModel(issue_id=issue.id, met_sla=i % 4 != 0,
+                                      resolution_time_hours=i + 1,
+                                      calculated_at=now - timedelta(days=i)))
+    db_session.commit()
+    store_scores(db_session, [{"tenant_id": 1, "area_id": None, "metric_type": "overall",
+                               "score": 71.5, "calculated_at": now}])
+
+    async with async_session_factory() as db:
+        for name, args in [("get_issue_counts_by_category", (1,)),
+                           ("get_sla_compliance_rate", (1,)),
+                           ("get_average_resolution_time", (1,)),
+                           ("get_open_issues_count", (1,)),
+                           ("get_latest_scores", (1,)),
+                           ("get_score_leaderboard", ())]:
+            got = await getattr(async_queries, name)(db, *args)
+            assert got == getattr(queries, name)(db_session, *args), name
+    assert got[0]["score"] == 71.5
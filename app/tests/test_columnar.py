@@ -0,0 +1,111 @@
+"""Test columnar snapshots and the shared-memory handoff to process pools"""
+import gc
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+
+def _seed(db, now):
+    from app.db.models import AreaModel, IssueModel, SLAMetricModel
+
+    for area_id in range(1, 5):
+        db.add(AreaModel(id=area_id, tenant_id=1 + area_id % 2, name=f"Area {area_id}"))
+    for i in range(60):
+        created = now - timedelta(days=i % 10, hours=i % 5)
+        resolved = created + timedelta(hours=2 + i % 50) if i % 4 else None
+        area_id = (i % 5) or None
+        issue = IssueModel(tenant_id=1 + i % 2, area_id=area_id,
+                           category=("road", "water", None)[i % 3],
+                           severity="critical" if i % 7 == 0 else "normal",
+                           created_at=created, resolved_at=resolved,
+                           status="resolved" if resolved else "open")
+        db.add(issue)
+        db.flush()
+        if resolved:
+            db.add(SLAMetricModel(issue_id=issue.id, met_sla=i % 3 != 0, calculated_at=resolved,
+                                  resolution_time_hours=2 + i % 50))
+    db.commit()
+
+
+def test_load_issue_columns_encodes_rows(db_session):
+    """One entry per issue; codes, missing areas and SLA results map as documented"""
+    from app.analytics.columnar import NO_AREA, NO_CODE, load_issue_columns
+
+    now = datetime(2026, 3, 1)
+    _seed(db_session, now)
+    columns = load_issue_columns(db_session)
+
+    assert len(columns) == 60 and columns.categories == ("road", "water")
+    assert np.all(np.diff(columns.issue_id) > 0)
+    assert (columns.category == NO_CODE).sum() == 20
+    assert (columns.area_id == NO_AREA).sum() == 12
+    assert np.isnat(columns.resolved_at).sum() == 15
+    assert (columns.met_sla == -1).sum() == 15 and np.isnan(columns.resolution_hours).sum() == 15
+    assert columns.created_at[0] == np.datetime64(now, "s")
+
+    tenant = load_issue_columns(db_session, tenant_id=2, since=now - timedelta(days=4))
+    assert set(tenant.tenant_id) == {2} and len(tenant) < 30
+
+
+def test_shared_kernels_match_in_process_results(db_session):
+    """Pool workers attach to the segment and compute what the parent would"""
+    from app.analytics.columnar import SharedIssueColumns, load_issue_columns, map_shared
+    from app.analytics.performance import sla_summary
+    from app.analytics.rankings import area_rankings
+    from app.analytics.time_series import daily_issue_counts
+
+    now = datetime(2026, 3, 1)
+    _seed(db_session, now)
+    columns = load_issue_columns(db_session)
+    start = now - timedelta(days=10)
+
+    with SharedIssueColumns(columns) as shared:
+        for kernel, args in ((sla_summary, [(1,), (2,), (None,)]),
+                             (area_rankings, [(1,), (2,)]),
+                             (daily_issue_counts, [(1, start, 12), (2, start, 12)])):
+            results = [r.unwrap() for r in map_shared(kernel, shared, args)]
+            expected = [kernel(columns, *a) for a in args]
+            if kernel is daily_issue_counts:
+                for got, want in zip(results, expected):
+                    assert all(np.array_equal(got[k], want[k]) for k in want)
+            else:
+                assert results == expected
+
+    summary = sla_summary(columns)
+    assert summary["total_resolved"] == 45
+    assert summary["met_sla"] + summary["missed_sla"] == 45
+    ranking = area_rankings(columns, 1)
+    assert [r["rank"] for r in ranking] == list(range(1, len(ranking) + 1))
+    rates = [r["compliance_rate"] for r in ranking]
+    assert rates == sorted(rates, reverse=True)
+    counts = daily_issue_counts(columns, 1, start, 12)
+    assert counts["opened"].sum() == 30
+
+
+def test_segment_is_unlinked_once_released():
+    """close(), leaving the block or dropping the owner removes the segment"""
+    from multiprocessing import shared_memory
+    from app.analytics.columnar import COLUMN_DTYPES, IssueColumns, SharedIssueColumns, attach
+
+    columns = IssueColumns(**{name: np.zeros(5, dtype=dtype)
+                              for name, dtype in COLUMN_DTYPES.items()})
+    columns.issue_id[:] = np.arange(1, 6)
+
+    with SharedIssueColumns(columns) as shared:
+        handle = shared.handle
+        with attach(handle) as view:
+            assert list(view.issue_id) == [1, 2, 3, 4, 5]
+            with pytest.raises(ValueError):
+                view.issue_id[0] = 9
+    assert shared.closed
+    shared.close()
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=handle.name)
+
+    dropped = SharedIssueColumns(columns)
+    name = dropped.handle.name
+    del dropped
+    gc.collect()
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
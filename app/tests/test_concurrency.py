@@ -0,0 +1,72 @@
+"""Test shared executors and the streaming imap"""
+import threading
+import time
+
+import pytest
+
+
+def _square_or_fail(n):
+    if n == 3:
+        raise ValueError("three")
+    return n * n
+
+
+def test_imap_keeps_order_and_captures_errors_per_item():
+    """Results line up with inputs on both pools; one failure doesn't hide the rest"""
+    from app.utils.concurrency import imap, parallel_map
+
+    for executor, chunksize in (("io", 1), ("cpu", 4)):
+        results = list(imap(_square_or_fail, range(10), executor, chunksize=chunksize))
+        assert [r.index for r in results] == list(range(10))
+        assert [r.value for r in results if r.ok] == [n * n for n in range(10) if n != 3]
+        assert isinstance(results[3].error, ValueError)
+        with pytest.raises(ValueError):
+            results[3].unwrap()
+
+    assert [r.value for r in parallel_map(_square_or_fail, [1, 2], use_processes=True)] == [1, 4]
+
+
+def test_imap_bounds_in_flight_work_and_streams_lazily():
+    """Never more than max_in_flight tasks outstanding, and input is pulled on demand"""
+    from app.utils.concurrency import imap
+
+    lock = threading.Lock()
+    active, peak, pulled = [0], [0], []
+
+    def work(n):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.01 * (n % 3))
+        with lock:
+            active[0] -= 1
+        return n
+
+    def source():
+        for n in range(40):
+            pulled.append(n)
+            yield n
+
+    stream = imap(work, source(), "io", max_in_flight=3)
+    first = next(stream)
+    assert first.index == 0 and len(pulled) <= 4
+    rest = list(stream)
+    assert peak[0] <= 3 and [r.value for r in rest] == list(range(1, 40))
+
+    unordered = list(imap(work, range(20), "io", max_in_flight=4, ordered=False))
+    assert sorted(r.value for r in unordered) == list(range(20))
+
+
+def test_executor_registry_reuses_pools():
+    """Named executors are created once and recreated only after shutdown"""
+    from app.utils.concurrency import THREAD, ExecutorRegistry
+
+    registry = ExecutorRegistry()
+    registry.register("test", THREAD, max_workers=2)
+    pool = registry.get("test")
+    assert registry.get("test") is pool and registry.running() == ["test"]
+    with pytest.raises(ValueError):
+        registry.register("test", THREAD)
+    registry.shutdown()
+    assert registry.running() == [] and registry.get("test") is not pool
+    registry.shutdown()
@@ -0,0 +1,89 @@
+"""Test the single-query dashboard summary and its endpoint"""
+from datetime import datetime, timedelta
+
+import pytest
+
+
+@pytest.fixture
+def fresh_dashboard_cache():
+    from app.utils.read_cache import dashboard_cache
+
+    dashboard_cache.clear()
+    yield dashboard_cache
+    dashboard_cache.clear()
+
+
+def _seed(db, now):
+    """Tenant 1: 15 issues in the last 30 days, 1 before that; tenant 2 is noise"""
+    from app.db.models import IssueModel, SLAMetricModel
+
+    for i in range(16):
+        issue = IssueModel(tenant_id=1, category=["road", "water", "park"][i % 3],
+                           severity=["high", "low"][i % 2],
+                           status="open" if i % 4 == 0 else "resolved",
+                           created_at=now - timedelta(days=2 * i + 1))
+        db.add(issue)
+        db.flush()
+        if issue.status == "resolved":
+            db.add(SLAMetricModel(issue_id=issue.id, met_sla=i % 3 != 0,
+                                  resolution_time_hours=i + 1,
+                                  calculated_at=now - timedelta(days=2 * i)))
+    db.add(IssueModel(tenant_id=2, category="road", severity="high", status="open",
+                      created_at=now))
+    db.commit()
+
+
+def test_dashboard_counts_match_separate_queries(db_session):
+    from sqlalchemy import event
+    from app.analytics.issue_stats import compute_issue_stats
+    from app.analytics.performance import compute_sla_metrics
+    from app.db import queries
+
+    now = datetime.utcnow()
+    _seed(db_session, now)
+    statements = []
+    event.listen(db_session.get_bind(), "before_cursor_execute",
+                 lambda *args: statements.append(args[2]))
+    stats = compute_issue_stats(1, days=30, db=db_session)
+    assert len(statements) == 1
+
+    assert stats["total_issues"] == 16
+    assert stats["open_issues"] == queries.get_open_issues_count(db_session, 1) == 4
+    assert stats["resolved_issues"] == 12
+    assert stats["by_category"] == queries.get_issue_counts_by_category(db_session, 1)
+    assert stats["by_severity"] == {"high": 8, "low": 8}
+    assert (stats["current_period_issues"], stats["previous_period_issues"]) == (15, 1)
+    assert stats["trend"] == "increasing"
+
+    sla = compute_sla_metrics(1, days=30, db=db_session)
+    assert sla["compliance_rate"] == pytest.approx(
+        queries.get_sla_compliance_rate(db_session, 1))
+    assert sla["average_resolution_hours"] == pytest.approx(
+        float(queries.get_average_resolution_time(db_session, 1)))
+    assert sla["total_resolved"] == sla["met_sla"] + sla["missed_sla"] == 11
+
+
+def test_dashboard_counts_for_tenant_without_issues(db_session):
+    from app.analytics.issue_stats import compute_issue_stats
+    from app.analytics.performance import compute_sla_metrics
+
+    assert compute_issue_stats(99, db=db_session)["trend"] == "stable"
+    assert compute_sla_metrics(99, db=db_session) == {
+        "compliance_rate": 0.0, "average_resolution_hours": 0.0, "total_resolved": 0,
+        "met_sla": 0, "missed_sla": 0,
+    }
+
+
+def test_dashboard_endpoint_is_cached_with_etag(api_client, db_session, fresh_dashboard_cache):
+    _seed(db_session, datetime.utcnow())
+
+    first = api_client.get("/dashboard/1")
+    assert first.status_code == 200
+    body = first.json()
+    assert body["total_issues"] == 16 and body["sla"]["total_resolved"] == 11
+    assert body["by_category"] == {"road": 6, "water": 5, "park": 5}
+
+    again = api_client.get("/dashboard/1", headers={"If-None-Match": first.headers["etag"]})
+    assert again.status_code == 304
+    assert api_client.get("/dashboard/1?days=7").json()["days"] == 7
+    assert fresh_dashboard_cache.stats()["loads"] == 2
@@ -0,0 +1,75 @@
+"""Test slotted domain records and the struct-of-arrays batches"""
+import dataclasses
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+
+def _issues():
+    from app.domain.issue import Issue
+
+    start = datetime(2026, 1, 5, 8, 30, 15, 250)
+    return [
+        Issue(id=i, tenant_id=1 + i % 3, area_id=(i % 4) or None,
+              category=("road", "water", None)[i % 3], severity="high" if i % 2 else "low",
+              status="resolved" if i % 3 else "open",
+              created_at=start + timedelta(hours=i),
+              resolved_at=start + timedelta(hours=i, minutes=7 * i, microseconds=i) if i % 3
+              else None)
+        for i in range(1, 13)
+    ]
+
+
+def test_records_are_frozen_and_slotted():
+    from app.domain.issue import IssueRecord
+    from app.domain.rating import RatingRecord
+
+    record = IssueRecord(1, 2, None, "road", "high", "open", datetime(2026, 1, 1))
+    assert not hasattr(record, "__dict__") and record.is_open()
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        record.status = "resolved"
+    assert RatingRecord(1, 2, None, 79.99, "overall", datetime(2026, 1, 1)).letter_grade == "C"
+
+
+def test_issue_batch_matches_scalar_methods():
+    """Vectorized is_open / resolution hours agree with Issue and SLA"""
+    from app.domain.batch import IssueBatch
+    from app.domain.issue import IssueRecord
+    from app.domain.sla import SLA
+
+    issues = _issues()
+    batch = IssueBatch.from_records(issues)
+
+    assert len(batch) == 12 and batch.categories == ("road", "water")
+    assert batch.is_open().tolist() == [i.is_open() for i in issues]
+    hours = batch.resolution_hours()
+    for issue, value in zip(issues, hours):
+        if issue.resolved_at is None:
+            assert np.isnan(value)
+        else:
+            assert value == pytest.approx(
+                SLA.calculate_resolution_time(issue.created_at, issue.resolved_at), abs=1e-9)
+    assert list(batch) == [IssueRecord(**dataclasses.asdict(i)) for i in issues]
+    assert not IssueBatch.from_records([]).is_open().any()
+
+
+def test_report_batch_round_trips_and_counts():
+    from app.domain.batch import ReportBatch
+    from app.domain.report import Report
+
+    reports = [Report(id=i, issue_id=(i // 2) or None, tenant_id=1, description=f"r{i}",
+                      location=None, submitted_at=datetime(2026, 1, 1, 0, i), processed=i > 1)
+               for i in range(1, 7)]
+    batch = ReportBatch.from_records(reports)
+
+    assert [dataclasses.asdict(r) for r in batch] == [dataclasses.asdict(r) for r in reports]
+    ids, counts = batch.reports_per_issue()
+    assert ids.tolist() == [1, 2, 3] and counts.tolist() == [2, 2, 1]
+
+
+def test_letter_grades_match_scalar():
+    from app.domain.rating import letter_grade, letter_grades
+
+    scores = [0.0, 59.99, 60.0, 69.5, 70.0, 80.0, 89.999, 90.0, 100.0, float("nan")]
+    assert letter_grades(np.array(scores)).tolist() == [letter_grade(s) for s in scores]
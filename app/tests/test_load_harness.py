@@ -0,0 +1,74 @@
+"""Test the load harness in scripts/simulate_load.py"""
+import importlib.util
+import json
+import os
+import random
+
+import pytest
+
+SCRIPT = os.path.join(os.path.dirname(__file__), "..", "..", "scripts", "simulate_load.py")
+
+
+@pytest.fixture(scope="module")
+def harness():
+    spec = importlib.util.spec_from_file_location("simulate_load", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_histogram_percentiles_keep_three_significant_digits(harness):
+    histogram, low = harness.Histogram(), harness.Histogram()
+    for us in range(1, 100_001):
+        (histogram if us > 1000 else low).record(us / 1e6)
+    histogram.merge(low)
+
+    assert histogram.count == 100_000 and histogram.min == 1 and histogram.max == 100_000
+    assert histogram.percentile(0.5) == 500  # exact below 2048 us
+    for percent, expected in [(50, 50_000), (99, 99_000), (99.9, 99_900)]:
+        assert histogram.percentile(percent) == pytest.approx(expected, rel=1e-3)
+    assert histogram.percentile(100) == 100_000
+    assert sum(count for _, count in histogram.buckets()) == 100_000
+    assert len(histogram.buckets()) < 8000
+
+
+def test_zipf_tenants_and_arrival_processes(harness):
+    rng = random.Random(7)
+    skewed, uniform = harness.ZipfTenants(10, 1.2, rng), harness.ZipfTenants(4, 0.0, rng)
+    draws = [skewed() for _ in range(20_000)]
+    assert draws.count(1) > 5 * draws.count(10) and set(draws) == set(range(1, 11))
+    draws = [uniform() for _ in range(20_000)]
+    assert min(draws.count(t) for t in range(1, 5)) > 4500
+
+    assert harness.arrival_gaps("constant", 50, rng)(3.0) == 0.02
+    poisson = harness.arrival_gaps("poisson", 100, rng)
+    assert sum(poisson(0) for _ in range(20_000)) / 20_000 == pytest.approx(0.01, rel=0.05)
+    burst = harness.arrival_gaps("burst", 10, rng, burst_factor=10, burst_every=5,
+                                 burst_length=1)
+    in_burst = sum(burst(0.5) for _ in range(5000)) / 5000
+    assert in_burst == pytest.approx(0.01, rel=0.1)
+    assert sum(burst(3.0) for _ in range(5000)) / 5000 > 5 * in_burst
+    with pytest.raises(ValueError):
+        harness.arrival_gaps("bursty", 10, rng)
+
+
+async def test_open_loop_over_asgi_transport(harness, api_client, db_session):
+    """Requests go straight to the app; the summary is JSON-ready"""
+    from app.main import app
+    from app.utils.read_cache import dashboard_cache
+
+    dashboard_cache.clear()
+    rng = random.Random(3)
+    scenario = harness.Scenario(harness.ZipfTenants(3, 1.0, rng),
+                                {"submit_report": 1, "dashboard": 1, "health": 1}, rng)
+    recorder = harness.Recorder()
+    await harness.open_loop(harness.ConnectionPool(lambda: harness.AsgiConnection(app)),
+                            scenario, harness.arrival_gaps("constant", 200, rng),
+                            duration=0.25, max_inflight=100, timeout=5, recorder=recorder)
+    summary = json.loads(json.dumps(harness.summarize(recorder, 0.25)))
+
+    assert set(summary["endpoints"]) == {"submit_report", "dashboard", "health"}
+    assert summary["total"]["requests"] == 50 and summary["total"]["errors"] == 0
+    latency = summary["total"]["latency_ms"]
+    assert 0 < latency["p50"] <= latency["p99"] <= latency["p999"] <= latency["max"]
+    dashboard_cache.clear()
@@ -0,0 +1,162 @@
+"""Test dashboard rollups against the raw-table queries"""
+from datetime import datetime, timedelta
+
+import pytest
+
+
+NOW = datetime(2026, 3, 10, 14, 25)
+
+
+def _seed(db, tenant_id=1):
+    """Issues and SLA results spread over ~5 days, including the last hour"""
+    from app.db.models import IssueModel, SLAMetricModel
+
+    categories = ["road", "lighting", "water"]
+    for i in range(60):
+        created = NOW - timedelta(hours=2 * i, minutes=7 * i % 60)
+        issue = IssueModel(tenant_id=tenant_id, area_id=i % 2 or None,
+                           category=categories[i % 3], severity="high" if i % 4 else "low",
+                           created_at=created)
+        if i % 3 != 2:
+            issue.status = "resolved"
+            issue.resolved_at = created + timedelta(hours=i % 9 + 1)
+        db.add(issue)
+        db.flush()
+        if issue.resolved_at and issue.resolved_at < NOW:
+            db.add(SLAMetricModel(issue_id=issue.id, met_sla=i % 5 != 0,
+                                  resolution_time_hours=i % 9 + 1,
+                                  calculated_at=issue.resolved_at))
+    db.add(IssueModel(tenant_id=2, category="road", severity="low", created_at=NOW))
+    db.commit()
+
+
+def _dashboard(db, monkeypatch):
+    import app.db.queries as queries
+
+    class FrozenDatetime(datetime):
+        @classmethod
+        def utcnow(cls):
+            return NOW
+
+    monkeypatch.setattr(queries, "datetime", FrozenDatetime)
+    return (
+        queries.get_issue_counts_by_category(db, 1),
+        round(queries.get_sla_compliance_rate(db, 1, days=3), 9),
+        round(float(queries.get_average_resolution_time(db, 1, days=3)), 9),
+    )
+
+
+def test_rollup_reads_match_raw_queries(db_session, monkeypatch):
+    """Rollups + raw tail give the same dashboard numbers as the raw tables"""
+    from app.db.rollups import get_watermark, refresh_rollups
+
+    _seed(db_session)
+    raw = _dashboard(db_session, monkeypatch)
+    watermark = refresh_rollups(db_session, now=NOW)
+
+    assert watermark == datetime(2026, 3, 10, 14)
+    assert get_watermark(db_session) == watermark
+    assert _dashboard(db_session, monkeypatch) == raw
+    assert raw[0] == {"road": 20, "lighting": 20, "water": 20}
+
+
+def test_incremental_refresh_and_chunked_backfill_agree(db_session):
+    """Advancing the watermark hour by hour matches one chunked rebuild"""
+    from app.db.models import IssueRollupDailyModel, IssueRollupHourlyModel
+    from app.db.rollups import rebuild_rollups, refresh_rollups
+
+    _seed(db_session)
+    for hours_back in (30, 12, 5, 0):
+        refresh_rollups(db_session, now=NOW - timedelta(hours=hours_back))
+
+    def snapshot(model):
+        return sorted(
+            (r.tenant_id, r.area_id or 0, r.category, r.severity, r.bucket_start,
+             r.issues_created, r.issues_resolved, r.sla_met, r.sla_missed,
+             round(r.resolution_hours_sq_sum, 6))
+            for r in db_session.query(model)
+        )
+
+    incremental = snapshot(IssueRollupHourlyModel), snapshot(IssueRollupDailyModel)
+    chunks = rebuild_rollups(db_session, NOW - timedelta(days=6), NOW - timedelta(hours=1),
+                             chunk_hours=7)
+
+    assert chunks > 1
+    assert (snapshot(IssueRollupHourlyModel), snapshot(IssueRollupDailyModel)) == incremental
+
+
+def test_reopen_and_reresolve_rebuild_rolled_up_hours(db_session):
+    """Reopening, re-resolving and re-evaluating SLAs keep rollups equal to the raw tables"""
+    from app.db.models import IssueModel
+    from app.db.repositories import IssueRepository
+    from app.db.rollups import (aggregate_raw, empty_totals, floor_hour, refresh_rollups,
+                                rollup_totals)
+    from app.workers.sla_worker import process_changed_issues
+
+    now = datetime.utcnow()
+    issue = IssueModel(tenant_id=1, category="road", severity="critical",
+                       created_at=now - timedelta(hours=5), updated_at=now - timedelta(hours=5))
+    db_session.add(issue)
+    db_session.commit()
+    later = now + timedelta(hours=3)
+    covered = floor_hour(later) - timedelta(hours=1)  # below the watermark: rollups only
+
+    def check(resolved, met):
+        refresh_rollups(db_session, now=later)
+        expected = empty_totals()
+        for totals in aggregate_raw(db_session, (None, None), tenant_id=1).values():
+            for metric, value in totals.items():
+                expected[metric] += value
+        rolled = rollup_totals(db_session, 1, end=covered)[None]
+        assert rolled == pytest.approx(expected)
+        assert (rolled["issues_resolved"], rolled["sla_met"]) == (resolved, met)
+
+    IssueRepository.set_status(db_session, issue.id, "resolved")
+    process_changed_issues(db_session)
+    check(resolved=1, met=1)
+
+    IssueRepository.set_status(db_session, issue.id, "open")
+    process_changed_issues(db_session)
+    check(resolved=0, met=0)
+
+    IssueRepository.set_status(db_session, issue.id, "resolved")
+    process_changed_issues(db_session)
+    check(resolved=1, met=1)
+
+
+def test_recategorized_issues_rebuild_once_marked(db_session, monkeypatch):
+    """Dimension changes below the watermark show up after mark_issues_stale + refresh"""
+    from app.db.models import IssueModel
+    from app.db.rollups import mark_issues_stale, refresh_rollups
+
+    _seed(db_session)
+    refresh_rollups(db_session, now=NOW)
+    ids = [row.id for row in db_session.query(IssueModel.id).filter(
+        IssueModel.tenant_id == 1, IssueModel.category == "water").limit(4)]
+
+    mark_issues_stale(db_session, ids)
+    db_session.query(IssueModel).filter(IssueModel.id.in_(ids)).update(
+        {"category": "road", "area_id": 7}, synchronize_session=False)
+    db_session.commit()
+    refresh_rollups(db_session, now=NOW)
+
+    counts = _dashboard(db_session, monkeypatch)[0]
+    assert counts == {"road": 24, "lighting": 20, "water": 16}
+
+
+@pytest.mark.parametrize("span,daily,hourly,raw", [
+    ((datetime(2026, 3, 1, 10, 30), None),
+     [(datetime(2026, 3, 2), datetime(2026, 3, 5))],
+     [(datetime(2026, 3, 1, 11), datetime(2026, 3, 2)),
+      (datetime(2026, 3, 5), datetime(2026, 3, 5, 6))],
+     [(datetime(2026, 3, 1, 10, 30), datetime(2026, 3, 1, 11)),
+      (datetime(2026, 3, 5, 6), None)]),
+    ((datetime(2026, 3, 5, 2), None), [],
+     [(datetime(2026, 3, 5, 2), datetime(2026, 3, 5, 6))], [(datetime(2026, 3, 5, 6), None)]),
+    ((datetime(2026, 3, 5, 7), None), [], [], [(datetime(2026, 3, 5, 7), None)]),
+])
+def test_split_span(span, daily, hourly, raw):
+    """Whole days, whole hours and ragged edges are routed to the right source"""
+    from app.db.rollups import split_span
+
+    assert split_span(span, datetime(2026, 3, 5, 6)) == (daily, hourly, raw)
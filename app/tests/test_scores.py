@@ -0,0 +1,269 @@
+"""Test score endpoints and their response cache"""
+import asyncio
+from datetime import datetime
+
+import pytest
+
+
+@pytest.fixture
+def fresh_scores_cache():
+    from app.analytics.rankings import leaderboards
+    from app.utils.read_cache import scores_cache
+
+    scores_cache.clear()
+    leaderboards.clear()
+    yield scores_cache
+    scores_cache.clear()
+    leaderboards.clear()
+
+
+def _scores(tenant_id, overall, at, area_id=None):
+    return [
+        {"tenant_id": tenant_id, "area_id": area_id, "metric_type": "overall",
+         "score": overall, "calculated_at": at},
+        {"tenant_id": tenant_id, "area_id": area_id, "metric_type": "sla",
+         "score": overall / 2, "calculated_at": at},
+    ]
+
+
+def test_tenant_scores_etag_and_invalidation(api_client, db_session, fresh_scores_cache):
+    """Repeat requests revalidate to 304; new scores change the body and ETag"""
+    from app.workers.score_worker import store_scores
+
+    store_scores(db_session, _scores(1, 80.0, datetime(2026, 1, 1)))
+    first = api_client.get("/scores/tenant/1")
+    assert first.status_code == 200
+    assert first.json()["scores"]["overall"] == 80.0
+
+    again = api_client.get("/scores/tenant/1", headers={"If-None-Match": first.headers["etag"]})
+    assert again.status_code == 304 and again.headers["etag"] == first.headers["etag"]
+    assert fresh_scores_cache.stats()["loads"] == 1
+
+    store_scores(db_session, _scores(1, 91.0, datetime(2026, 1, 2)))
+    updated = api_client.get("/scores/tenant/1", headers={"If-None-Match": first.headers["etag"]})
+    assert updated.status_code == 200
+    assert updated.json()["scores"]["overall"] == 91.0
+    assert updated.headers["etag"] != first.headers["etag"]
+
+
+def test_area_scores_and_leaderboard(api_client, db_session, fresh_scores_cache):
+    """Area scores resolve their tenant; the leaderboard ranks latest area scores"""
+    from app.db.models import AreaModel
+    from app.workers.score_worker import store_scores
+
+    db_session.add_all([AreaModel(id=10, tenant_id=1, name="North"),
+                        AreaModel(id=11, tenant_id=1, name="South")])
+    db_session.commit()
+    store_scores(db_session, _scores(1, 70.0, datetime(2026, 1, 1), area_id=10)
+                 + _scores(1, 60.0, datetime(2026, 1, 1), area_id=11)
+                 + _scores(1, 95.0, datetime(2026, 1, 2), area_id=11))
+
+    assert api_client.get("/scores/area/10").json()["scores"]["sla"] == 35.0
+    assert api_client.get("/scores/area/99").status_code == 404
+    board = api_client.get("/scores/leaderboard", params={"tenant_id": 1}).json()["leaderboard"]
+    assert [(row["rank"], row["area_id"], row["score"]) for row in board] == [
+        (1, 11, 95.0), (2, 10, 70.0)
+    ]
+    assert api_client.get("/scores/leaderboard", params={"metric_type": "x"}).status_code == 400
+
+
+def test_leaderboard_ranks_ties_and_matches_brute_force():
+    """Bisection ranks, percentiles and top/bottom-k agree with sorting every time"""
+    import random
+    from app.analytics.rankings import Leaderboard, get_percentile_rank
+
+    rng = random.Random(5)
+    scores = {i: float(rng.randint(0, 20)) for i in range(300)}
+    board = Leaderboard(scores)
+    for _ in range(200):
+        entity_id = rng.randrange(350)
+        if rng.random() < 0.2:
+            board.remove(entity_id)
+            scores.pop(entity_id, None)
+        else:
+            scores[entity_id] = float(rng.randint(0, 20))
+            board.update(entity_id, scores[entity_id])
+
+    values = list(scores.values())
+    expected = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+    assert len(board) == len(scores)
+    assert [(e, s) for _, e, s in board.top(len(scores))] == expected
+    assert [e for _, e, _ in board.bottom(5)] == [e for e, _ in expected[::-1][:5]]
+    for entity_id, score in scores.items():
+        assert board.rank(entity_id) == 1 + sum(v > score for v in values)
+        assert board.percentile(score) == get_percentile_rank(score, values)
+    assert board.count_between(5, 10) == sum(5 <= v <= 10 for v in values)
+    assert board.rank(999) is None and Leaderboard().percentile(1.0) == 50.0
+
+
+def test_leaderboard_index_applies_new_scores_incrementally(db_session, fresh_scores_cache):
+    """Loaded boards take stored rows in place; other invalidations force a reload"""
+    from app.analytics.rankings import compute_tenant_rankings, leaderboards
+    from app.workers.score_worker import store_scores
+
+    loads = leaderboards.loads
+    store_scores(db_session, _scores(1, 80.0, datetime(2026, 1, 1))
+                 + _scores(2, 80.0, datetime(2026, 1, 1))
+                 + _scores(3, 60.0, datetime(2026, 1, 1)))
+    ranked = compute_tenant_rankings(db=db_session)
+    assert [(r["rank"], r["tenant_id"]) for r in ranked] == [(1, 1), (1, 2), (3, 3)]
+    assert ranked[2]["percentile"] == pytest.approx(33.3)
+
+    store_scores(db_session, _scores(3, 99.0, datetime(2026, 1, 2)))
+    assert leaderboards.top(db_session, k=1)[0]["tenant_id"] == 3
+    assert leaderboards.standing(db_session, 1, metric_type="sla") == {
+        "rank": 2, "of": 3, "score": 40.0, "percentile": 66.7}
+    assert leaderboards.loads - loads == 2
+
+    fresh_scores_cache.invalidate([2])
+    assert [r["tenant_id"] for r in leaderboards.bottom(db_session, k=2)] == [2, 1]
+    assert leaderboards.loads - loads == 3
+
+
+def test_leaderboard_reloads_after_ttl_on_memory_backend(db_session):
+    """Scores written by another process show up once the board outlives the TTL"""
+    from app.analytics.rankings import LeaderboardIndex
+    from app.db.models import PerformanceScoreModel
+    from app.utils.read_cache import FakeSharedBackend, MemoryBackend, TenantReadCache
+
+    def write_elsewhere(rows):
+        db_session.execute(PerformanceScoreModel.__table__.insert(), rows)
+        db_session.commit()
+
+    now = {"t": 0.0}
+    index = LeaderboardIndex(TenantReadCache(MemoryBackend(), namespace="t", ttl_seconds=60),
+                             clock=lambda: now["t"])
+    write_elsewhere(_scores(1, 80.0, datetime(2026, 1, 1)))
+    assert index.top(db_session)[0]["score"] == 80.0
+
+    # Another process stores scores; its invalidation never reaches this backend
+    write_elsewhere(_scores(1, 90.0, datetime(2026, 1, 2)))
+    now["t"] = 59.0
+    assert index.top(db_session)[0]["score"] == 80.0
+    now["t"] = 60.0
+    assert index.top(db_session)[0]["score"] == 90.0 and index.loads == 2
+
+    shared = LeaderboardIndex(TenantReadCache(FakeSharedBackend(), namespace="t",
+                                              ttl_seconds=60), clock=lambda: now["t"])
+    shared.top(db_session)
+    now["t"] = 1000.0
+    shared.top(db_session)
+    assert shared.loads == 1
+
+
+async def test_concurrent_misses_load_once():
+    """A burst of requests after invalidation triggers a single load"""
+    import time
+    from app.utils.read_cache import MemoryBackend, TenantReadCache
+
+    cache = TenantReadCache(MemoryBackend(), namespace="test", ttl_seconds=60)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return {"value": len(calls)}
+
+    entries = await asyncio.gather(*[cache.get_or_load(1, "k", loader) for _ in range(20)])
+    cache.invalidate([1])
+    reloaded = await cache.get_or_load(1, "k", loader)
+
+    assert len(calls) == 2
+    assert len({entry["etag"] for entry in entries}) == 1
+    assert reloaded["body"] == '{"value":2}'
+    assert cache.stats()["coalesced"] == 19
+
+
+async def test_shared_backend_invalidation_reaches_other_processes():
+    """With a shared backend, the worker's invalidation is seen by every API instance"""
+    from app.utils.read_cache import FakeSharedBackend, TenantReadCache
+
+    shared = FakeSharedBackend()
+    api_cache = TenantReadCache(shared, namespace="scores", ttl_seconds=60)
+    worker_cache = TenantReadCache(shared, namespace="scores", ttl_seconds=60)
+    version = {"n": 1}
+
+    first = await api_cache.get_or_load(5, "tenant", lambda: dict(version))
+    version["n"] = 2
+    cached = await api_cache.get_or_load(5, "tenant", lambda: dict(version))
+    worker_cache.invalidate([5])
+    fresh = await api_cache.get_or_load(5, "tenant", lambda: dict(version))
+
+    assert first == cached and fresh["body"] == '{"n":2}'
+
+
+def test_clear_only_drops_own_namespace():
+    """Caches sharing a backend clear their own keys; Redis clears by SCAN + DEL"""
+    import fnmatch
+    from app.utils.read_cache import FakeSharedBackend, RedisBackend, TenantReadCache
+
+    class Client:
+        def __init__(self):
+            self.values, self.deletes = {}, 0
+
+        def scan_iter(self, match, count):
+            return [k for k in list(self.values) if fnmatch.fnmatchcase(k, match)]
+
+        def delete(self, *keys):
+            self.deletes += 1
+            for key in keys:
+                self.values.pop(key, None)
+
+    client = Client()
+    client.values.update({f"scores:{i}:g0:k": "{}" for i in range(1200)})
+    client.values.update({"dashboard:1:g0:k": "{}", "scores-old:1": "{}"})
+    TenantReadCache(RedisBackend("redis://", client=client), namespace="scores").clear()
+    assert set(client.values) == {"dashboard:1:g0:k", "scores-old:1"} and client.deletes == 3
+    with pytest.raises(ValueError):
+        RedisBackend("redis://", client=client).clear()
+
+    shared = FakeSharedBackend()
+    scores = TenantReadCache(shared, namespace="scores")
+    dashboard = TenantReadCache(shared, namespace="dashboard")
+    scores.invalidate([1])
+    dashboard.invalidate([1])
+    scores.clear()
+    assert scores.generation(1) == 0 and dashboard.generation(1) == 1
+
+
+def _seed_scoring_data(db, now):
+    from datetime import timedelta
+    from app.db.models import AreaModel, IssueModel, SLAMetricModel
+
+    for area_id in range(1, 7):
+        db.add(AreaModel(id=area_id, tenant_id=1 + area_id % 2, name=f"Area {area_id}"))
+    for i in range(120):
+        created = now - timedelta(days=i % 40, hours=i % 7)
+        resolved = created + timedelta(hours=1 + i % 30) if i % 5 else None
+        area_id = (i % 7) or None
+        issue = IssueModel(tenant_id=1 + (area_id or i) % 2, area_id=area_id, category="road",
+                           severity="high", created_at=created, resolved_at=resolved,
+                           status="resolved" if resolved else "open")
+        db.add(issue)
+        db.flush()
+        if resolved and resolved < now:
+            db.add(SLAMetricModel(issue_id=issue.id, met_sla=i % 3 != 0, calculated_at=resolved,
+                                  resolution_time_hours=None if i % 11 == 0 else 1 + i % 30))
+    db.commit()
+
+
+def test_batch_engine_matches_per_entity_scores(db_session):
+    """Vectorized overall scores equal the single-entity path for tenants and areas"""
+    from app.analytics.score_engine import compute_all_scores
+    from app.workers.score_worker import calculate_area_score, calculate_tenant_score
+
+    now = datetime(2026, 2, 1)
+    _seed_scoring_data(db_session, now)
+
+    rows = compute_all_scores(db_session, days=30, now=now)
+    overall = {(r["tenant_id"], r["area_id"]): r["score"]
+               for r in rows if r["metric_type"] == "overall"}
+
+    assert {key for key in overall if key[1] is None} == {(1, None), (2, None)}
+    assert len(overall) == 2 + 6
+    for (tenant_id, area_id), score in overall.items():
+        expected = (calculate_tenant_score(tenant_id, db_session, now) if area_id is None
+                    else calculate_area_score(area_id, db_session, now))
+        assert score == pytest.approx(expected, abs=0.01)
+    assert {r["metric_type"] for r in rows} == {"overall", "sla", "responsiveness"}
+    assert all(0 <= r["score"] <= 100 for r in rows if r["metric_type"] != "overall")
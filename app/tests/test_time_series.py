@@ -0,0 +1,127 @@
+"""Test time-series bucketing, smoothing and the rollup/raw loaders"""
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pytest
+
+START = datetime(2025, 1, 1)
+END = datetime(2026, 1, 1)
+
+
+def _local_bucket(second: int, tz: str, interval: str) -> datetime:
+    """Reference bucketing with zoneinfo, one event at a time"""
+    local = datetime.fromtimestamp(second, ZoneInfo(tz)).replace(tzinfo=None)
+    if interval == "hourly":
+        return local.replace(minute=0, second=0)
+    day = local.replace(hour=0, minute=0, second=0)
+    if interval == "weekly":
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1) if interval == "monthly" else day
+
+
+@pytest.mark.parametrize("tz", ["UTC", "America/New_York", "Asia/Kolkata", "America/St_Johns",
+                                "Australia/Lord_Howe"])
+@pytest.mark.parametrize("interval", ["hourly", "daily", "weekly", "monthly"])
+def test_aggregate_matches_per_event_zoneinfo(tz, interval):
+    """Vectorized local bucketing agrees with zoneinfo, including around DST changes"""
+    from app.analytics.time_series import aggregate
+
+    rng = np.random.default_rng(3)
+    start_s = int(START.replace(tzinfo=timezone.utc).timestamp())
+    seconds = start_s + rng.integers(0, 365 * 86400, 3000)
+    series = aggregate(seconds, START, END, interval, tz)
+
+    expected = Counter(_local_bucket(int(s), tz, interval) for s in seconds)
+    got = {b: c for b, c in zip(series.buckets.astype(datetime).tolist(), series.count) if c}
+    assert got == dict(expected)
+    assert series.count.sum() == 3000 and np.all(np.diff(series.buckets).astype(int) > 0)
+
+
+def test_aggregate_fills_gaps_and_computes_percentiles():
+    from app.analytics.time_series import aggregate
+
+    stamps = np.array(["2025-03-01T05", "2025-03-01T20", "2025-03-01T21", "2025-03-04T10"],
+                      dtype="datetime64[s]")
+    values = np.array([1.0, 9.0, 5.0, 4.0])
+    series = aggregate(stamps, datetime(2025, 3, 1), datetime(2025, 3, 5), "daily",
+                       values=values, percentiles=(50, 90))
+
+    assert series.count.tolist() == [3, 0, 0, 1]
+    assert series.sum.tolist() == [15.0, 0.0, 0.0, 4.0]
+    assert series.avg.tolist() == [5.0, 0.0, 0.0, 4.0]
+    assert series.percentiles[50].tolist() == [5.0, 0.0, 0.0, 4.0]
+    assert series.percentiles[90][0] == pytest.approx(np.percentile([1, 9, 5], 90))
+    assert series.to_points()[1] == {"bucket": "2025-03-02T00:00:00", "count": 0, "sum": 0.0,
+                                     "avg": 0.0, "p50": 0.0, "p90": 0.0}
+
+
+def test_smoothing_is_linear_and_matches_windowed_mean():
+    from app.analytics.time_series import ewma, moving_average, smooth_trend
+
+    values = list(np.random.default_rng(1).uniform(0, 50, 200))
+    expected = [np.mean(values[max(0, i - 6):i + 1]) for i in range(len(values))]
+    assert smooth_trend(values, 7) == pytest.approx(expected)
+    assert smooth_trend([1.0, 2.0], 7) == [1.0, 2.0]
+    assert moving_average([2, 4, 6], 2).tolist() == [2.0, 3.0, 5.0]
+    assert ewma([0, 10, 10], alpha=0.5).tolist() == [0.0, 5.0, 7.5]
+    assert ewma([1, 1], span=3).tolist() == [1.0, 1.0]
+
+
+NOW = datetime(2026, 3, 10, 14, 25)
+
+
+def _seed(db, tz):
+    from app.db.models import IssueModel, ReportModel, SLAMetricModel, TenantModel
+
+    db.add(TenantModel(id=1, name="City", type="city", timezone=tz))
+    for i in range(80):
+        created = NOW - timedelta(hours=3 * i, minutes=11 * i % 60)
+        resolved = created + timedelta(hours=i % 13 + 1, minutes=i) if i % 4 else None
+        issue = IssueModel(tenant_id=1, category="road", severity="high", created_at=created,
+                           resolved_at=resolved, status="resolved" if resolved else "open")
+        db.add(issue)
+        db.flush()
+        db.add(ReportModel(tenant_id=1, issue_id=issue.id, description="x",
+                           submitted_at=created))
+        if resolved and resolved < NOW:
+            db.add(SLAMetricModel(issue_id=issue.id, met_sla=i % 5 != 0, calculated_at=resolved,
+                                  resolution_time_hours=i % 13 + 1))
+    db.commit()
+
+
+@pytest.mark.parametrize("tz", ["UTC", "Europe/Berlin", "Asia/Kolkata"])
+def test_load_time_series_rollups_match_raw(db_session, tz):
+    """Series read through the rollups equal the raw-table series"""
+    from app.analytics.time_series import METRICS, load_time_series
+    from app.db.rollups import refresh_rollups
+
+    _seed(db_session, tz)
+    start = NOW - timedelta(days=9, minutes=17)
+
+    def snapshot():
+        return {(metric, interval): load_time_series(db_session, 1, metric, start, NOW, interval)
+                for metric in METRICS for interval in ("hourly", "daily", "weekly")}
+
+    raw = snapshot()
+    refresh_rollups(db_session, now=NOW - timedelta(hours=5))
+    rolled = snapshot()
+    for key, series in raw.items():
+        assert rolled[key].timezone == tz
+        assert rolled[key].count.tolist() == series.count.tolist(), key
+        assert rolled[key].sum == pytest.approx(series.sum), key
+    assert raw[("issues_created", "daily")].count.sum() == 72
+
+
+def test_build_time_series_points(db_session):
+    from app.analytics.time_series import build_time_series
+
+    _seed(db_session, "America/New_York")
+    points = build_time_series(db_session, 1, "resolution_hours", days=7, now=NOW,
+                               percentiles=(50,))
+
+    assert points[0]["bucket"] == "2026-03-03T00:00:00"
+    assert len(points) == 8 and {"count", "sum", "avg", "p50"} <= set(points[0])
+    with pytest.raises(ValueError):
+        build_time_series(db_session, 1, "issues_created", percentiles=(50,))
@@ -0,0 +1,115 @@
+"""Test the worker runtime: concurrency, overlap prevention, leadership, shutdown"""
+import asyncio
+import os
+import random
+import threading
+import time
+
+
+async def _serve_for(runtime, seconds: float):
+    stop = asyncio.Event()
+    task = asyncio.create_task(runtime.serve(stop))
+    await asyncio.sleep(seconds)
+    stop.set()
+    await asyncio.wait_for(task, timeout=5)
+
+
+async def test_jobs_run_concurrently_without_overlapping_themselves():
+    """A slow job never overlaps itself, and other jobs keep running meanwhile"""
+    from app.workers.runtime import ASYNC, PROCESS, Job, WorkerRuntime
+
+    active, peak = [0], [0]
+    lock = threading.Lock()
+    fast_runs = []
+
+    def slow():
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.25)
+        with lock:
+            active[0] -= 1
+
+    async def tick():
+        fast_runs.append(time.monotonic())
+
+    runtime = WorkerRuntime([
+        Job("slow", slow, 0.05),
+        Job("tick", tick, 0.02, kind=ASYNC, jitter_seconds=0.005),
+        Job("cpu", os.getpid, 0.1, kind=PROCESS),
+    ], rng=random.Random(1))
+    await _serve_for(runtime, 0.6)
+
+    metrics = runtime.job_metrics()
+    assert peak[0] == 1
+    assert metrics["slow"]["runs"] >= 2 and metrics["slow"]["overruns"] >= 2
+    assert metrics["slow"]["max_duration"] >= 0.25
+    assert len(fast_runs) >= 10
+    assert metrics["cpu"]["runs"] >= 1 and metrics["cpu"]["failures"] == 0
+
+
+async def test_failures_are_counted_and_followers_stand_by(monkeypatch):
+    """Exceptions don't stop the schedule; a replica without the lock skips runs"""
+    from app.workers.runtime import Job, LeaderLock, WorkerRuntime
+
+    calls = []
+
+    def broken():
+        calls.append("broken")
+        raise RuntimeError("boom")
+
+    runtime = WorkerRuntime([
+        Job("broken", broken, 0.02),
+        Job("led", lambda: calls.append("led"), 0.02),
+    ])
+    monkeypatch.setattr(LeaderLock, "acquire", lambda self: self.name != "led")
+    await _serve_for(runtime, 0.2)
+
+    metrics = runtime.job_metrics()
+    assert metrics["broken"]["failures"] >= 2 and "boom" in metrics["broken"]["last_error"]
+    assert "led" not in calls and metrics["led"]["not_leader"] >= 2
+
+
+async def test_shutdown_waits_for_running_jobs_and_runs_hooks():
+    """Stopping lets the in-flight run finish, then runs hooks and stops services"""
+    from app.workers.runtime import Job, WorkerRuntime
+
+    finished, hooks, service_stopped = [], [], []
+
+    def slow():
+        time.sleep(0.3)
+        finished.append(True)
+
+    def service(stop_event):
+        stop_event.wait()
+        service_stopped.append(True)
+
+    runtime = WorkerRuntime([Job("slow", slow, 10), Job("service", service, None)],
+                            on_shutdown=[lambda: hooks.append(bool(finished))])
+    await _serve_for(runtime, 0.05)
+
+    assert finished == [True] and hooks == [True] and service_stopped == [True]
+    assert runtime.job_metrics()["slow"]["runs"] == 1
+
+
+def test_next_due_jitters_and_skips_missed_runs():
+    from app.workers.runtime import next_due
+
+    rng = random.Random(3)
+    dues = [next_due(100.0, 10.0, 1.0, 100.0, rng)[0] for _ in range(100)]
+    assert all(109.0 <= due <= 111.0 for due in dues) and len(set(dues)) > 1
+    assert next_due(100.0, 10.0, 0.0, 135.0, rng) == (135.0, 3)
+
+
+def test_default_jobs():
+    """Worker jobs are scheduled with jitter, scoring in the process pool"""
+    from app.workers.runtime import PROCESS, THREAD
+    from app.workers.scheduler import schedule_tasks
+
+    jobs = {job.name: job for job in schedule_tasks()}
+    assert set(jobs) >= {"deduplicate_reports", "calculate_slas", "compute_scores",
+                         "refresh_dashboard_rollups"}
+    assert jobs["compute_scores"].kind == PROCESS
+    assert jobs["deduplicate_reports"].kind == THREAD
+    assert not jobs["deduplicate_reports"].singleton and jobs["compute_scores"].singleton
+    assert all(job.jitter_seconds > 0 for job in jobs.values() if job.interval_seconds)
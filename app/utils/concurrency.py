@@ -1,7 +1,35 @@
-"""Thread/process helpers"""
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
-from typing import Callable, List, Any
+"""Thread/process helpers
+
+Executors are long-lived and shared: ``executors`` holds named pools that are
+created on first use and shut down once, when the process exits (worker_main,
+the API lifespan), so callers never pay pool start-up per call. ``io`` is a
+thread pool for database and LLM calls; ``cpu`` is a process pool for
+NumPy-heavy work.
+
+``imap`` streams results with at most ``max_in_flight`` tasks outstanding, in
+input order or as they complete. Items can be grouped into chunks so a process
+pool pickles one task per chunk rather than per item. A failure is returned for
+its item as an ``ItemResult`` and doesn't affect the other items.
+"""
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass
+from itertools import islice
+from multiprocessing import resource_tracker
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
 import multiprocessing
+import os
+import threading
+
+from app.config import settings
+
+THREAD, PROCESS = "thread", "process"
 
 
 def create_thread_pool(max_workers: int = None) -> ThreadPoolExecutor:
@@ -11,39 +39,194 @@ def create_thread_pool(max_workers: int = None) -> ThreadPoolExecutor:
     return ThreadPoolExecutor(max_workers=max_workers)
 
 
-def create_process_pool(max_workers: int = None) -> ProcessPoolExecutor:
+def create_process_pool(max_workers: int = None, initializer: Callable = None,
+                        initargs: tuple = ()) -> ProcessPoolExecutor:
     """Create a process pool for CPU-bound tasks"""
     if max_workers is None:
         max_workers = multiprocessing.cpu_count() or 1
-    return ProcessPoolExecutor(max_workers=max_workers)
-
-
-def parallel_map(func: Callable, items: List[Any], use_processes: bool = False, 
-                 max_workers: int = None) -> List[Any]:
-    """Execute function on items in parallel"""
-    if use_processes:
-        executor = create_process_pool(max_workers)
-    else:
-        executor = create_thread_pool(max_workers)
-    
-    results = []
-    with executor:
-        futures = [executor.submit(func, item) for item in items]
-        for future in as_completed(futures):
-            try:
-                results.append(future.result())
-            except Exception as e:
-                print(f"Error in parallel execution: {e}")
-                results.append(None)
-    
-    return results
-
-
-def batch_process(items: List[Any], func: Callable, batch_size: int = 100) -> List[Any]:
-    """Process items in batches"""
-    results = []
-    for i in range(0, len(items), batch_size):
-        batch = items[i:i + batch_size]
-        batch_results = [func(item) for item in batch]
-        results.extend(batch_results)
-    return results
+    # Children must share the parent's resource tracker: one they start
+    # themselves would unlink shared-memory segments they attached to when
+    # they exit (see app.analytics.columnar)
+    resource_tracker.ensure_running()
+    return ProcessPoolExecutor(max_workers=max_workers, initializer=initializer,
+                               initargs=initargs)
+
+
+def reset_inherited_connections():
+    """Process-pool initializer: forked children must not reuse the parent's DB connections"""
+    from app.db.base import engine
+    engine.dispose(close=False)
+
+
+@dataclass
+class _ExecutorSpec:
+    kind: str
+    max_workers: Optional[int]
+    initializer: Optional[Callable]
+
+
+class ExecutorRegistry:
+    """Named executors, created on first use and kept for the life of the process
+
+    A forked child that inherits the registry gets fresh executors: the
+    parent's worker threads and processes don't exist in the child.
+    """
+
+    def __init__(self):
+        self._specs: Dict[str, _ExecutorSpec] = {}
+        self._executors: Dict[str, Executor] = {}
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def register(self, name: str, kind: str = THREAD, max_workers: Optional[int] = None,
+                 initializer: Optional[Callable] = None):
+        if kind not in (THREAD, PROCESS):
+            raise ValueError(f"Unknown executor kind: {kind}")
+        with self._lock:
+            if name in self._executors:
+                raise ValueError(f"Executor {name} is already running")
+            self._specs[name] = _ExecutorSpec(kind, max_workers, initializer)
+
+    def get(self, name: str) -> Executor:
+        with self._lock:
+            if self._pid != os.getpid():
+                self._executors.clear()
+                self._pid = os.getpid()
+            executor = self._executors.get(name)
+            if executor is None:
+                spec = self._specs[name]
+                if spec.kind == PROCESS:
+                    executor = create_process_pool(spec.max_workers, spec.initializer)
+                else:
+                    executor = create_thread_pool(spec.max_workers)
+                self._executors[name] = executor
+            return executor
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False):
+        """Stop every running executor (they are recreated if used again)"""
+        with self._lock:
+            running = list(self._executors.values())
+            self._executors.clear()
+        for executor in running:
+            executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    def running(self) -> List[str]:
+        return list(self._executors)
+
+
+executors = ExecutorRegistry()
+executors.register("io", THREAD, settings.worker_thread_pool_size)
+executors.register("cpu", PROCESS, settings.worker_process_pool_size,
+                   initializer=reset_inherited_connections)
+
+
+@dataclass
+class ItemResult:
+    """Outcome of ``func(item)`` for the item at ``index`` in the input"""
+    index: int
+    value: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def unwrap(self) -> Any:
+        """The value, or the item's exception re-raised"""
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+def _run_chunk(func: Callable, items: list) -> list:
+    """Apply ``func`` to each item, capturing per-item errors (runs in the pool)"""
+    outcomes = []
+    for item in items:
+        try:
+            outcomes.append((func(item), None))
+        except Exception as e:
+            outcomes.append((None, e))
+    return outcomes
+
+
+def _chunk_results(start: int, size: int, future) -> List[ItemResult]:
+    try:
+        outcomes = future.result()
+    except Exception as e:
+        # The chunk itself failed (e.g. unpicklable result or a dead worker)
+        outcomes = [(None, e)] * size
+    return [ItemResult(start + offset, value, error)
+            for offset, (value, error) in enumerate(outcomes)]
+
+
+def _resolve(executor: Union[str, Executor]) -> Executor:
+    return executors.get(executor) if isinstance(executor, str) else executor
+
+
+def imap(func: Callable, items: Iterable[Any], executor: Union[str, Executor] = "io",
+         max_in_flight: Optional[int] = None, ordered: bool = True,
+         chunksize: int = 1) -> Iterator[ItemResult]:
+    """Stream ``func(item)`` results, bounding the work submitted ahead of the consumer
+
+    ``items`` is consumed lazily; at most ``max_in_flight`` chunks (default:
+    twice the pool size) are outstanding. With ``ordered`` results come back in
+    input order, otherwise as they complete. For process pools ``func`` must
+    be picklable (a module-level function). Leaving the loop early cancels the
+    chunks not yet started.
+    """
+    pool = _resolve(executor)
+    if max_in_flight is None:
+        max_in_flight = 2 * getattr(pool, "_max_workers", 1)
+    max_in_flight = max(max_in_flight, 1)
+    source = iter(items)
+    pending: deque = deque()
+    position = 0
+
+    def collect() -> List[ItemResult]:
+        """Wait for the next chunk (ordered) or any finished chunks"""
+        if ordered:
+            return _chunk_results(*pending.popleft())
+        done, _ = wait([entry[2] for entry in pending], return_when=FIRST_COMPLETED)
+        finished = [entry for entry in pending if entry[2] in done]
+        for entry in finished:
+            pending.remove(entry)
+        return [result for entry in finished for result in _chunk_results(*entry)]
+
+    try:
+        while True:
+            chunk = list(islice(source, chunksize))
+            if not chunk:
+                break
+            while len(pending) >= max_in_flight:
+                yield from collect()
+            pending.append((position, len(chunk), pool.submit(_run_chunk, func, chunk)))
+            position += len(chunk)
+        while pending:
+            yield from collect()
+    finally:
+        for _, _, future in pending:
+            future.cancel()
+
+
+def parallel_map(func: Callable, items: List[Any], use_processes: bool = False,
+                 max_workers: int = None) -> List[ItemResult]:
+    """Execute function on items in parallel; one ItemResult per item, in input order
+
+    Runs on the shared ``cpu`` or ``io`` executor; ``max_workers`` bounds how
+    many items are in flight at once.
+    """
+    return list(imap(func, items, "cpu" if use_processes else "io",
+                     max_in_flight=max_workers,
+                     chunksize=_default_chunksize(len(items)) if use_processes else 1))
+
+
+def _default_chunksize(count: int, workers: Optional[int] = None) -> int:
+    """Roughly four chunks per worker, like ``multiprocessing.Pool.map``"""
+    workers = workers or settings.worker_process_pool_size or multiprocessing.cpu_count() or 1
+    return max(1, -(-count // (workers * 4)))
+
+
+def batch_process(items: List[Any], func: Callable, batch_size: int = 100,
+                  executor: Union[str, Executor] = "io") -> List[ItemResult]:
+    """Process items in parallel, ``batch_size`` items per task; results in input order"""
+    return list(imap(func, items, executor, chunksize=batch_size))
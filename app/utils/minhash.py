@@ -0,0 +1,150 @@
+"""MinHash signatures and banded LSH for near-duplicate text
+
+A MinHash signature approximates the Jaccard similarity of two shingle sets
+by the fraction of equal positions. The LSH index splits signatures into
+``bands`` of ``rows`` values and only compares texts that collide in at least
+one band, so a query touches a handful of buckets instead of every document.
+"""
+import hashlib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+
+import numpy as np
+
+from app.utils.text import shingles
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+
+
+def _hash_shingle(shingle: str) -> int:
+    """Stable 32-bit hash (Python's hash() is salted per process)"""
+    digest = hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest()
+    return int.from_bytes(digest, "little")
+
+
+class MinHasher:
+    """Generates fixed-length uint32 MinHash signatures"""
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 3, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        """Signature of a text; empty texts get an all-max signature"""
+        tokens = shingles(text, self.shingle_size)
+        if not tokens:
+            return np.full(self.num_perm, 0xFFFFFFFF, dtype=np.uint32)
+        hashes = np.fromiter((_hash_shingle(t) for t in tokens), dtype=np.uint64,
+                             count=len(tokens))
+        # Universal hashing (a*x + b) mod p, one column per permutation
+        with np.errstate(over="ignore"):
+            permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def signatures(self, texts: Iterable[str]) -> np.ndarray:
+        """Stack signatures for many texts into a 2-D uint32 array"""
+        rows = [self.signature(text) for text in texts]
+        if not rows:
+            return np.zeros((0, self.num_perm), dtype=np.uint32)
+        return np.vstack(rows)
+
+
+def estimate_jaccard(sig1: np.ndarray, sig2: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.mean(sig1 == sig2))
+
+
+class LSHIndex:
+    """Banded LSH index over MinHash signatures keyed by integer id"""
+
+    def __init__(self, num_perm: int = 128, bands: int = 32):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._buckets: List[Dict[bytes, Set[int]]] = [defaultdict(set) for _ in range(bands)]
+        self._signatures: Dict[int, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self._signatures
+
+    def keys(self) -> List[int]:
+        return list(self._signatures)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [
+            signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)
+        ]
+
+    def insert(self, key: int, signature: np.ndarray):
+        """Add (or replace) the signature stored under ``key``"""
+        if key in self._signatures:
+            self.delete(key)
+        signature = np.asarray(signature, dtype=np.uint32)
+        self._signatures[key] = signature
+        for band, band_key in enumerate(self._band_keys(signature)):
+            self._buckets[band][band_key].add(key)
+
+    def delete(self, key: int) -> bool:
+        """Remove ``key``; returns True if it was indexed"""
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return False
+        for band, band_key in enumerate(self._band_keys(signature)):
+            bucket = self._buckets[band].get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band][band_key]
+        return True
+
+    def query(self, signature: np.ndarray) -> Set[int]:
+        """Keys sharing at least one band with ``signature``"""
+        signature = np.asarray(signature, dtype=np.uint32)
+        candidates: Set[int] = set()
+        for band, band_key in enumerate(self._band_keys(signature)):
+            bucket = self._buckets[band].get(band_key)
+            if bucket:
+                candidates |= bucket
+        return candidates
+
+    def query_scored(self, signature: np.ndarray,
+                     min_jaccard: float = 0.0) -> List[Tuple[int, float]]:
+        """Candidates with their estimated Jaccard similarity, best first"""
+        signature = np.asarray(signature, dtype=np.uint32)
+        scored = [
+            (key, estimate_jaccard(signature, self._signatures[key]))
+            for key in self.query(signature)
+        ]
+        return sorted(
+            [(key, score) for key, score in scored if score >= min_jaccard],
+            key=lambda item: item[1], reverse=True,
+        )
+
+    def save(self, path: str):
+        """Persist signatures compactly; buckets are rebuilt on load"""
+        keys = np.fromiter(self._signatures, dtype=np.int64, count=len(self._signatures))
+        signatures = (
+            np.vstack(list(self._signatures.values()))
+            if self._signatures else np.zeros((0, self.num_perm), dtype=np.uint32)
+        )
+        np.savez_compressed(path, keys=keys, signatures=signatures,
+                            params=np.array([self.num_perm, self.bands], dtype=np.int64))
+
+    @classmethod
+    def load(cls, path: str) -> "LSHIndex":
+        """Restore an index written by ``save`` without rehashing any text"""
+        with np.load(path) as data:
+            num_perm, bands = (int(v) for v in data["params"])
+            index = cls(num_perm=num_perm, bands=bands)
+            for key, signature in zip(data["keys"], data["signatures"]):
+                index.insert(int(key), signature)
+        return index
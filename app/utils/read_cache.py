@@ -0,0 +1,332 @@
+"""Tenant-scoped read-through cache for JSON responses
+
+Keys live in a per-tenant namespace that carries a generation number:
+``{namespace}:{tenant}:g{generation}:{key}``. Invalidating a tenant bumps its
+generation, so every key written before is unreachable at once (and ages out
+through the TTL) without scanning or deleting anything. Responses without a
+tenant live under the ``all`` namespace, which every invalidation also bumps.
+
+Misses are coalesced: concurrent requests for the same key wait for the one
+load already in flight instead of each hitting the database. Entries hold the
+serialized body and its ETag so handlers can answer ``If-None-Match`` with 304.
+
+The memory backend is per process, so invalidations from another process (the
+score worker) only reach it through the TTL; a shared backend (Redis) makes
+invalidation immediate everywhere. ``FakeSharedBackend`` stands in for Redis
+in tests.
+"""
+import asyncio
+import hashlib
+import json
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from fastapi import Request, Response
+
+from app.config import settings
+from app.utils.cache import TTLCache
+
+GLOBAL_TENANT = "all"
+_SCAN_BATCH = 500
+
+
+class MemoryBackend:
+    """In-process backend built on TTLCache"""
+
+    shared = False  # other processes' invalidations never reach it
+
+    def __init__(self, max_entries: int = 10000):
+        self.values = TTLCache(max_entries=max_entries)
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict]:
+        return self.values.get(key)
+
+    def set(self, key: str, value: dict, ttl_seconds: float):
+        self.values.set(key, value, ttl_seconds=ttl_seconds)
+
+    def counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def clear(self, prefix: str = ""):
+        """Drop every value and counter whose key starts with ``prefix``"""
+        for key in self.values.keys():
+            if key.startswith(prefix):
+                self.values.delete(key)
+        with self._lock:
+            for key in [key for key in self._counters if key.startswith(prefix)]:
+                del self._counters[key]
+
+
+class RedisBackend:
+    """Shared backend on Redis (requires the optional ``redis`` package)"""
+
+    shared = True
+
+    def __init__(self, url: str, client=None):
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise ImportError("RedisBackend requires the 'redis' package") from e
+            client = redis.Redis.from_url(url)
+        self.client = client
+
+    def get(self, key: str) -> Optional[dict]:
+        raw = self.client.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: dict, ttl_seconds: float):
+        self.client.set(key, json.dumps(value), px=max(int(ttl_seconds * 1000), 1))
+
+    def counter(self, key: str) -> int:
+        raw = self.client.get(key)
+        return int(raw) if raw is not None else 0
+
+    def incr(self, key: str) -> int:
+        return int(self.client.incr(key))
+
+    def clear(self, prefix: str = ""):
+        """Delete the keys starting with ``prefix`` (SCAN + DEL in batches)
+
+        A prefix is required: the database may be shared with other caches.
+        """
+        if not prefix:
+            raise ValueError("RedisBackend.clear needs a key prefix")
+        pattern = re.sub(r"([*?\[\]\\])", r"\\\1", prefix) + "*"
+        batch = []
+        for key in self.client.scan_iter(match=pattern, count=_SCAN_BATCH):
+            batch.append(key)
+            if len(batch) >= _SCAN_BATCH:
+                self.client.delete(*batch)
+                batch = []
+        if batch:
+            self.client.delete(*batch)
+
+
+class FakeSharedBackend:
+    """Dict-backed stand-in for a shared store; share one instance between caches
+
+    Values round-trip through JSON like they would through Redis.
+    """
+
+    shared = True
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._values: Dict[str, tuple] = {}
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.gets = 0
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            self.gets += 1
+            entry = self._values.get(key)
+            if entry is None or entry[0] <= self._clock():
+                self._values.pop(key, None)
+                return None
+            return json.loads(entry[1])
+
+    def set(self, key: str, value: dict, ttl_seconds: float):
+        with self._lock:
+            self._values[key] = (self._clock() + ttl_seconds, json.dumps(value))
+
+    def counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def clear(self, prefix: str = ""):
+        with self._lock:
+            for store in (self._values, self._counters):
+                for key in [key for key in store if key.startswith(prefix)]:
+                    del store[key]
+
+
+def _serialize(value: Any) -> str:
+    return json.dumps(value, default=str, sort_keys=True, separators=(",", ":"))
+
+
+def make_etag(body: str) -> str:
+    return '"' + hashlib.sha256(body.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def cached_response(request: Request, entry: dict) -> Response:
+    """Response for a cached entry: 304 if the client already has its ETag"""
+    headers = {"ETag": entry["etag"], "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), entry["etag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry["body"], media_type="application/json", headers=headers)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header matches ``etag`` (weak comparison)"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in [tag[2:] if tag.startswith("W/") else tag for tag in tags]
+
+
+class TenantReadCache:
+    """Read-through cache with per-tenant generations and miss coalescing"""
+
+    def __init__(self, backend, namespace: str, ttl_seconds: float = 300.0):
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.loads = 0
+        self.errors = 0
+
+    def _generation_key(self, tenant) -> str:
+        return f"{self.namespace}:{tenant}:generation"
+
+    def _key(self, tenant, key: str) -> Optional[str]:
+        try:
+            generation = self.backend.counter(self._generation_key(tenant))
+        except Exception as e:
+            self.errors += 1
+            print(f"Error reading {self.namespace} cache generation: {e}")
+            return None
+        return f"{self.namespace}:{tenant}:g{generation}:{key}"
+
+    async def get_or_load(self, tenant_id: Optional[int], key: str,
+                          loader: Callable[[], Any]) -> dict:
+        """Cached ``{"body", "etag"}`` entry, running the sync ``loader`` at most once per miss
+
+        ``loader`` runs in a worker thread and must return something JSON-serializable.
+        """
+        tenant = GLOBAL_TENANT if tenant_id is None else tenant_id
+        full_key = self._key(tenant, key)
+        if full_key is None:
+            # A shared-backend outage degrades to uncached reads
+            body = _serialize(await asyncio.to_thread(loader))
+            return {"body": body, "etag": make_etag(body)}
+        entry = self._backend_get(full_key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        flight = self._inflight.get(full_key)
+        if flight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(flight)
+
+        self.misses += 1
+        flight = asyncio.get_running_loop().create_future()
+        self._inflight[full_key] = flight
+        try:
+            body = _serialize(await asyncio.to_thread(loader))
+            self.loads += 1
+            entry = {"body": body, "etag": make_etag(body)}
+            self._backend_set(full_key, entry)
+            flight.set_result(entry)
+            return entry
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except Exception as e:
+            flight.set_exception(e)
+            flight.exception()  # mark retrieved when nobody else was waiting
+            raise
+        finally:
+            del self._inflight[full_key]
+
+    def generation(self, tenant_id: Optional[int]) -> Optional[int]:
+        """Current generation of a tenant (or the global namespace); None if unreadable"""
+        tenant = GLOBAL_TENANT if tenant_id is None else tenant_id
+        try:
+            return self.backend.counter(self._generation_key(tenant))
+        except Exception as e:
+            self.errors += 1
+            print(f"Error reading {self.namespace} cache generation: {e}")
+            return None
+
+    def last_write(self, tenant_id: Optional[int]) -> Optional[float]:
+        """Wall-clock time of the tenant's last invalidation within the TTL, if known
+
+        Lets readers on a lagging replica tell whether it already has the write.
+        """
+        tenant = GLOBAL_TENANT if tenant_id is None else tenant_id
+        entry = self._backend_get(f"{self.namespace}:{tenant}:written_at")
+        return entry["at"] if entry else None
+
+    def invalidate(self, tenant_ids: Iterable[int]):
+        """Make every cached entry for these tenants (and the global namespace) unreachable"""
+        written = {"at": time.time()}
+        try:
+            for tenant in [*set(tenant_ids), GLOBAL_TENANT]:
+                self.backend.incr(self._generation_key(tenant))
+                self.backend.set(f"{self.namespace}:{tenant}:written_at", written,
+                                 self.ttl_seconds)
+        except Exception as e:
+            # Entries still expire through the TTL
+            self.errors += 1
+            print(f"Error invalidating {self.namespace} cache: {e}")
+
+    def clear(self):
+        """Drop this cache's entries and generations (other namespaces are untouched)"""
+        self.backend.clear(f"{self.namespace}:")
+
+    def _backend_get(self, key: str) -> Optional[dict]:
+        try:
+            return self.backend.get(key)
+        except Exception as e:
+            self.errors += 1
+            print(f"Error reading {self.namespace} cache: {e}")
+            return None
+
+    def _backend_set(self, key: str, entry: dict):
+        try:
+            self.backend.set(key, entry, self.ttl_seconds)
+        except Exception as e:
+            self.errors += 1
+            print(f"Error writing {self.namespace} cache: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "loads": self.loads,
+            "errors": self.errors,
+        }
+
+
+def create_backend(url: Optional[str], max_entries: int = 10000):
+    """Backend for a cache URL: ``redis://...`` or None/"memory" for in-process"""
+    if not url or url == "memory":
+        return MemoryBackend(max_entries=max_entries)
+    if url.startswith(("redis://", "rediss://")):
+        return RedisBackend(url)
+    raise ValueError(f"Unsupported cache URL: {url}")
+
+
+# Global cache for /scores responses, invalidated when new scores are written
+scores_cache = TenantReadCache(
+    create_backend(settings.scores_cache_url, settings.scores_cache_max_entries),
+    namespace="scores",
+    ttl_seconds=settings.scores_cache_ttl_seconds,
+)
+
+# Global cache for /dashboard responses, expired by TTL only
+dashboard_cache = TenantReadCache(
+    create_backend(settings.scores_cache_url, settings.scores_cache_max_entries),
+    namespace="dashboard",
+    ttl_seconds=settings.dashboard_cache_ttl_seconds,
+)
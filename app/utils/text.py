@@ -1,6 +1,6 @@
 """Text normalization helpers"""
 import re
-from typing import List
+from typing import List, Set
 
 
 def normalize_text(text: str) -> str:
@@ -52,3 +52,11 @@ def calculate_text_similarity(text1: str, text2: str) -> float:
     union = len(words1 | words2)
     
     return intersection / union if union > 0 else 0.0
+
+
+def shingles(text: str, size: int = 3) -> Set[str]:
+    """Word n-gram shingles of normalized, stopword-free text"""
+    words = re.findall(r'\w+', remove_stopwords(normalize_text(text)))
+    if len(words) <= size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
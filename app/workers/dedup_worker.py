@@ -1,15 +1,330 @@
 """Issue grouping logic"""
+import os
+from datetime import datetime, timedelta
+from itertools import groupby, islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-def deduplicate_reports():
-    """Group similar reports into issues"""
-    # TODO: Fetch unprocessed reports
-    # TODO: Use LLM similarity detection
-    # TODO: Group reports by similarity
-    # TODO: Create or update issues
-    pass
+from sqlalchemy.orm import Session
 
+from app.config import settings
+from app.db.base import SessionLocal
+from app.db.models import IssueModel, ReportModel
+from app.db.repositories import ReportRepository
+from app.llm.classify_report import classify_reports_batch
+from app.llm.embeddings import embed_texts
+from app.llm.similarity import find_similar_report
+from app.llm.vector_index import IssueVectorIndex
+from app.utils.minhash import LSHIndex, MinHasher
 
-def find_similar_issues(report_data: dict) -> list:
-    """Find existing issues similar to a report"""
-    # TODO: Implement similarity matching
-    return []
+# Open-issue vectors and MinHash signatures per tenant, loaded on first use and
+# then kept current by on_issue_created / on_issue_resolved rather than rebuilt
+# every run. Issues opened by other replicas are picked up by
+# refresh_tenant_index before each batch.
+issue_index = IssueVectorIndex(ann_threshold=settings.vector_index_ann_threshold)
+minhasher = MinHasher(num_perm=settings.minhash_num_perm)
+lsh_indexes: Dict[int, LSHIndex] = {}
+index_synced_at: Dict[int, datetime] = {}
+
+
+def deduplicate_reports(batch_size: int = None) -> int:
+    """Group similar reports into issues; returns the number of reports linked
+
+    Each batch is claimed with ``FOR UPDATE SKIP LOCKED`` so any number of
+    worker replicas can run this concurrently on disjoint rows. A batch is
+    split by tenant and streamed through normalize -> candidate lookup ->
+    match/create, and every link is written back in one bulk UPDATE in the
+    same transaction that holds the claim.
+    """
+    batch_size = batch_size or settings.dedup_batch_size
+    total = 0
+    while True:
+        db = SessionLocal()
+        try:
+            reports = ReportRepository.claim_unprocessed(db, batch_size)
+            if not reports:
+                break
+            links = list(process_batch(db, reports))
+            ReportRepository.bulk_link(db, links)
+            db.commit()
+            total += len(links)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        if len(reports) < batch_size:
+            break
+    return total
+
+
+def process_batch(db: Session, reports: List[ReportModel]) -> Iterator[Tuple[int, int]]:
+    """Yield (report_id, issue_id) links for a claimed batch, one tenant at a time"""
+    by_tenant = sorted(reports, key=lambda report: (report.tenant_id, report.id))
+    for tenant_id, tenant_reports in groupby(by_tenant, key=lambda report: report.tenant_id):
+        if not ensure_tenant_index(db, tenant_id):
+            refresh_tenant_index(db, tenant_id)
+        items = _normalize_stage(tenant_reports)
+        items = _candidate_stage(db, items)
+        yield from _match_or_create_stage(db, items)
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _normalize_stage(reports: Iterable[ReportModel]) -> Iterator[dict]:
+    for report in reports:
+        yield {
+            "report_id": report.id,
+            "tenant_id": report.tenant_id,
+            "description": report.description,
+            "location": report.location,
+            "signature": minhasher.signature(report.description),
+        }
+
+
+def _candidate_stage(db: Session, items: Iterable[dict]) -> Iterator[dict]:
+    for chunk in _chunks(items, settings.llm_batch_max_size):
+        # One embedding request per chunk; cached vectors are reused
+        vectors = embed_texts([item["description"] for item in chunk])
+        for item, vector in zip(chunk, vectors):
+            item["embedding"] = vector
+            item["candidates"] = find_similar_issues(item, db)
+            yield item
+
+
+def _match_or_create_stage(db: Session, items: Iterable[dict]) -> Iterator[Tuple[int, int]]:
+    created_ids = set()
+    for chunk in _chunks(items, settings.llm_batch_max_size):
+        decisions = [(item, match_report(item, item["candidates"])) for item in chunk]
+        unmatched = [item for item, decision in decisions if not decision["match"]]
+        classifications = classify_reports_batch([
+            {"id": item["report_id"], "description": item["description"],
+             "location": item["location"]}
+            for item in unmatched
+        ])
+
+        for item, decision in decisions:
+            if not decision["match"] and created_ids:
+                # A report earlier in this batch may have opened the same issue
+                recent = [c for c in find_similar_issues(item, db) if c["id"] in created_ids]
+                decision = match_report(item, recent)
+            if decision["match"]:
+                yield item["report_id"], decision["issue_id"]
+                continue
+
+            issue = _create_issue(db, item, classifications[item["report_id"]])
+            created_ids.add(issue.id)
+            yield item["report_id"], issue.id
+
+
+def _create_issue(db: Session, item: dict, classification: dict) -> IssueModel:
+    """Open an issue for a report (flushed, committed with the batch)"""
+    issue = IssueModel(
+        tenant_id=item["tenant_id"],
+        category=classification["category"],
+        severity=classification["severity"],
+        summary=classification.get("summary") or item["description"][:200],
+    )
+    db.add(issue)
+    db.flush()
+    on_issue_created(issue.tenant_id, issue.id, issue.summary)
+    return issue
+
+
+def _issue_text(issue: IssueModel) -> str:
+    """Text embedded for an issue"""
+    return issue.summary or f"{issue.category} issue ({issue.severity})"
+
+
+def _lsh_path(tenant_id: int) -> Optional[str]:
+    if not settings.lsh_index_dir:
+        return None
+    return os.path.join(settings.lsh_index_dir, f"tenant_{tenant_id}.npz")
+
+
+def _load_lsh_index(tenant_id: int, issues: List[IssueModel]) -> LSHIndex:
+    """Warm-start from the persisted signatures, hashing only what changed"""
+    path = _lsh_path(tenant_id)
+    index = None
+    if path and os.path.exists(path):
+        try:
+            index = LSHIndex.load(path)
+        except Exception as e:
+            print(f"Error loading LSH index for tenant {tenant_id}: {e}")
+    if index is None:
+        index = LSHIndex(num_perm=settings.minhash_num_perm, bands=settings.lsh_bands)
+
+    open_ids = {issue.id for issue in issues}
+    for key in index.keys():
+        if key not in open_ids:
+            index.delete(key)
+    for issue in issues:
+        if issue.id not in index:
+            index.insert(issue.id, minhasher.signature(_issue_text(issue)))
+
+    if path:
+        os.makedirs(settings.lsh_index_dir, exist_ok=True)
+        index.save(path)
+    return index
+
+
+def save_lsh_indexes():
+    """Persist every loaded tenant's signatures (call on worker shutdown)"""
+    for tenant_id, index in list(lsh_indexes.items()):
+        path = _lsh_path(tenant_id)
+        if path:
+            os.makedirs(settings.lsh_index_dir, exist_ok=True)
+            index.save(path)
+
+
+def ensure_tenant_index(db: Session, tenant_id: int) -> bool:
+    """Index a tenant's open issues once, the first time the tenant is seen
+
+    Returns True if the tenant was loaded by this call.
+    """
+    if issue_index.has_tenant(tenant_id):
+        return False
+    synced_at = datetime.utcnow()
+    issues = db.query(IssueModel).filter(
+        IssueModel.tenant_id == tenant_id,
+        IssueModel.status == "open"
+    ).all()
+    lsh_indexes[tenant_id] = _load_lsh_index(tenant_id, issues)
+    vectors = embed_texts([_issue_text(issue) for issue in issues])
+    issue_index.load_tenant(tenant_id, [issue.id for issue in issues], vectors)
+    index_synced_at[tenant_id] = synced_at
+    return True
+
+
+def refresh_tenant_index(db: Session, tenant_id: int) -> int:
+    """Index open issues other replicas created since the tenant was last synced
+
+    Rescans ``dedup_index_sync_overlap_seconds`` before the last sync so issues
+    from transactions that commit late are not missed; issues already indexed
+    are skipped. Returns the number of issues added.
+    """
+    synced_at = datetime.utcnow()
+    since = index_synced_at.get(tenant_id, synced_at) - timedelta(
+        seconds=settings.dedup_index_sync_overlap_seconds)
+    lsh = lsh_indexes[tenant_id]
+    issues = [
+        issue for issue in db.query(IssueModel).filter(
+            IssueModel.tenant_id == tenant_id,
+            IssueModel.status == "open",
+            IssueModel.created_at >= since,
+        )
+        if issue.id not in lsh
+    ]
+    if issues:
+        texts = [_issue_text(issue) for issue in issues]
+        for issue, text, vector in zip(issues, texts, embed_texts(texts)):
+            issue_index.add(tenant_id, issue.id, vector)
+            lsh.insert(issue.id, minhasher.signature(text))
+    index_synced_at[tenant_id] = synced_at
+    return len(issues)
+
+
+def on_issue_created(tenant_id: int, issue_id: int, summary: str):
+    """Add a newly created issue to its tenant's indexes"""
+    if issue_index.has_tenant(tenant_id):
+        issue_index.add(tenant_id, issue_id, embed_texts([summary])[0])
+    if tenant_id in lsh_indexes:
+        lsh_indexes[tenant_id].insert(issue_id, minhasher.signature(summary))
+
+
+def on_issue_resolved(tenant_id: int, issue_id: int):
+    """Drop a resolved issue from its tenant's indexes"""
+    issue_index.remove(tenant_id, issue_id)
+    if tenant_id in lsh_indexes:
+        lsh_indexes[tenant_id].delete(issue_id)
+
+
+def find_similar_issues(report_data: dict, db: Optional[Session] = None) -> list:
+    """Find existing issues similar to a report
+
+    Near-verbatim duplicates are found first through the tenant's LSH index
+    (no embedding call needed). Otherwise returns up to ``dedup_top_k`` open
+    issues scoring at least ``dedup_candidate_threshold`` in the vector index.
+    Candidates are dicts with ``id``, ``description``, ``score`` and
+    ``near_duplicate``, best first.
+    """
+    owns_session = db is None
+    db = db or SessionLocal()
+    try:
+        tenant_id = report_data["tenant_id"]
+        ensure_tenant_index(db, tenant_id)
+
+        signature = report_data.get("signature")
+        if signature is None:
+            signature = minhasher.signature(report_data["description"])
+        hits = lsh_indexes[tenant_id].query_scored(
+            signature, settings.dedup_near_duplicate_jaccard
+        )[:settings.dedup_top_k]
+        near_duplicate = bool(hits)
+
+        if not hits:
+            vector = report_data.get("embedding")
+            if vector is None:
+                vector = embed_texts([report_data["description"]])[0]
+            hits = [
+                (issue_id, score)
+                for issue_id, score in issue_index.query(tenant_id, vector, settings.dedup_top_k)
+                if score >= settings.dedup_candidate_threshold
+            ]
+        if not hits:
+            return []
+
+        # The API may have resolved issues since they were indexed; check and prune
+        issues = {
+            issue.id: issue
+            for issue in db.query(IssueModel).filter(
+                IssueModel.id.in_([issue_id for issue_id, _ in hits])
+            )
+        }
+        candidates = []
+        for issue_id, score in hits:
+            issue = issues.get(issue_id)
+            if issue is None or issue.status != "open":
+                on_issue_resolved(tenant_id, issue_id)
+                continue
+            candidates.append({"id": issue_id, "description": _issue_text(issue),
+                               "score": score, "near_duplicate": near_duplicate})
+        return candidates
+    finally:
+        if owns_session:
+            db.close()
+
+
+def match_report(report_data: dict, candidates: List[dict]) -> dict:
+    """Decide whether a report belongs to one of its candidate issues
+
+    Clear-cut scores are decided locally; only the ambiguous band between
+    ``dedup_candidate_threshold`` and ``dedup_match_threshold`` goes to the LLM.
+    """
+    if not candidates:
+        return {"match": False, "issue_id": None, "confidence": 0.0, "source": "vector"}
+
+    best = candidates[0]
+    if best.get("near_duplicate"):
+        return {"match": True, "issue_id": best["id"], "confidence": best["score"],
+                "source": "minhash"}
+    if best["score"] >= settings.dedup_match_threshold:
+        return {"match": True, "issue_id": best["id"], "confidence": best["score"],
+                "source": "vector"}
+
+    result = find_similar_report(report_data["description"], candidates)
+    try:
+        issue_id = int(result.get("issue_id"))
+    except (TypeError, ValueError):
+        issue_id = None
+    if not result.get("match") or issue_id not in {c["id"] for c in candidates}:
+        return {"match": False, "issue_id": None, "confidence": result.get("confidence", 0.0),
+                "source": "llm"}
+    return {"match": True, "issue_id": issue_id, "confidence": result.get("confidence", 0.0),
+            "source": "llm"}
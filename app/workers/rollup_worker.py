@@ -0,0 +1,18 @@
+"""Dashboard rollup maintenance"""
+from datetime import datetime
+from typing import Optional
+
+from app.db.base import SessionLocal
+from app.db.rollups import refresh_rollups
+
+
+def refresh_dashboard_rollups() -> Optional[datetime]:
+    """Roll up the hours completed since the last run; returns the new watermark"""
+    db = SessionLocal()
+    try:
+        return refresh_rollups(db)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
@@ -0,0 +1,311 @@
+"""Worker runtime: recurring jobs on bounded pools
+
+An asyncio loop owns the schedule; job bodies run on the shared ``io`` thread
+pool (LLM calls, database), the shared ``cpu`` process pool (scoring) from
+``app.utils.concurrency.executors``, or the loop itself (coroutines). Each job
+has its own timer, so jobs run concurrently, while a job never overlaps
+itself: its next run starts only after the current one finished, and runs that
+fell behind are skipped and counted as overruns rather than queued.
+
+Intervals are jittered so replicas started together drift apart. Singleton
+jobs take a Postgres advisory lock (one per job) and keep it while the replica
+lives, so exactly one replica runs each job and the others stand by; when the
+leader's connection drops, the next replica to try takes over. On SIGTERM or
+SIGINT no new runs start, in-flight runs get ``shutdown_timeout`` to finish,
+and the shutdown hooks run.
+"""
+import asyncio
+import random
+import signal
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.utils.concurrency import executors
+
+THREAD, PROCESS, ASYNC = "thread", "process", "async"
+SERVICE_RETRY_SECONDS = 10.0
+
+
+@dataclass
+class Job:
+    """A recurring job
+
+    ``func`` takes no arguments and runs in the thread pool (``thread``), the
+    process pool (``process``; must be a picklable module-level function) or on
+    the event loop (``async``; a coroutine function). With
+    ``interval_seconds=None`` the job is a long-running service instead:
+    ``func(stop_event)`` runs in its own thread until ``stop_event`` is set.
+    """
+    name: str
+    func: Callable
+    interval_seconds: Optional[float]
+    kind: str = THREAD
+    jitter_seconds: float = 0.0
+    singleton: bool = True  # one replica at a time (Postgres advisory lock)
+
+
+@dataclass
+class JobMetrics:
+    runs: int = 0
+    failures: int = 0
+    not_leader: int = 0
+    overruns: int = 0  # runs skipped because the previous one ran past them
+    running: bool = False
+    last_started: Optional[float] = None  # wall clock
+    last_duration: float = 0.0
+    max_duration: float = 0.0
+    total_duration: float = 0.0
+    last_lag: float = 0.0  # start time minus scheduled time
+    max_lag: float = 0.0
+    last_error: Optional[str] = None
+
+    def as_dict(self) -> dict:
+        completed = self.runs + self.failures
+        return {
+            **self.__dict__,
+            "mean_duration": self.total_duration / completed if completed else 0.0,
+        }
+
+
+class LeaderLock:
+    """Session-level ``pg_try_advisory_lock`` held on a dedicated connection
+
+    Leadership is sticky: the winner keeps the lock until it releases it or its
+    connection drops, so replicas on different timers never run a job twice in
+    one interval. Without Postgres every caller is the leader.
+    """
+
+    def __init__(self, engine: Optional[Engine], name: str):
+        self.engine = engine
+        self.name = name
+        self.key = zlib.crc32(f"job:{name}".encode("utf-8"))
+        self._conn = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.engine is not None and self.engine.dialect.name == "postgresql"
+
+    def acquire(self) -> bool:
+        """True if this process holds the lock (acquiring it if free)"""
+        if not self.enabled:
+            return True
+        if self._conn is not None:
+            try:
+                self._conn.exec_driver_sql("SELECT 1")
+                return True
+            except Exception as e:
+                print(f"Lost leader lock for {self.name}: {e}")
+                self._close()
+        conn = self.engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+        try:
+            acquired = conn.execute(text("SELECT pg_try_advisory_lock(:key)"),
+                                    {"key": self.key}).scalar()
+        except Exception:
+            conn.close()
+            raise
+        if acquired:
+            self._conn = conn
+        else:
+            conn.close()
+        return bool(acquired)
+
+    def release(self):
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.key})
+        except Exception as e:
+            print(f"Error releasing leader lock for {self.name}: {e}")
+        finally:
+            self._close()
+
+    def _close(self):
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+        self._conn = None
+
+
+def next_due(due: float, interval: float, jitter: float, now: float,
+             rng: random.Random) -> tuple:
+    """(next scheduled time, runs skipped) after a run that was scheduled at ``due``"""
+    following = due + interval + (rng.uniform(-jitter, jitter) if jitter else 0.0)
+    if following >= now:
+        return following, 0
+    skipped = int((now - following) // interval) + 1
+    return now, skipped
+
+
+class WorkerRuntime:
+    """Runs ``jobs`` until stopped; see the module docstring"""
+
+    def __init__(self, jobs: Iterable[Job], engine: Optional[Engine] = None,
+                 io_executor: str = "io", cpu_executor: str = "cpu",
+                 shutdown_timeout: float = 60.0, on_shutdown: Iterable[Callable] = (),
+                 metrics_interval: Optional[float] = None, rng: Optional[random.Random] = None):
+        self.jobs: List[Job] = list(jobs)
+        names = [job.name for job in self.jobs]
+        if len(names) != len(set(names)):
+            raise ValueError("Job names must be unique")
+        self.io_executor = io_executor
+        self.cpu_executor = cpu_executor
+        self.shutdown_timeout = shutdown_timeout
+        self.on_shutdown = list(on_shutdown)
+        self.metrics_interval = metrics_interval
+        self.rng = rng or random.Random()
+        self.locks = {job.name: LeaderLock(engine, job.name) for job in self.jobs}
+        self.metrics: Dict[str, JobMetrics] = {job.name: JobMetrics() for job in self.jobs}
+        self._threads = None
+        self._processes = None
+        self._stop_thread = threading.Event()
+
+    def job_metrics(self) -> Dict[str, dict]:
+        return {name: metrics.as_dict() for name, metrics in self.metrics.items()}
+
+    def run(self):
+        """Serve until SIGINT/SIGTERM (blocking)"""
+        async def main():
+            stop = asyncio.Event()
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(sig, stop.set)
+            await self.serve(stop)
+
+        asyncio.run(main())
+
+    async def serve(self, stop: asyncio.Event):
+        """Run every job until ``stop`` is set, then shut down gracefully"""
+        self._threads = executors.get(self.io_executor)
+        if any(job.kind == PROCESS for job in self.jobs):
+            self._processes = executors.get(self.cpu_executor)
+        self._stop_thread.clear()
+        tasks = [asyncio.create_task(self._job_loop(job, stop), name=f"job:{job.name}")
+                 for job in self.jobs]
+        reporter = (asyncio.create_task(self._report_metrics(stop))
+                    if self.metrics_interval else None)
+        try:
+            await stop.wait()
+        finally:
+            self._stop_thread.set()
+            if tasks:
+                _, pending = await asyncio.wait(tasks, timeout=self.shutdown_timeout)
+                for task in pending:
+                    print(f"Abandoning {task.get_name()} after {self.shutdown_timeout}s")
+                    task.cancel()
+            if reporter:
+                reporter.cancel()
+            await self._shutdown()
+
+    async def _shutdown(self):
+        loop = asyncio.get_running_loop()
+        for hook in self.on_shutdown:
+            try:
+                await loop.run_in_executor(self._threads, hook)
+            except Exception as e:
+                print(f"Error in shutdown hook {getattr(hook, '__name__', hook)}: {e}")
+        for lock in self.locks.values():
+            await loop.run_in_executor(self._threads, lock.release)
+
+    async def _is_leader(self, job: Job) -> bool:
+        if not job.singleton:
+            return True
+        loop = asyncio.get_running_loop()
+        try:
+            leader = await loop.run_in_executor(self._threads, self.locks[job.name].acquire)
+        except Exception as e:
+            print(f"Error acquiring leader lock for {job.name}: {e}")
+            leader = False
+        if not leader:
+            self.metrics[job.name].not_leader += 1
+        return leader
+
+    async def _job_loop(self, job: Job, stop: asyncio.Event):
+        if job.interval_seconds is None:
+            return await self._service_loop(job, stop)
+        loop = asyncio.get_running_loop()
+        metrics = self.metrics[job.name]
+        due = loop.time() + self.rng.uniform(0, job.jitter_seconds)
+        while not await _stopped_within(stop, due - loop.time()):
+            lag = max(loop.time() - due, 0.0)
+            metrics.last_lag = lag
+            metrics.max_lag = max(metrics.max_lag, lag)
+            if await self._is_leader(job):
+                await self._run_once(job)
+            due, skipped = next_due(due, job.interval_seconds, job.jitter_seconds,
+                                    loop.time(), self.rng)
+            metrics.overruns += skipped
+
+    async def _run_once(self, job: Job):
+        loop = asyncio.get_running_loop()
+        metrics = self.metrics[job.name]
+        metrics.running = True
+        metrics.last_started = time.time()
+        started = time.perf_counter()
+        try:
+            if job.kind == ASYNC:
+                await job.func()
+            elif job.kind == PROCESS:
+                await loop.run_in_executor(self._processes, job.func)
+            else:
+                await loop.run_in_executor(self._threads, job.func)
+            metrics.runs += 1
+            metrics.last_error = None
+        except Exception as e:
+            metrics.failures += 1
+            metrics.last_error = repr(e)
+            print(f"Error in job {job.name}: {e}")
+        finally:
+            duration = time.perf_counter() - started
+            metrics.running = False
+            metrics.last_duration = duration
+            metrics.max_duration = max(metrics.max_duration, duration)
+            metrics.total_duration += duration
+
+    async def _service_loop(self, job: Job, stop: asyncio.Event):
+        """Keep a long-running job alive on whichever replica leads it"""
+        while not stop.is_set():
+            if await self._is_leader(job):
+                metrics = self.metrics[job.name]
+                metrics.running = True
+                metrics.last_started = time.time()
+                try:
+                    # Own thread: a service must not pin a pool worker for its lifetime
+                    await asyncio.to_thread(job.func, self._stop_thread)
+                    if not stop.is_set():
+                        raise RuntimeError("service returned before shutdown")
+                    metrics.runs += 1
+                except Exception as e:
+                    metrics.failures += 1
+                    metrics.last_error = repr(e)
+                    print(f"Error in service {job.name}: {e}")
+                finally:
+                    metrics.running = False
+            await _stopped_within(stop, SERVICE_RETRY_SECONDS)
+
+    async def _report_metrics(self, stop: asyncio.Event):
+        while not await _stopped_within(stop, self.metrics_interval):
+            for name, m in self.metrics.items():
+                completed = m.runs + m.failures
+                mean = m.total_duration / completed if completed else 0.0
+                print(f"job {name}: runs={m.runs} failures={m.failures} "
+                      f"not_leader={m.not_leader} overruns={m.overruns} "
+                      f"duration last={m.last_duration:.2f}s mean={mean:.2f}s "
+                      f"max={m.max_duration:.2f}s lag last={m.last_lag:.2f}s "
+                      f"max={m.max_lag:.2f}s")
+
+
+async def _stopped_within(stop: asyncio.Event, seconds: float) -> bool:
+    """Wait up to ``seconds`` for ``stop``; True if it is set"""
+    if seconds > 0:
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+    return stop.is_set()
@@ -1,25 +1,57 @@
 """Batch task coordinator"""
-import schedule
-import time
+from typing import List
 
+from app.config import settings
+from app.db.base import engine
+from app.workers.runtime import PROCESS, THREAD, Job, WorkerRuntime
 
-def schedule_tasks():
-    """Schedule recurring background tasks"""
-    # TODO: Schedule deduplication every 5 minutes
-    # TODO: Schedule SLA calculations every 15 minutes
-    # TODO: Schedule score computations hourly
-    
-    # schedule.every(5).minutes.do(deduplicate_reports)
-    # schedule.every(15).minutes.do(calculate_slas)
-    # schedule.every().hour.do(compute_scores)
-    
-    pass
+
+def _job(name: str, func, interval_seconds: float, kind: str = THREAD,
+         singleton: bool = True) -> Job:
+    return Job(name, func, interval_seconds, kind=kind,
+               jitter_seconds=interval_seconds * settings.worker_jitter_ratio,
+               singleton=singleton)
+
+
+def schedule_tasks() -> List[Job]:
+    """Recurring background tasks
+
+    Deduplication and SLA runs are dominated by LLM and database I/O and run on
+    the thread pool; score computation is NumPy-bound and runs in the process
+    pool. Imports are deferred so a replica only loads what it schedules.
+    Deduplication claims disjoint batches, so it runs on every replica; the
+    other jobs run on one leader at a time.
+    """
+    from app.workers.dedup_worker import deduplicate_reports
+    from app.workers.rollup_worker import refresh_dashboard_rollups
+    from app.workers.score_worker import compute_scores
+    from app.workers.sla_worker import calculate_slas, run_breach_scheduler
+
+    jobs = [
+        _job("deduplicate_reports", deduplicate_reports, settings.dedup_interval_seconds,
+             singleton=False),
+        _job("calculate_slas", calculate_slas, settings.sla_interval_seconds),
+        _job("compute_scores", compute_scores, settings.score_interval_seconds, kind=PROCESS),
+        _job("refresh_dashboard_rollups", refresh_dashboard_rollups,
+             settings.rollup_interval_seconds),
+    ]
+    if settings.sla_breach_scheduler_enabled:
+        jobs.append(Job("sla_breach_scheduler", run_breach_scheduler, None))
+    return jobs
+
+
+def create_runtime() -> WorkerRuntime:
+    from app.workers.dedup_worker import save_lsh_indexes
+
+    return WorkerRuntime(
+        schedule_tasks(),
+        engine=engine,
+        shutdown_timeout=settings.worker_shutdown_timeout_seconds,
+        on_shutdown=[save_lsh_indexes],
+        metrics_interval=settings.worker_metrics_log_seconds,
+    )
 
 
 def run_scheduler():
-    """Run the scheduler loop"""
-    schedule_tasks()
-    
-    while True:
-        schedule.run_pending()
-        time.sleep(60)
+    """Run every job until SIGINT/SIGTERM"""
+    create_runtime().run()
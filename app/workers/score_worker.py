@@ -1,22 +1,97 @@
 """Performance aggregation"""
+from datetime import datetime, timedelta
+from typing import List, Optional
 
-def compute_scores():
-    """Compute performance scores for tenants and areas"""
-    # TODO: Calculate issue resolution metrics
-    # TODO: Compute SLA compliance rates
-    # TODO: Generate performance scores
-    # TODO: Store computed scores
-    pass
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
 
+from app.analytics.performance import calculate_performance_score
+from app.analytics.rankings import leaderboards
+from app.analytics.score_engine import compute_all_scores
+from app.config import settings
+from app.db.base import SessionLocal
+from app.db.models import AreaModel, IssueModel, PerformanceScoreModel, SLAMetricModel
+from app.db.routing import ReadSessionLocal
 
-def calculate_tenant_score(tenant_id: int) -> float:
-    """Calculate overall score for a tenant"""
-    # TODO: Implement scoring algorithm
-    # Consider: resolution time, SLA compliance, issue volume
-    return 0.0
 
+def store_scores(db: Session, rows: List[dict]) -> int:
+    """Insert performance_scores rows in one statement and invalidate cached /scores
 
-def calculate_area_score(area_id: int) -> float:
-    """Calculate score for a specific area"""
-    # TODO: Implement area-level scoring
-    return 0.0
+    Each row has ``tenant_id``, ``area_id`` (None for tenant-level), ``score``,
+    ``metric_type`` and ``calculated_at``. Commits before invalidating so a
+    reader that misses right after invalidation sees the new rows. Loaded
+    leaderboards take the rows incrementally instead of reloading.
+    """
+    if not rows:
+        return 0
+    db.execute(PerformanceScoreModel.__table__.insert(), rows)
+    db.commit()
+    leaderboards.apply(rows)
+    return len(rows)
+
+
+def compute_scores(now: Optional[datetime] = None) -> int:
+    """Compute performance scores for every tenant and area; returns rows written
+
+    One columnar snapshot and one bulk insert per run (see
+    app/analytics/score_engine.py) rather than queries per tenant or area. The
+    snapshot may come from a replica; the rows are written to the primary.
+    """
+    with ReadSessionLocal() as read_db:
+        rows = compute_all_scores(read_db, days=settings.score_window_days, now=now)
+    db = SessionLocal()
+    try:
+        return store_scores(db, rows)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _overall_score(db: Session, since: datetime, *filters) -> float:
+    """One entity's overall score from its SLA results (one query)"""
+    total, met, resolution_count, resolution_sum = db.execute(
+        select(
+            func.count(SLAMetricModel.id),
+            func.sum(case((SLAMetricModel.met_sla == True, 1), else_=0)),  # noqa: E712
+            func.count(SLAMetricModel.resolution_time_hours),
+            func.sum(SLAMetricModel.resolution_time_hours),
+        )
+        .join(IssueModel, SLAMetricModel.issue_id == IssueModel.id)
+        .where(SLAMetricModel.calculated_at >= since, *filters)
+    ).one()
+    if not total:
+        return 0.0
+    mean_resolution = float(resolution_sum) / resolution_count if resolution_count else 0.0
+    return calculate_performance_score(float(met) / total, mean_resolution)
+
+
+def calculate_tenant_score(tenant_id: int, db: Optional[Session] = None,
+                           now: Optional[datetime] = None) -> float:
+    """Calculate overall score for a tenant (single-entity path)"""
+    since = (now or datetime.utcnow()) - timedelta(days=settings.score_window_days)
+    owns_session = db is None
+    db = db or SessionLocal()
+    try:
+        return _overall_score(db, since, IssueModel.tenant_id == tenant_id)
+    finally:
+        if owns_session:
+            db.close()
+
+
+def calculate_area_score(area_id: int, db: Optional[Session] = None,
+                         now: Optional[datetime] = None) -> float:
+    """Calculate score for a specific area (single-entity path)"""
+    since = (now or datetime.utcnow()) - timedelta(days=settings.score_window_days)
+    owns_session = db is None
+    db = db or SessionLocal()
+    try:
+        area = db.get(AreaModel, area_id)
+        if area is None:
+            return 0.0
+        return _overall_score(db, since, IssueModel.tenant_id == area.tenant_id,
+                              IssueModel.area_id == area_id)
+    finally:
+        if owns_session:
+            db.close()
@@ -0,0 +1,272 @@
+"""In-memory SLA deadline scheduler
+
+Every open issue has one pending timer: its near-breach warning
+(``warn_before`` ahead of the deadline), then its breach. Timers live in a
+min-heap of plain int64-sized ints, ``seconds since 2020 << 32 | issue_id << 1 |
+stage`` (issue ids are Postgres ``SERIAL``, so 31 bits), and a dict maps
+each issue to its current timer. Rescheduling or cancelling only updates the
+dict; the stale heap entry is skipped when it surfaces, and the heap is rebuilt
+once stale entries outnumber live ones. At 1M open issues that is roughly
+100 MB, and ``max_issues`` caps it. Issues beyond the cap are kept in
+``dropped_ids`` and left to the polling check in ``sla_worker``, restricted to
+those ids.
+
+The scheduler follows the database through ``issues.updated_at``: ``load``
+reads every open issue once, and ``sync`` applies the rows changed since the
+previous call (opened, re-categorized, resolved). ``snapshot`` / ``restore``
+persist the timers, so a restarted worker only syncs the changes made while it
+was down. Events are delivered at least once: an issue whose warning time has
+already passed when it is first scheduled is warned immediately.
+"""
+import calendar
+import heapq
+import json
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.models import IssueModel
+from app.domain.sla import SLAPolicy
+
+WARNING, BREACH = 0, 1
+_ID_MASK = (1 << 31) - 1
+_TIME_BASE = 1_577_836_800  # 2020-01-01, keeps keys within int64 for snapshots
+SNAPSHOT_VERSION = 2
+_EPOCH = datetime(1970, 1, 1)
+
+_ISSUE_COLUMNS = (
+    IssueModel.id,
+    IssueModel.tenant_id,
+    IssueModel.category,
+    IssueModel.severity,
+    IssueModel.status,
+    IssueModel.created_at,
+    IssueModel.updated_at,
+)
+
+
+def to_seconds(value: datetime) -> int:
+    """Naive UTC datetime -> epoch seconds, rounded up"""
+    return calendar.timegm(value.timetuple()) + (1 if value.microsecond else 0)
+
+
+def from_seconds(value: int) -> datetime:
+    return _EPOCH + timedelta(seconds=value)
+
+
+def _encode(when: int, issue_id: int, stage: int) -> int:
+    return ((when - _TIME_BASE) << 32) | (issue_id << 1) | stage
+
+
+def _decode(key: int):
+    return (key >> 32) + _TIME_BASE, (key >> 1) & _ID_MASK, key & 1
+
+
+@dataclass
+class SLAEvent:
+    """A near-breach warning or breach for one issue"""
+    issue_id: int
+    kind: str  # "near_breach" or "breach"
+    deadline: datetime
+
+
+class SLADeadlineScheduler:
+    """Min-heap of per-issue SLA timers with lazy cancellation"""
+
+    def __init__(self, policy: SLAPolicy, warn_before: timedelta = timedelta(hours=1),
+                 max_issues: int = 1_000_000, sync_overlap: timedelta = timedelta(seconds=30)):
+        self.policy = policy
+        self.warn_before = int(warn_before.total_seconds())
+        self.max_issues = max_issues
+        self.sync_overlap = sync_overlap
+        # issue -> pending heap key, or -deadline once its breach has fired
+        self._keys: Dict[int, int] = {}
+        self._heap: List[int] = []
+        self.synced_until: Optional[datetime] = None
+        self.dropped_ids: Set[int] = set()  # open issues over max_issues
+        self.fired = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def dropped(self) -> int:
+        return len(self.dropped_ids)
+
+    def _push(self, issue_id: int, key: int):
+        self._keys[issue_id] = key
+        heapq.heappush(self._heap, key)
+
+    def schedule(self, issue_id: int, deadline: datetime, now: Optional[int] = None) -> bool:
+        """Set an issue's deadline; False if the scheduler is full"""
+        deadline_s = to_seconds(deadline)
+        current = self._keys.get(issue_id)
+        if current is None:
+            if len(self._keys) >= self.max_issues:
+                self.dropped_ids.add(issue_id)
+                return False
+            self.dropped_ids.discard(issue_id)
+            warned = False
+        elif current < 0:
+            # Already breached: only a later deadline re-arms it
+            if deadline_s <= -current:
+                return True
+            warned = False
+        else:
+            when, _, stage = _decode(current)
+            if (when if stage == BREACH else when + self.warn_before) == deadline_s:
+                return True
+            warned = stage == BREACH
+
+        warn_at = deadline_s - self.warn_before
+        now = int(time.time()) if now is None else now
+        if self.warn_before and not (warned and warn_at <= now):
+            self._push(issue_id, _encode(warn_at, issue_id, WARNING))
+        else:
+            self._push(issue_id, _encode(deadline_s, issue_id, BREACH))
+        self._maybe_compact()
+        return True
+
+    def track(self, issue_id: int, tenant_id: Optional[int], category: Optional[str],
+              severity: Optional[str], created_at: datetime, now: Optional[int] = None) -> bool:
+        """Schedule an open issue from its attributes"""
+        deadline = created_at + self.policy.threshold(tenant_id, category, severity)
+        return self.schedule(issue_id, deadline, now)
+
+    def cancel(self, issue_id: int):
+        """Stop tracking an issue (resolved or deleted)"""
+        self.dropped_ids.discard(issue_id)
+        if self._keys.pop(issue_id, None) is not None:
+            self._maybe_compact()
+
+    def _maybe_compact(self):
+        if len(self._heap) > 2 * len(self._keys) + 1024:
+            self._heap = [key for key in self._keys.values() if key >= 0]
+            heapq.heapify(self._heap)
+
+    def _pop_stale(self):
+        heap = self._heap
+        while heap and self._keys.get((heap[0] >> 1) & _ID_MASK) != heap[0]:
+            heapq.heappop(heap)
+
+    def next_due(self) -> Optional[int]:
+        """Epoch second of the next pending event"""
+        self._pop_stale()
+        return _decode(self._heap[0])[0] if self._heap else None
+
+    def poll(self, now: Optional[int] = None) -> List[SLAEvent]:
+        """Pop every event due at ``now`` (epoch seconds), in time order"""
+        now = int(time.time()) if now is None else now
+        events = []
+        while True:
+            self._pop_stale()
+            if not self._heap or _decode(self._heap[0])[0] > now:
+                break
+            when, issue_id, stage = _decode(heapq.heappop(self._heap))
+            if stage == WARNING:
+                deadline = when + self.warn_before
+                self._push(issue_id, _encode(deadline, issue_id, BREACH))
+                events.append(SLAEvent(issue_id, "near_breach", from_seconds(deadline)))
+            else:
+                self._keys[issue_id] = -when
+                events.append(SLAEvent(issue_id, "breach", from_seconds(when)))
+        self.fired += len(events)
+        return events
+
+    def _apply(self, row, now: int):
+        if row.status == "open":
+            self.track(row.id, row.tenant_id, row.category, row.severity, row.created_at, now)
+        else:
+            self.cancel(row.id)
+
+    def load(self, db: Session, batch_size: int = 10000) -> int:
+        """Replace all timers with the open issues in the database"""
+        started = datetime.utcnow()
+        now = to_seconds(started)
+        self._keys.clear()
+        self._heap = []
+        self.dropped_ids.clear()
+        query = select(*_ISSUE_COLUMNS).where(IssueModel.status == "open")
+        for row in db.execute(query.execution_options(yield_per=batch_size)):
+            self._apply(row, now)
+        self.synced_until = started
+        return len(self._keys)
+
+    def sync(self, db: Session) -> int:
+        """Apply issues changed since the last load/sync; returns the rows read"""
+        if self.synced_until is None:
+            return self.load(db)
+        started = datetime.utcnow()
+        now = to_seconds(started)
+        rows = db.execute(
+            select(*_ISSUE_COLUMNS)
+            .where(IssueModel.updated_at >= self.synced_until - self.sync_overlap)
+            .order_by(IssueModel.updated_at, IssueModel.id)
+        ).all()
+        for row in rows:
+            self._apply(row, now)
+        self.synced_until = started
+        return len(rows)
+
+    def snapshot(self, path: str):
+        """Write the timers to ``path`` (atomically replaced)"""
+        meta = {
+            "version": SNAPSHOT_VERSION,
+            "policy": self.policy.fingerprint,
+            "warn_before": self.warn_before,
+            "synced_until": self.synced_until.isoformat() if self.synced_until else None,
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                meta=np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8),
+                issue_ids=np.fromiter(self._keys.keys(), dtype=np.int64, count=len(self._keys)),
+                keys=np.fromiter(self._keys.values(), dtype=np.int64, count=len(self._keys)),
+                dropped_ids=np.fromiter(self.dropped_ids, dtype=np.int64,
+                                        count=len(self.dropped_ids)),
+            )
+        os.replace(tmp_path, path)
+
+    def restore(self, path: str) -> bool:
+        """Load timers from a snapshot; False (and nothing loaded) if it is missing or stale
+
+        A snapshot is stale when the policy or warning lead time changed, since
+        the stored deadlines were computed with the old values.
+        """
+        if not os.path.exists(path):
+            return False
+        try:
+            with np.load(path) as data:
+                meta = json.loads(data["meta"].tobytes().decode("utf-8"))
+                issue_ids, keys = data["issue_ids"], data["keys"]
+                dropped_ids = data["dropped_ids"] if "dropped_ids" in data.files else None
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error reading SLA scheduler snapshot {path}: {e}")
+            return False
+        if (meta.get("version") != SNAPSHOT_VERSION
+                or meta.get("policy") != self.policy.fingerprint
+                or meta.get("warn_before") != self.warn_before
+                or meta.get("synced_until") is None):
+            return False
+        self._keys = dict(zip(issue_ids.tolist(), keys.tolist()))
+        self._heap = keys[keys >= 0].tolist()
+        heapq.heapify(self._heap)
+        self.dropped_ids = set(dropped_ids.tolist())
+        self.synced_until = datetime.fromisoformat(meta["synced_until"])
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "tracked": len(self._keys),
+            "heap_entries": len(self._heap),
+            "dropped": self.dropped,
+            "fired": self.fired,
+            "next_due": self.next_due(),
+        }
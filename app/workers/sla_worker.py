@@ -1,20 +1,262 @@
-"""SLA timers + calculations"""
+"""SLA timers + calculations
+
+SLA results are maintained incrementally. Each run reads only the issues whose
+``updated_at`` moved past the ``sla_metrics`` watermark (re-reading a short
+overlap for transactions that committed late), evaluates the resolved ones and
+upserts one ``sla_metrics`` row per issue; reopened issues lose theirs.
+Re-evaluating an unchanged issue writes nothing, so overlaps and retries are
+harmless.
+
+Breach alerts are the proactive side: an open issue breaches at
+``created_at + threshold``, so for each threshold the issues whose deadline
+enters the alert horizon since the previous check are one ``created_at`` range
+on the open-issue index. Each issue is reported once rather than every open
+issue being rescanned on every tick.
+
+``run_breach_scheduler`` replaces that polling with the in-memory deadline
+scheduler (``sla_scheduler``) when a worker keeps running, firing events
+within about a second of the deadline. ``calculate_slas`` then skips the
+polling check, and the scheduler polls only for the issues it could not hold
+(``dropped_ids``), so each alert fires once. Thresholds come from
+``sla_policy`` (``SLA_THRESHOLD_RULES``).
+"""
+import threading
+import time
 from datetime import datetime, timedelta
+from typing import Callable, Collection, List, Optional, Tuple
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.base import SessionLocal
+from app.db.models import IssueModel
+from app.db.repositories import SLAMetricRepository
+from app.db.rollups import get_watermark, set_watermark
+from app.domain.sla import SLA, SLAPolicy
+from app.workers.sla_scheduler import SLADeadlineScheduler, SLAEvent
+
+SLA_WATERMARK = "sla_metrics"
+ALERT_WATERMARK = "sla_breach_alerts"
+
+sla_policy = SLAPolicy.from_dicts(settings.sla_threshold_rules,
+                                  settings.sla_default_threshold_hours)
+
+_ISSUE_COLUMNS = (
+    IssueModel.id,
+    IssueModel.tenant_id,
+    IssueModel.category,
+    IssueModel.severity,
+    IssueModel.created_at,
+    IssueModel.resolved_at,
+    IssueModel.updated_at,
+)
+
+
+def get_sla_threshold(category: str, severity: str, tenant_id: Optional[int] = None) -> timedelta:
+    """Get SLA threshold for given category and severity (and tenant)"""
+    return sla_policy.threshold(tenant_id, category, severity)
+
+
+def evaluate_issues(rows, calculated_at: datetime) -> Tuple[List[dict], List[int]]:
+    """SLA results for the resolved issues in ``rows``, and the ids of unresolved ones"""
+    results, unresolved = [], []
+    for row in rows:
+        if row.resolved_at is None:
+            unresolved.append(row.id)
+            continue
+        threshold = get_sla_threshold(row.category, row.severity, row.tenant_id)
+        hours = SLA.calculate_resolution_time(row.created_at, row.resolved_at)
+        results.append({
+            "issue_id": row.id,
+            "resolution_time_hours": round(hours, 4),
+            "met_sla": SLA.check_sla_compliance(hours, threshold.total_seconds() / 3600),
+            "calculated_at": calculated_at,
+        })
+    return results, unresolved
+
+
+def process_changed_issues(db: Session, now: Optional[datetime] = None,
+                           batch_size: Optional[int] = None) -> dict:
+    """Bring ``sla_metrics`` up to date with issues changed since the watermark
+
+    Works through the changes in (updated_at, id) order, committing the results
+    and the advanced watermark after each batch.
+    """
+    now = now or datetime.utcnow()
+    batch_size = batch_size or settings.sla_batch_size
+    watermark = get_watermark(db, for_update=True, name=SLA_WATERMARK)
+    stats = {"processed": 0, "upserted": 0, "cleared": 0}
+
+    query = select(*_ISSUE_COLUMNS).where(IssueModel.updated_at <= now)
+    if watermark is not None:
+        overlap = timedelta(seconds=settings.sla_watermark_overlap_seconds)
+        query = query.where(IssueModel.updated_at >= watermark - overlap)
+    query = query.order_by(IssueModel.updated_at, IssueModel.id).limit(batch_size)
+
+    after = None
+    while True:
+        page = query
+        if after is not None:
+            page = page.where(tuple_(IssueModel.updated_at, IssueModel.id) > tuple_(*after))
+        rows = db.execute(page).all()
+        if not rows:
+            break
+        results, unresolved = evaluate_issues(rows, now)
+        SLAMetricRepository.upsert_many(db, results)
+        SLAMetricRepository.delete_for_issues(db, unresolved)
+        after = (rows[-1].updated_at, rows[-1].id)
+        if watermark is None or after[0] > watermark:
+            watermark = after[0]
+            set_watermark(db, watermark, name=SLA_WATERMARK)
+        db.commit()
+        stats["processed"] += len(rows)
+        stats["upserted"] += len(results)
+        stats["cleared"] += len(unresolved)
+        if len(rows) < batch_size:
+            break
+
+    if watermark is None:
+        set_watermark(db, now, name=SLA_WATERMARK)
+    db.commit()
+    return stats
+
+
+def find_breach_candidates(db: Session, now: Optional[datetime] = None,
+                           horizon: Optional[timedelta] = None,
+                           issue_ids: Optional[Collection[int]] = None) -> List[dict]:
+    """Open issues whose deadline entered the alert horizon since the last check
+
+    The first check covers deadlines in (now, now + horizon]; later checks
+    continue from where the previous one stopped, so deadlines that passed
+    while the worker was down are still reported (``breached``). ``issue_ids``
+    restricts the check to those issues.
+    """
+    now = now or datetime.utcnow()
+    if horizon is None:
+        horizon = timedelta(minutes=settings.sla_breach_horizon_minutes)
+    window_start = get_watermark(db, for_update=True, name=ALERT_WATERMARK) or now
+    window_end = now + horizon
+    if window_start >= window_end:
+        db.commit()
+        return []
+
+    candidates = []
+    for threshold in sorted(sla_policy.thresholds()):
+        query = (
+            select(IssueModel.id, IssueModel.tenant_id, IssueModel.area_id,
+                   IssueModel.category, IssueModel.severity, IssueModel.created_at)
+            .where(
+                IssueModel.status == "open",
+                IssueModel.created_at > window_start - threshold,
+                IssueModel.created_at <= window_end - threshold,
+            )
+        )
+        if issue_ids is not None:
+            query = query.where(IssueModel.id.in_(list(issue_ids)))
+        rows = db.execute(query)
+        for row in rows:
+            if get_sla_threshold(row.category, row.severity, row.tenant_id) != threshold:
+                continue
+            deadline = row.created_at + threshold
+            candidates.append({
+                "issue_id": row.id,
+                "tenant_id": row.tenant_id,
+                "area_id": row.area_id,
+                "category": row.category,
+                "severity": row.severity,
+                "deadline": deadline,
+                "breached": deadline <= now,
+            })
+    set_watermark(db, window_end, name=ALERT_WATERMARK)
+    db.commit()
+    candidates.sort(key=lambda c: (c["deadline"], c["issue_id"]))
+    return candidates
 
 
 def calculate_slas():
-    """Calculate SLA metrics for issues"""
-    # TODO: Fetch open and recently closed issues
-    # TODO: Calculate resolution times
-    # TODO: Determine if SLA was met
-    # TODO: Store SLA metrics
-    pass
-
-
-def get_sla_threshold(category: str, severity: str) -> timedelta:
-    """Get SLA threshold for given category and severity"""
-    # TODO: Implement configurable SLA rules
-    # Default: 24 hours for critical, 72 hours for normal
-    if severity == "critical":
-        return timedelta(hours=24)
-    return timedelta(hours=72)
+    """Calculate SLA metrics for issues
+
+    Breach alerts come from ``run_breach_scheduler`` instead when it is enabled.
+    """
+    db = SessionLocal()
+    try:
+        stats = process_changed_issues(db)
+        alerts = [] if settings.sla_breach_scheduler_enabled else find_breach_candidates(db)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    for alert in alerts:
+        state = "breached" if alert["breached"] else "at risk"
+        print(f"SLA {state}: issue {alert['issue_id']} (tenant {alert['tenant_id']}, "
+              f"{alert['severity']}) due {alert['deadline']:%Y-%m-%d %H:%M}")
+    return {**stats, "alerts": len(alerts)}
+
+
+def _print_event(event: SLAEvent):
+    state = "breached" if event.kind == "breach" else "at risk"
+    print(f"SLA {state}: issue {event.issue_id} due {event.deadline:%Y-%m-%d %H:%M:%S}")
+
+
+def create_breach_scheduler() -> SLADeadlineScheduler:
+    return SLADeadlineScheduler(
+        sla_policy,
+        warn_before=timedelta(minutes=settings.sla_breach_horizon_minutes),
+        max_issues=settings.sla_scheduler_max_issues,
+    )
+
+
+def poll_dropped(db: Session, scheduler: SLADeadlineScheduler) -> List[SLAEvent]:
+    """Polling check for the open issues the scheduler had no room for"""
+    return [
+        SLAEvent(alert["issue_id"], "breach" if alert["breached"] else "near_breach",
+                 alert["deadline"])
+        for alert in find_breach_candidates(db, issue_ids=scheduler.dropped_ids)
+    ]
+
+
+def run_breach_scheduler(stop: threading.Event,
+                         on_event: Callable[[SLAEvent], None] = _print_event,
+                         scheduler: Optional[SLADeadlineScheduler] = None):
+    """Fire SLA events as deadlines pass until ``stop`` is set
+
+    Starts from the snapshot when one is configured and still valid, otherwise
+    loads every open issue. Database changes are picked up every
+    ``sla_scheduler_sync_seconds``, and the loop never sleeps past the next
+    event, so events fire within about a second of their time. Issues beyond
+    ``sla_scheduler_max_issues`` are checked by polling at each sync.
+    """
+    scheduler = scheduler or create_breach_scheduler()
+    snapshot_path = settings.sla_scheduler_snapshot_path
+    db = SessionLocal()
+    try:
+        if not (snapshot_path and scheduler.restore(snapshot_path)):
+            scheduler.load(db)
+        next_snapshot = time.monotonic() + settings.sla_scheduler_snapshot_seconds
+        next_sync = 0.0
+        while not stop.is_set():
+            if time.monotonic() >= next_sync:
+                try:
+                    scheduler.sync(db)
+                    if scheduler.dropped_ids:
+                        for event in poll_dropped(db, scheduler):
+                            on_event(event)
+                finally:
+                    db.rollback()  # end the read transaction
+                next_sync = time.monotonic() + settings.sla_scheduler_sync_seconds
+            for event in scheduler.poll():
+                on_event(event)
+            if snapshot_path and time.monotonic() >= next_snapshot:
+                scheduler.snapshot(snapshot_path)
+                next_snapshot = time.monotonic() + settings.sla_scheduler_snapshot_seconds
+            due = scheduler.next_due()
+            wait = next_sync - time.monotonic()
+            if due is not None:
+                wait = min(wait, due - time.time())
+            stop.wait(min(max(wait, 0.05), 1.0))
+        if snapshot_path:
+            scheduler.snapshot(snapshot_path)
+    finally:
+        db.close()
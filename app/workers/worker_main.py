@@ -1,24 +1,18 @@
 """Worker entrypoint"""
-import time
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
-
-# TODO: Import worker modules
-# from app.workers.dedup_worker import deduplicate_reports
-# from app.workers.sla_worker import calculate_slas
-# from app.workers.score_worker import compute_scores
+from app.utils.concurrency import executors
+from app.workers.scheduler import create_runtime
 
 
 def main():
-    """Main worker loop"""
-    print("Starting background workers...")
-    
-    # TODO: Set up thread pool for I/O-bound tasks
-    # TODO: Set up process pool for CPU-bound tasks
-    # TODO: Implement worker coordination
-    
-    while True:
-        print("Workers running...")
-        time.sleep(60)
+    """Run the background jobs until SIGINT/SIGTERM"""
+    runtime = create_runtime()
+    print("Starting background workers: "
+          + ", ".join(job.name for job in runtime.jobs))
+    try:
+        runtime.run()
+    finally:
+        executors.shutdown(wait=False, cancel_futures=True)
+    print("Workers stopped")
 
 
 if __name__ == "__main__":
@@ -135,6 +135,18 @@ resource "aws_security_group" "rds" {
   }
 }
 
+# gp3 is SSD storage: price random reads close to sequential ones so the planner
+# uses the per-tenant indexes (app/tests/test_migrations.py plans with this cost)
+resource "aws_db_parameter_group" "main" {
+  name   = "civicpulse-postgres15"
+  family = "postgres15"
+  
+  parameter {
+    name  = "random_page_cost"
+    value = "1.1"
+  }
+}
+
 resource "aws_db_instance" "main" {
   identifier             = "civicpulse-db"
   engine                 = "postgres"
@@ -149,6 +161,7 @@ resource "aws_db_instance" "main" {
   password = var.db_password
   
   db_subnet_group_name   = aws_db_subnet_group.main.name
+  parameter_group_name   = aws_db_parameter_group.main.name
   vpc_security_group_ids = [aws_security_group.rds.id]
   
   backup_retention_period = 7
@@ -0,0 +1,45 @@
+"""Rebuild dashboard rollups for a historical range in bounded chunks
+
+    python scripts/backfill_rollups.py                       # all history
+    python scripts/backfill_rollups.py --start 2024-01-01 --end 2024-02-01
+    python scripts/backfill_rollups.py --chunk-hours 6       # smaller transactions
+
+Each chunk is recomputed from the raw tables and committed on its own, so the
+backfill can be interrupted and rerun. The watermark only advances over chunks
+that extend the already-covered range.
+"""
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings  # noqa: E402
+from app.db.base import SessionLocal  # noqa: E402
+from app.db.rollups import earliest_event, floor_hour, rebuild_rollups  # noqa: E402
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill issue rollups")
+    parser.add_argument("--start", type=datetime.fromisoformat, default=None,
+                        help="ISO start (default: earliest issue/SLA event)")
+    parser.add_argument("--end", type=datetime.fromisoformat, default=None,
+                        help="ISO end, exclusive (default: last whole hour)")
+    parser.add_argument("--chunk-hours", type=int, default=settings.rollup_chunk_hours)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        start = args.start or earliest_event(db)
+        end = args.end or floor_hour(
+            datetime.utcnow() - timedelta(minutes=settings.rollup_grace_minutes)
+        )
+        if start is None or start >= end:
+            print("Nothing to backfill")
+        else:
+            print(f"Rebuilding rollups for {start} .. {end} in {args.chunk_hours}h chunks")
+            chunks = rebuild_rollups(db, start, end, chunk_hours=args.chunk_hours)
+            print(f"Done: {chunks} chunks")
+    finally:
+        db.close()
@@ -0,0 +1,91 @@
+"""Benchmark report ingestion throughput at different batch sizes
+
+Batch size 1 uses ReportRepository.create (one transaction per report, the
+old per-request path); larger sizes use ReportRepository.bulk_create.
+
+    python scripts/bench_bulk_insert.py --url postgresql://.../civicpulse_bench
+    python scripts/bench_bulk_insert.py              # in-memory SQLite
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("OPENAI_API_KEY", "unused")
+
+from sqlalchemy import create_engine, delete  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.db.base import Base  # noqa: E402
+from app.db.models import ReportModel, TenantModel  # noqa: E402
+from app.db.repositories import ReportRepository  # noqa: E402
+
+
+def make_rows(count: int, tenant_id: int) -> list:
+    return [
+        {
+            "tenant_id": tenant_id,
+            "description": f"Benchmark report {i}: streetlight out near block {i % 97}",
+            "location": f"{i % 500} Main St",
+        }
+        for i in range(count)
+    ]
+
+
+def run(session_factory, batch_size: int, total: int, tenant_id: int) -> float:
+    """Insert ``total`` rows in batches of ``batch_size``; returns rows/sec"""
+    rows = make_rows(total, tenant_id)
+    db = session_factory()
+    try:
+        start = time.perf_counter()
+        if batch_size == 1:
+            for row in rows:
+                ReportRepository.create(db, **row)
+        else:
+            for i in range(0, total, batch_size):
+                ReportRepository.bulk_create(db, rows[i:i + batch_size])
+        elapsed = time.perf_counter() - start
+        db.execute(delete(ReportModel).where(ReportModel.tenant_id == tenant_id))
+        db.commit()
+    finally:
+        db.close()
+    return total / elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report ingestion benchmark")
+    parser.add_argument("--url", default=None, help="Database URL (default: in-memory SQLite)")
+    parser.add_argument("--rows", type=int, default=20000, help="Rows per bulk run")
+    parser.add_argument("--single-rows", type=int, default=2000,
+                        help="Rows for the batch-size-1 run (slow)")
+    parser.add_argument("--batch-sizes", default="1,100,5000")
+    args = parser.parse_args()
+
+    if args.url:
+        engine = create_engine(args.url)
+    else:
+        engine = create_engine("sqlite://", poolclass=StaticPool,
+                               connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+
+    db = session_factory()
+    tenant = TenantModel(name="bulk-insert-benchmark", type="city")
+    db.add(tenant)
+    db.commit()
+    tenant_id = tenant.id
+    db.close()
+
+    print(f"{'batch size':>10}  {'rows':>8}  {'rows/sec':>12}")
+    for batch_size in (int(size) for size in args.batch_sizes.split(",")):
+        total = args.single_rows if batch_size == 1 else args.rows
+        rate = run(session_factory, batch_size, total, tenant_id)
+        print(f"{batch_size:>10}  {total:>8}  {rate:>12,.0f}")
+
+    db = session_factory()
+    db.execute(delete(TenantModel).where(TenantModel.id == tenant_id))
+    db.commit()
+    db.close()
@@ -0,0 +1,109 @@
+"""Benchmark handing issue data to the process pool: pickled rows vs shared memory
+
+Builds a synthetic snapshot of ``--issues`` issues (no database) and computes
+per-tenant SLA summaries and area rankings in the ``cpu`` pool, once sending
+each task its tenant's rows and once sending only a shared-memory handle.
+
+    python scripts/bench_columnar_handoff.py                  # 2M issues
+    python scripts/bench_columnar_handoff.py --issues 500000 --tenants 8
+"""
+import argparse
+import os
+import pickle
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("OPENAI_API_KEY", "unused")
+
+from app.analytics.columnar import (  # noqa: E402
+    COLUMN_DTYPES,
+    IssueColumns,
+    SharedIssueColumns,
+    map_shared,
+)
+from app.analytics.performance import sla_summary  # noqa: E402
+from app.analytics.rankings import area_rankings  # noqa: E402
+from app.utils.concurrency import executors, imap  # noqa: E402
+
+
+def synthetic_columns(issues: int, tenants: int, seed: int = 7) -> IssueColumns:
+    rng = np.random.default_rng(seed)
+    created = (np.datetime64("2025-01-01", "s")
+               + rng.integers(0, 365 * 86400, issues).astype("timedelta64[s]"))
+    hours = rng.gamma(2.0, 20.0, issues)
+    resolved = rng.random(issues) < 0.8
+    return IssueColumns(
+        issue_id=np.arange(1, issues + 1, dtype=np.int64),
+        tenant_id=rng.integers(1, tenants + 1, issues).astype(np.int64),
+        area_id=rng.integers(1, 200, issues).astype(np.int64),
+        category=rng.integers(0, 5, issues).astype(np.int16),
+        severity=rng.integers(0, 4, issues).astype(np.int16),
+        created_at=created,
+        resolved_at=np.where(resolved, created + (hours * 3600).astype("timedelta64[s]"),
+                             np.datetime64("NaT")),
+        resolution_hours=np.where(resolved, hours, np.nan),
+        met_sla=np.where(resolved, (hours <= 72).astype(np.int8), -1).astype(np.int8),
+        categories=("road", "lighting", "water", "waste", "noise"),
+        severities=("low", "normal", "high", "critical"),
+    )
+
+
+def tenant_rows(columns: IssueColumns, tenant_id: int) -> list:
+    """The tenant's issues as row tuples, the way ORM results reach a pool"""
+    mask = columns.tenant_id == tenant_id
+    return list(zip(*(getattr(columns, name)[mask].tolist() for name in COLUMN_DTYPES)))
+
+
+def summarize_rows(task) -> tuple:
+    tenant_id, rows = task
+    values = list(zip(*rows))
+    columns = IssueColumns(**{name: np.array(column, dtype=dtype) for (name, dtype), column
+                              in zip(COLUMN_DTYPES.items(), values)})
+    return sla_summary(columns, tenant_id), area_rankings(columns, tenant_id)
+
+
+def summarize_shared(columns: IssueColumns, tenant_id: int) -> tuple:
+    return sla_summary(columns, tenant_id), area_rankings(columns, tenant_id)
+
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<32} {time.perf_counter() - start:8.2f}s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--issues", type=int, default=2_000_000)
+    parser.add_argument("--tenants", type=int, default=16)
+    args = parser.parse_args()
+
+    columns = synthetic_columns(args.issues, args.tenants)
+    tenant_ids = list(range(1, args.tenants + 1))
+    print(f"{'snapshot':<32} {columns.nbytes / 1e6:8.1f} MB")
+    executors.get("cpu").submit(int).result()  # start the pool outside the timings
+
+    tasks = timed("build row lists", lambda: [(t, tenant_rows(columns, t)) for t in tenant_ids])
+    print(f"{'pickled per task (rows)':<32} {len(pickle.dumps(tasks[0])) / 1e6:8.1f} MB")
+    by_rows = timed("pool, pickled rows",
+                    lambda: [r.unwrap() for r in imap(summarize_rows, tasks, "cpu")])
+
+    with SharedIssueColumns(columns) as shared:
+        timed("copy into shared memory", lambda: SharedIssueColumns(columns).close())
+        print(f"{'pickled per task (shared)':<32} "
+              f"{len(pickle.dumps((shared.handle, 1))) / 1e3:8.1f} KB")
+        by_handle = timed("pool, shared memory", lambda: [
+            r.unwrap() for r in map_shared(summarize_shared, shared, [(t,) for t in tenant_ids])
+        ])
+
+    assert [s for s, _ in by_rows] == [s for s, _ in by_handle]
+    executors.shutdown()
+
+
+if __name__ == "__main__":
+    main()
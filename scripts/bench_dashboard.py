@@ -0,0 +1,103 @@
+"""Benchmark the single-query dashboard against the separate per-figure queries
+
+Seeds ``--issues`` issues (three in four with an SLA result) over ``--tenants``
+tenants in a SQLite file (or ``--database-url``), then times one tenant's
+dashboard both ways: ``get_issue_counts_by_category``,
+``get_sla_compliance_rate``, ``get_average_resolution_time`` and
+``get_open_issues_count`` one after another, against ``get_dashboard_counts``
+(which also returns the by-severity counts and the trend). Rollups are not
+built, so both read the raw tables.
+
+    python scripts/bench_dashboard.py                   # 200k issues
+    python scripts/bench_dashboard.py --issues 1000000 --database-url postgresql://...
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("OPENAI_API_KEY", "unused")
+
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.db import queries  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.models import IssueModel, SLAMetricModel  # noqa: E402
+
+CATEGORIES = ["pothole", "streetlight", "graffiti", "water leak", "noise", "trash"]
+SEVERITIES = ["low", "medium", "high", "critical"]
+
+
+def seed(db, issues: int, tenants: int, rng: random.Random):
+    now = datetime.utcnow()
+    rows = [{"tenant_id": rng.randint(1, tenants), "category": rng.choice(CATEGORIES),
+             "severity": rng.choice(SEVERITIES),
+             "status": "open" if rng.random() < 0.25 else "resolved",
+             "created_at": now - timedelta(hours=rng.uniform(0, 24 * 90))}
+            for _ in range(issues)]
+    db.execute(IssueModel.__table__.insert(), rows)
+    db.execute(SLAMetricModel.__table__.insert(), [
+        {"issue_id": issue_id, "met_sla": rng.random() < 0.8,
+         "resolution_time_hours": round(rng.uniform(1, 96), 2),
+         "calculated_at": now - timedelta(hours=rng.uniform(0, 24 * 60))}
+        for issue_id, row in enumerate(rows, start=1) if row["status"] == "resolved"
+    ])
+    db.commit()
+
+
+def separate(db, tenant_id):
+    return (queries.get_issue_counts_by_category(db, tenant_id),
+            queries.get_sla_compliance_rate(db, tenant_id),
+            queries.get_average_resolution_time(db, tenant_id),
+            queries.get_open_issues_count(db, tenant_id))
+
+
+def timed(label: str, fn, repeat: int, statements: list):
+    statements.clear()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<28} {elapsed * 1000:8.1f} ms  {len(statements) // repeat} statements")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--issues", type=int, default=200_000)
+    parser.add_argument("--tenants", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+
+    url = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/bench_dashboard.db"
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    start = time.perf_counter()
+    seed(db, args.issues, args.tenants, random.Random(5))
+    print(f"seeded {args.issues:,} issues in {time.perf_counter() - start:.1f}s")
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *a: statements.append(a[2]))
+    counts = queries.get_dashboard_counts(db, 1)
+    by_category, compliance, _, open_issues = separate(db, 1)
+    assert {k: v["issues"] for k, v in counts["by_category"].items()} == by_category
+    assert counts["totals"]["open"] == open_issues
+    assert abs(counts["totals"]["sla_met"] / counts["totals"]["sla_checked"] - compliance) < 1e-9
+
+    timed("separate queries", lambda: separate(db, 1), args.repeat, statements)
+    timed("get_dashboard_counts", lambda: queries.get_dashboard_counts(db, 1), args.repeat,
+          statements)
+    db.close()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Benchmark domain model representations for bulk analytics
+
+Materializes ``--count`` issues and reports as the mutable dataclasses, the
+slotted frozen records and the struct-of-arrays batches, and reports bytes per
+issue/report (tracemalloc, excluding the shared field values), construction
+time, and ``is_open`` / resolution time / letter grade loops against the
+vectorized versions.
+
+    python scripts/bench_domain_models.py                  # 1M issues
+    python scripts/bench_domain_models.py --count 200000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.domain.batch import IssueBatch, ReportBatch  # noqa: E402
+from app.domain.issue import Issue, IssueRecord  # noqa: E402
+from app.domain.rating import letter_grade, letter_grades  # noqa: E402
+from app.domain.report import Report, ReportRecord  # noqa: E402
+from app.domain.sla import SLA  # noqa: E402
+
+CATEGORIES = ["road", "lighting", "water", "waste", "noise"]
+SEVERITIES = ["low", "normal", "high", "critical"]
+
+
+def issue_fields(count: int, rng: random.Random) -> list:
+    start = datetime(2025, 1, 1)
+    rows = []
+    for i in range(1, count + 1):
+        created = start + timedelta(seconds=rng.randrange(0, 365 * 86400))
+        resolved = created + timedelta(minutes=rng.randrange(10, 10000)) if i % 4 else None
+        rows.append(dict(id=i, tenant_id=1 + i % 50, area_id=(i % 300) or None,
+                         category=rng.choice(CATEGORIES), severity=rng.choice(SEVERITIES),
+                         status="resolved" if resolved else "open",
+                         created_at=created, resolved_at=resolved))
+    return rows
+
+
+def report_fields(count: int) -> list:
+    start = datetime(2025, 1, 1)
+    descriptions = [f"Pothole on street {n}" for n in range(1000)]
+    return [dict(id=i, issue_id=i // 3 or None, tenant_id=1 + i % 50,
+                 description=descriptions[i % 1000], location=None,
+                 submitted_at=start + timedelta(seconds=i), processed=i % 3 != 0)
+            for i in range(1, count + 1)]
+
+
+def measure(build):
+    """(result, seconds, bytes allocated by build) -- timing and tracing run separately"""
+    start = time.perf_counter()
+    result = build()
+    seconds = time.perf_counter() - start
+    del result
+    tracemalloc.start()
+    result = build()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, allocated
+
+
+def timed(fn) -> tuple:
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def report(label: str, count: int, seconds: float, allocated: int):
+    print(f"{label:<28} {seconds:7.2f}s {allocated / count:8.0f} B/item "
+          f"{allocated / 1e6:8.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    args = parser.parse_args()
+    n = args.count
+
+    issues = issue_fields(n, random.Random(7))
+    print(f"{'issues':<28} {'build':>8} {'memory':>15}")
+    dataclasses, s, b = measure(lambda: [Issue(**f) for f in issues])
+    report("Issue (dataclass)", n, s, b)
+    records, s, b = measure(lambda: [IssueRecord(**f) for f in issues])
+    report("IssueRecord (slots, frozen)", n, s, b)
+    batch, s, b = measure(lambda: IssueBatch.from_records(records))
+    report("IssueBatch (arrays)", n, s, b)
+
+    print(f"\n{'operation':<28} {'loop':>8} {'vectorized':>11}")
+    for label, loop, vectorized in (
+        ("is_open", lambda: sum(i.is_open() for i in dataclasses),
+         lambda: int(batch.is_open().sum())),
+        ("resolution hours", lambda: [SLA.calculate_resolution_time(i.created_at, i.resolved_at)
+                                      for i in dataclasses if i.resolved_at],
+         batch.resolution_hours),
+    ):
+        _, loop_s = timed(loop)
+        _, vector_s = timed(vectorized)
+        print(f"{label:<28} {loop_s:7.3f}s {vector_s:10.4f}s")
+    scores = np.random.default_rng(7).uniform(0, 100, n)
+    score_list = scores.tolist()
+    _, loop_s = timed(lambda: [letter_grade(score) for score in score_list])
+    _, vector_s = timed(lambda: letter_grades(scores))
+    print(f"{'letter grade':<28} {loop_s:7.3f}s {vector_s:10.4f}s")
+    del dataclasses, records
+
+    reports = report_fields(n)
+    print(f"\n{'reports':<28} {'build':>8} {'memory':>15}")
+    _, s, b = measure(lambda: [Report(**f) for f in reports])
+    report("Report (dataclass)", n, s, b)
+    report_records, s, b = measure(lambda: [ReportRecord(**f) for f in reports])
+    report("ReportRecord (slots, frozen)", n, s, b)
+    _, s, b = measure(lambda: ReportBatch.from_records(report_records))
+    report("ReportBatch (arrays)", n, s, b)
+
+
+if __name__ == "__main__":
+    main()
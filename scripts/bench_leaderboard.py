@@ -0,0 +1,68 @@
+"""Benchmark leaderboard ranking against the per-call sort in get_percentile_rank
+
+Ranks ``--entities`` scores (no database): percentile of every entity the old
+way (sort + linear count per call) against one ``Leaderboard``, then the cost
+of incremental updates and top-k reads.
+
+    python scripts/bench_leaderboard.py                    # 10k entities
+    python scripts/bench_leaderboard.py --entities 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("OPENAI_API_KEY", "unused")
+
+from app.analytics.rankings import Leaderboard  # noqa: E402
+
+
+def old_percentile_rank(score, all_scores):
+    sorted_scores = sorted(all_scores)
+    rank = sum(1 for s in sorted_scores if s <= score)
+    return round(rank / len(sorted_scores) * 100, 1)
+
+
+def timed(label: str, fn, per: int = 0):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    unit = f"  ({elapsed / per * 1e6:.2f} us each)" if per else ""
+    print(f"{label:<36} {elapsed:8.3f}s{unit}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entities", type=int, default=10_000)
+    parser.add_argument("--updates", type=int, default=100_000)
+    args = parser.parse_args()
+    rng = random.Random(3)
+    scores = {i: round(rng.uniform(0, 100), 1) for i in range(args.entities)}
+    values = list(scores.values())
+
+    sample = values[:200]
+    start = time.perf_counter()
+    old = [old_percentile_rank(s, values) for s in sample]
+    projected = (time.perf_counter() - start) / len(sample) * len(values)
+    print(f"{'old percentile of every entity':<36} {projected:8.3f}s  (projected from "
+          f"{len(sample)} calls)")
+
+    board = timed("build Leaderboard", lambda: Leaderboard(scores))
+    new = timed("percentile of every entity",
+                lambda: [board.percentile(s) for s in values], len(values))
+    assert new[:len(sample)] == old
+    timed("rank of every entity", lambda: [board.rank(e) for e in scores], len(scores))
+
+    changes = [(rng.randrange(args.entities), round(rng.uniform(0, 100), 1))
+               for _ in range(args.updates)]
+    timed(f"{args.updates:,} incremental updates",
+          lambda: [board.update(e, s) for e, s in changes], args.updates)
+    timed("top 50 x 10k reads", lambda: [board.top(50) for _ in range(10_000)], 10_000)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark batch score computation against the per-entity path
+
+Seeds ``--areas`` areas (spread over ``--tenants`` tenants) with issues and
+SLA results, then times:
+
+- per-entity: calculate_tenant_score / calculate_area_score for each entity
+  (one query each, as a loop over entities would)
+- batch: score_engine.compute_all_scores (one snapshot, NumPy group-by)
+
+    python scripts/bench_score_engine.py                 # 10k areas, in-memory SQLite
+    python scripts/bench_score_engine.py --url postgresql://.../civicpulse_bench
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("OPENAI_API_KEY", "unused")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.analytics.score_engine import compute_all_scores  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.models import AreaModel, IssueModel, SLAMetricModel, TenantModel  # noqa: E402
+from app.workers.score_worker import calculate_area_score, calculate_tenant_score  # noqa: E402
+
+
+def seed(db, tenants: int, areas: int, issues_per_area: int, now: datetime):
+    rng = random.Random(7)
+    db.execute(TenantModel.__table__.insert(), [
+        {"id": t, "name": f"Tenant {t}", "type": "city"} for t in range(1, tenants + 1)
+    ])
+    db.execute(AreaModel.__table__.insert(), [
+        {"id": a, "tenant_id": 1 + a % tenants, "name": f"Area {a}"} for a in range(1, areas + 1)
+    ])
+    issues, slas = [], []
+    issue_id = 0
+    for area_id in range(1, areas + 1):
+        for _ in range(issues_per_area):
+            issue_id += 1
+            created = now - timedelta(hours=rng.uniform(0, 45 * 24))
+            hours = rng.uniform(1, 120)
+            resolved = created + timedelta(hours=hours)
+            done = resolved < now and rng.random() < 0.8
+            issues.append({"id": issue_id, "tenant_id": 1 + area_id % tenants,
+                           "area_id": area_id, "category": "road", "severity": "high",
+                           "status": "resolved" if done else "open", "created_at": created,
+                           "resolved_at": resolved if done else None})
+            if done:
+                slas.append({"issue_id": issue_id, "resolution_time_hours": round(hours, 2),
+                             "met_sla": hours <= 72, "calculated_at": resolved})
+    db.execute(IssueModel.__table__.insert(), issues)
+    db.execute(SLAMetricModel.__table__.insert(), slas)
+    db.commit()
+    return len(issues), len(slas)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score engine benchmark")
+    parser.add_argument("--url", default=None, help="Database URL (default: in-memory SQLite)")
+    parser.add_argument("--tenants", type=int, default=50)
+    parser.add_argument("--areas", type=int, default=10000)
+    parser.add_argument("--issues-per-area", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.url:
+        engine = create_engine(args.url)
+    else:
+        engine = create_engine("sqlite://", poolclass=StaticPool,
+                               connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    now = datetime.utcnow()
+
+    issue_count, sla_count = seed(db, args.tenants, args.areas, args.issues_per_area, now)
+    print(f"Seeded {args.tenants} tenants, {args.areas} areas, "
+          f"{issue_count} issues, {sla_count} SLA results")
+
+    start = time.perf_counter()
+    per_entity = {(t, None): calculate_tenant_score(t, db, now)
+                  for t in range(1, args.tenants + 1)}
+    per_entity.update({(1 + a % args.tenants, a): calculate_area_score(a, db, now)
+                       for a in range(1, args.areas + 1)})
+    per_entity_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rows = compute_all_scores(db, now=now)
+    batch_seconds = time.perf_counter() - start
+
+    batch = {(r["tenant_id"], r["area_id"]): r["score"]
+             for r in rows if r["metric_type"] == "overall"}
+    # Scores are rounded to 2 places; summation order can move the last digit
+    mismatches = sum(1 for key, score in batch.items()
+                     if abs(per_entity.get(key, 0.0) - score) > 0.015)
+
+    print(f"{'path':>12}  {'entities':>9}  {'seconds':>9}")
+    print(f"{'per-entity':>12}  {len(per_entity):>9}  {per_entity_seconds:>9.3f}")
+    print(f"{'batch':>12}  {len(batch):>9}  {batch_seconds:>9.3f}  "
+          f"({len(rows)} rows, all metric types)")
+    print(f"speedup: {per_entity_seconds / batch_seconds:.1f}x, mismatches: {mismatches}")
+    db.close()
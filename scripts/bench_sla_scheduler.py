@@ -0,0 +1,95 @@
+"""Benchmark the in-memory SLA deadline scheduler at scale
+
+Tracks ``--issues`` open issues (no database), then reports the memory held by
+the timers, the cost of tracking, rescheduling a slice, firing a day of events,
+and snapshot/restore.
+
+    python scripts/bench_sla_scheduler.py                  # 1M issues
+    python scripts/bench_sla_scheduler.py --issues 200000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("OPENAI_API_KEY", "unused")
+
+from app.domain.sla import SLAPolicy  # noqa: E402
+from app.workers.sla_scheduler import SLADeadlineScheduler, to_seconds  # noqa: E402
+
+SEVERITIES = ["low", "normal", "high", "critical"]
+CATEGORIES = ["road", "lighting", "water", "waste", "noise"]
+
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<28} {time.perf_counter() - start:8.2f}s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--issues", type=int, default=1_000_000)
+    parser.add_argument("--tenants", type=int, default=50)
+    args = parser.parse_args()
+
+    policy = SLAPolicy.from_dicts([
+        {"severity": "critical", "hours": 24},
+        {"severity": "high", "hours": 48},
+        {"category": "water", "severity": "critical", "hours": 8},
+    ], default_hours=72)
+    now = datetime(2026, 3, 10, 12, 0)
+    now_s = to_seconds(now)
+    rng = random.Random(7)
+    issues = [
+        (i, 1 + i % args.tenants, rng.choice(CATEGORIES), rng.choice(SEVERITIES),
+         now - timedelta(seconds=rng.randrange(0, 60 * 3600)))
+        for i in range(1, args.issues + 1)
+    ]
+
+    def build():
+        scheduler = SLADeadlineScheduler(policy, warn_before=timedelta(hours=1),
+                                         max_issues=args.issues)
+        for issue in issues:
+            scheduler.track(*issue, now=now_s)
+        return scheduler
+
+    scheduler = timed(f"track {args.issues:,}", build)
+    # Separate pass: tracing slows allocation down several times
+    tracemalloc.start()
+    traced = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{'timer memory':<28} {current / 1e6:8.1f} MB "
+          f"({current / max(len(traced), 1):.0f} B/issue)")
+    del traced
+
+    changed = issues[: args.issues // 10]
+    timed(f"reschedule {len(changed):,}", lambda: [
+        scheduler.track(i, t, c, "critical", created, now=now_s) for i, t, c, _, created in changed
+    ])
+    events = timed("fire next 24h", lambda: sum(
+        len(scheduler.poll(now_s + minute * 60)) for minute in range(24 * 60)
+    ))
+    print(f"{'events fired':<28} {events:8,}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "sla.npz")
+        scheduler.synced_until = now
+        timed("snapshot", lambda: scheduler.snapshot(path))
+        print(f"{'snapshot size':<28} {os.path.getsize(path) / 1e6:8.1f} MB")
+        restored = SLADeadlineScheduler(policy, warn_before=timedelta(hours=1),
+                                        max_issues=args.issues)
+        timed("restore", lambda: restored.restore(path))
+    print(f"{'restored timers':<28} {len(restored):8,}")
+
+
+if __name__ == "__main__":
+    main()
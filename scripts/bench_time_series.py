@@ -0,0 +1,135 @@
+"""Benchmark the time-series engine over a 5-year window
+
+- engine: ``--events`` issue timestamps (and resolution hours) for one large
+  city, bucketed in America/New_York by hour/day/week/month, with percentiles
+- rollups: ``load_time_series`` reading five years of hourly and daily rollups
+  (one row per hour per ``--groups`` category) plus the raw tail
+- smoothing: the previous O(n*w) ``smooth_trend`` against the cumulative-sum
+  moving average and the streaming EWMA
+
+    python scripts/bench_time_series.py                   # 5M events, in-memory SQLite
+    python scripts/bench_time_series.py --url postgresql://.../civicpulse_bench
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("OPENAI_API_KEY", "unused")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.analytics.time_series import (  # noqa: E402
+    aggregate,
+    ewma,
+    load_time_series,
+    moving_average,
+)
+from app.db.base import Base  # noqa: E402
+from app.db.models import (  # noqa: E402
+    IssueRollupDailyModel,
+    IssueRollupHourlyModel,
+    TenantModel,
+)
+from app.db.rollups import set_watermark  # noqa: E402
+
+END = datetime(2026, 1, 1)
+START = END - timedelta(days=5 * 365 + 1)
+TZ = "America/New_York"
+
+
+def best_ms(fn, repeat: int = 5) -> float:
+    """Best of ``repeat`` runs (the first also warms the zone's offset table)"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def old_smooth_trend(values, window_size=7):
+    smoothed = []
+    for i in range(len(values)):
+        window = values[max(0, i - window_size + 1):i + 1]
+        smoothed.append(sum(window) / len(window))
+    return smoothed
+
+
+def seed_rollups(db, groups: int, rng):
+    hours = np.arange(np.datetime64(START, "h"), np.datetime64(END, "h"))
+    created = rng.poisson(30, (len(hours), groups))
+    resolved_hours = rng.gamma(2.0, 20.0, (len(hours), groups))
+    db.add(TenantModel(id=1, name="Metropolis", type="city", timezone=TZ))
+    rows = [
+        {"tenant_id": 1, "category": f"c{g}", "severity": "normal",
+         "bucket_start": hour.astype(datetime), "issues_created": int(created[i, g]),
+         "issues_resolved": int(created[i, g]), "resolution_count": int(created[i, g]),
+         "resolution_hours_sum": float(resolved_hours[i, g] * created[i, g])}
+        for i, hour in enumerate(hours) for g in range(groups)
+    ]
+    db.execute(IssueRollupHourlyModel.__table__.insert(), rows)
+    metrics = ("issues_created", "issues_resolved", "resolution_count", "resolution_hours_sum")
+    days = {}
+    for row in rows:
+        bucket = row["bucket_start"].replace(hour=0)
+        day = days.setdefault((row["category"], bucket),
+                              {**row, "bucket_start": bucket, **{m: 0 for m in metrics}})
+        for metric in metrics:
+            day[metric] += row[metric]
+    db.execute(IssueRollupDailyModel.__table__.insert(), list(days.values()))
+    set_watermark(db, END)
+    db.commit()
+    return len(rows), len(days)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=5_000_000)
+    parser.add_argument("--groups", type=int, default=4)
+    parser.add_argument("--url", default="sqlite://")
+    args = parser.parse_args()
+    rng = np.random.default_rng(7)
+
+    span = int((END - START).total_seconds())
+    origin = int((START - datetime(1970, 1, 1)).total_seconds())
+    stamps = origin + rng.integers(0, span, args.events)
+    values = rng.gamma(2.0, 20.0, args.events)
+    print(f"engine: {args.events:,} events, {TZ}")
+    for interval in ("hourly", "daily", "weekly", "monthly"):
+        ms = best_ms(lambda: aggregate(stamps, START, END, interval, TZ, values=values))
+        print(f"  {interval:<28} {ms:8.1f} ms")
+    ms = best_ms(lambda: aggregate(stamps, START, END, "daily", TZ, values=values,
+                                   percentiles=(50, 90, 99)), repeat=2)
+    print(f"  {'daily + p50/p90/p99':<28} {ms:8.1f} ms")
+
+    if args.url == "sqlite://":
+        engine = create_engine(args.url, poolclass=StaticPool)
+    else:
+        engine = create_engine(args.url)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    hourly_rows, daily_rows = seed_rollups(db, args.groups, rng)
+    print(f"\nrollups: {hourly_rows:,} hourly / {daily_rows:,} daily rows")
+    for tz, interval in (("UTC", "daily"), ("UTC", "monthly"), (TZ, "daily"), (TZ, "weekly")):
+        ms = best_ms(lambda: load_time_series(db, 1, "issues_created", START, END, interval, tz))
+        print(f"  {tz + ' ' + interval:<28} {ms:8.1f} ms")
+    db.close()
+
+    series = rng.uniform(0, 100, 24 * 365 * 5).tolist()
+    print(f"\nsmoothing: {len(series):,} hourly points, 168h window")
+    ms = best_ms(lambda: old_smooth_trend(series, 168), repeat=1)
+    print(f"  {'smooth_trend (previous)':<28} {ms:8.1f} ms")
+    print(f"  {'moving_average':<28} {best_ms(lambda: moving_average(series, 168)):8.1f} ms")
+    print(f"  {'ewma':<28} {best_ms(lambda: ewma(series, span=168)):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,37 @@
-"""Run schema updates (until Alembic later)"""
+"""Run schema updates (until Alembic later)
 
-# TODO: Implement migration logic
-# TODO: Read SQL files and apply schema changes
+Applies sql/schema.sql (idempotent baseline), then every migration in
+sql/migrations that is not yet recorded in schema_migrations.
+
+    python scripts/run_migrations.py
+    python scripts/run_migrations.py --dry-run
+    python scripts/run_migrations.py --url postgresql://.../civicpulse_test
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine  # noqa: E402
+
+from app.db.migrations import MigrationError, run_migrations  # noqa: E402
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply pending SQL migrations")
+    parser.add_argument("--url", default=None, help="Database URL (default: DATABASE_URL)")
+    parser.add_argument("--dry-run", action="store_true", help="List pending migrations only")
+    args = parser.parse_args()
+
+    if args.url:
+        engine = create_engine(args.url)
+    else:
+        from app.db.base import engine
+
     print("Running migrations...")
-    # Implementation to follow
+    try:
+        applied = run_migrations(engine, dry_run=args.dry_run)
+    except MigrationError as e:
+        print(f"Migration failed: {e}")
+        sys.exit(1)
+    print(f"{len(applied)} migration(s) {'pending' if args.dry_run else 'applied'}")
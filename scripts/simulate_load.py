@@ -1,11 +1,723 @@
-"""Generates fake report traffic (concurrency testing)"""
+"""Load generator and latency benchmark harness
+
+Drives the API with a weighted endpoint mix and records a latency histogram
+per endpoint (HdrHistogram layout: 3 significant digits at any magnitude),
+plus throughput, errors and dropped arrivals. Results are printed as a table
+and can be written as JSON (``--json``) to diff against another commit's run
+(``--compare``).
+
+Targets (``--target``):
+
+- ``asgi`` (default): the app in-process. Requests are handed straight to
+  the ASGI app, with its lifespan running, so no sockets are involved.
+- ``serve``: the same app served by ``uvicorn`` in a subprocess on a free
+  port and driven over keep-alive HTTP/1.1.
+- ``http://host:port``: a server that is already running. Nothing is seeded
+  except what ``--seed-reports`` posts.
+
+``asgi`` and ``serve`` use a fresh SQLite database, deleted after the run,
+unless ``--database-url`` is given. They start ``FakeOpenAIServer`` and point
+``OPENAI_BASE_URL`` at it. They seed tenants, areas, issues, SLA results and
+scores (``--seed-issues``) so the dashboard and leaderboard have data.
+``--dedup-interval`` runs the dedup worker during the run, so submitted
+reports are classified by the fake LLM and become issues.
+
+Arrivals (``--arrival``):
+
+- ``closed``: ``--concurrency`` clients. Each sends its next request when
+  the previous one completes.
+- ``constant`` / ``poisson``: an open loop at ``--rate`` requests/s, evenly
+  spaced or with exponential gaps.
+- ``burst``: Poisson at ``--rate``, multiplied by ``--burst-factor`` for the
+  first ``--burst-length`` seconds of every ``--burst-every``.
+
+Open-loop latency is measured from each request's scheduled arrival, so a
+stalled server shows up as latency rather than as a lower offered load.
+Arrivals that find ``--max-inflight`` requests outstanding are dropped and
+counted. Tenants follow a Zipf distribution with exponent ``--zipf``: 0 is
+uniform, and tenant 1 is the hottest.
+
+    python scripts/simulate_load.py --duration 20 --json results/$(git rev-parse --short HEAD).json
+    python scripts/simulate_load.py --target serve --arrival poisson --rate 300 --zipf 1.1
+    python scripts/simulate_load.py --target http://127.0.0.1:8000 --concurrency 64 \\
+        --json after.json --compare before.json
+"""
+import argparse
 import asyncio
+import json
+import math
+import os
 import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from bisect import bisect_right
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# (name, weight): one request shape per name, see Scenario.request
+DEFAULT_MIX = {"submit_report": 4, "list_issues": 2, "dashboard": 2, "leaderboard": 1,
+               "list_reports": 0, "health": 1}
+CATEGORIES = ["pothole", "streetlight", "graffiti", "water leak", "noise", "trash"]
+SEVERITIES = ["low", "medium", "high", "critical"]
+PERCENTILES = {"p50": 50, "p95": 95, "p99": 99, "p999": 99.9}
+# Raised by a failed request; anything else is a bug in the harness
+REQUEST_ERRORS = (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError,
+                  IndexError)
+
+
+class Histogram:
+    """Log-linear latency histogram in microseconds (the HdrHistogram layout)
+
+    Values below ``2 * 10**significant_figures`` get a bucket each. Above
+    that, each power of two is split into the same number of buckets, so a
+    bucket is never wider than ``10**-significant_figures`` of its values.
+    """
+
+    def __init__(self, significant_figures: int = 3):
+        self.sub_bits = math.ceil(math.log2(2 * 10 ** significant_figures))
+        self.half = 1 << (self.sub_bits - 1)
+        self.counts: Counter = Counter()
+        self.count = 0
+        self.sum = 0
+        self.min: Optional[int] = None
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        magnitude = max(value.bit_length() - self.sub_bits, 0)
+        return magnitude * self.half + (value >> magnitude)
+
+    def _highest(self, index: int) -> int:
+        """Largest value that lands in bucket ``index``"""
+        if index < 2 * self.half:
+            return index
+        magnitude = index // self.half - 1
+        return ((index - magnitude * self.half + 1) << magnitude) - 1
+
+    def record(self, seconds: float):
+        value = max(round(seconds * 1e6), 0)
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "Histogram"):
+        self.counts.update(other.counts)
+        self.count += other.count
+        self.sum += other.sum
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent: float) -> int:
+        """Microseconds at or below which ``percent`` of the values fall"""
+        if not self.count:
+            return 0
+        rank = max(math.ceil(percent / 100 * self.count), 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._highest(index), self.max)
+        return self.max
+
+    def buckets(self) -> list:
+        """``[highest value, count]`` per non-empty bucket, ascending"""
+        return [[self._highest(index), self.counts[index]] for index in sorted(self.counts)]
+
+
+class ZipfTenants:
+    """Draws tenant ids 1..n with P(k) proportional to 1 / k**exponent"""
+
+    def __init__(self, tenants: int, exponent: float, rng: random.Random):
+        self.cumulative = list(accumulate(1 / k ** exponent for k in range(1, tenants + 1)))
+        self.rng = rng
+
+    def __call__(self) -> int:
+        return bisect_right(self.cumulative, self.rng.random() * self.cumulative[-1]) + 1
+
+
+def arrival_gaps(kind: str, rate: float, rng: random.Random, burst_factor: float = 5.0,
+                 burst_every: float = 10.0, burst_length: float = 2.0) -> Callable[[float], float]:
+    """Seconds until the next arrival, as a function of seconds since the start"""
+    if kind == "constant":
+        return lambda elapsed: 1 / rate
+    if kind == "poisson":
+        return lambda elapsed: rng.expovariate(rate)
+    if kind == "burst":
+        def gap(elapsed: float) -> float:
+            bursting = elapsed % burst_every < burst_length
+            return rng.expovariate(rate * burst_factor if bursting else rate)
+        return gap
+    raise ValueError(f"Unknown arrival process: {kind}")
+
+
+class HttpConnection:
+    """One keep-alive HTTP/1.1 connection; requests on it are sequential"""
+
+    def __init__(self, host: str, port: int):
+        self.host, self.port = host, port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def request(self, method: str, path: str, body: Optional[bytes] = None,
+                      content_type: str = "application/json") -> Tuple[int, bytes]:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        elif self.reader.at_eof():
+            # The server closed the idle keep-alive connection (uvicorn: after 5 s)
+            await self.close()
+            return await self.request(method, path, body, content_type)
+        head = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}"]
+        if body is not None:
+            head += [f"Content-Type: {content_type}", f"Content-Length: {len(body)}"]
+        self.writer.write(("\r\n".join(head) + "\r\n\r\n").encode("ascii") + (body or b""))
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if headers.get("transfer-encoding") == "chunked":
+            payload = b""
+            while True:
+                size = int((await self.reader.readline()).strip(), 16)
+                chunk = await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                payload += chunk[:-2]
+        else:
+            payload = await self.reader.readexactly(int(headers.get("content-length", 0)))
+        if headers.get("connection") == "close":
+            await self.close()
+        return status, payload
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+class AsgiConnection:
+    """Calls an ASGI app in-process; same interface as HttpConnection"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def request(self, method: str, path: str, body: Optional[bytes] = None,
+                      content_type: str = "application/json") -> Tuple[int, bytes]:
+        path, _, query = path.partition("?")
+        headers = [(b"host", b"loadtest")]
+        if body is not None:
+            headers += [(b"content-type", content_type.encode()),
+                        (b"content-length", str(len(body)).encode())]
+        scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+                 "method": method, "scheme": "http", "path": path, "raw_path": path.encode(),
+                 "query_string": query.encode(), "root_path": "", "headers": headers,
+                 "client": ("127.0.0.1", 0), "server": ("loadtest", 80)}
+        pending = [{"type": "http.request", "body": body or b"", "more_body": False}]
+        finished = asyncio.Event()
+        response = {"status": 500, "body": []}
+
+        async def receive():
+            if pending:
+                return pending.pop()
+            await finished.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["body"].append(message.get("body", b""))
+                if not message.get("more_body"):
+                    finished.set()
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            finished.set()
+        return response["status"], b"".join(response["body"])
+
+    async def close(self):
+        pass
+
+
+class ConnectionPool:
+    """Idle connections for the open loop; opens another when all are busy"""
+
+    def __init__(self, connect: Callable[[], object]):
+        self.connect = connect
+        self.idle: list = []
+
+    def acquire(self):
+        return self.idle.pop() if self.idle else self.connect()
+
+    def release(self, conn):
+        self.idle.append(conn)
+
+    async def close(self):
+        for conn in self.idle:
+            await conn.close()
+        self.idle.clear()
+
+
+class Scenario:
+    """Builds requests for the endpoint mix"""
+
+    def __init__(self, tenants: Callable[[], int], mix: Dict[str, int], rng: random.Random):
+        self.tenants = tenants
+        self.names = [name for name, weight in mix.items() if weight > 0]
+        self.weights = list(accumulate(mix[name] for name in self.names))
+        self.rng = rng
+
+    def report(self) -> dict:
+        category = self.rng.choice(CATEGORIES)
+        return {"tenant_id": self.tenants(),
+                "description": f"Reported {category} near block {self.rng.randint(1, 999)}",
+                "location": f"{self.rng.uniform(40, 41):.5f},{self.rng.uniform(-74, -73):.5f}"}
+
+    def request(self) -> Tuple[str, str, str, Optional[bytes]]:
+        name = self.rng.choices(self.names, cum_weights=self.weights)[0]
+        if name == "submit_report":
+            return name, "POST", "/reports/", json.dumps(self.report()).encode()
+        tenant_id = self.tenants()
+        if name == "list_reports":
+            return name, "GET", f"/reports/?tenant_id={tenant_id}&limit=50", None
+        if name == "list_issues":
+            return name, "GET", f"/issues/?tenant_id={tenant_id}&limit=50", None
+        if name == "dashboard":
+            return name, "GET", f"/dashboard/{tenant_id}", None
+        if name == "leaderboard":
+            return name, "GET", f"/scores/leaderboard?tenant_id={tenant_id}&limit=20", None
+        return name, "GET", "/health", None
+
+
+class Recorder:
+    """Per-endpoint latency histograms, errors and drops after the warm-up"""
+
+    def __init__(self, measure_from: float = 0.0):
+        self.measure_from = measure_from
+        self.latency: Dict[str, Histogram] = defaultdict(Histogram)
+        self.errors: Counter = Counter()
+        self.dropped: Counter = Counter()
+
+    def record(self, name: str, started: float, status: Optional[int]):
+        """``status`` None means the request failed without a response"""
+        if started < self.measure_from:
+            return
+        if status is not None:
+            self.latency[name].record(time.perf_counter() - started)
+        if status is None or status >= 400:
+            self.errors[name] += 1
+
+    def drop(self, name: str, started: float):
+        if started >= self.measure_from:
+            self.dropped[name] += 1
+
+
+async def timed_request(conn, request: tuple, started: float, timeout: float,
+                        recorder: Recorder):
+    name, method, path, body = request
+    try:
+        status, _ = await asyncio.wait_for(conn.request(method, path, body), timeout)
+    except REQUEST_ERRORS:
+        await conn.close()
+        status = None
+    recorder.record(name, started, status)
+
+
+async def closed_loop(connect: Callable[[], object], scenario: Scenario, concurrency: int,
+                      duration: float, timeout: float, recorder: Recorder):
+    """``concurrency`` clients, each sending its next request when the last one returns"""
+    deadline = time.perf_counter() + duration
+
+    async def client():
+        conn = connect()
+        while time.perf_counter() < deadline:
+            await timed_request(conn, scenario.request(), time.perf_counter(), timeout, recorder)
+        await conn.close()
+
+    await asyncio.gather(*[client() for _ in range(concurrency)])
+
+
+async def open_loop(pool: ConnectionPool, scenario: Scenario, gap: Callable[[float], float],
+                    duration: float, max_inflight: int, timeout: float, recorder: Recorder):
+    """Send requests at scheduled arrival times, whether or not earlier ones returned"""
+    inflight = set()
+
+    async def send(request: tuple, scheduled: float):
+        conn = pool.acquire()
+        try:
+            await timed_request(conn, request, scheduled, timeout, recorder)
+        finally:
+            pool.release(conn)
+
+    start = time.perf_counter()
+    offset = 0.0
+    while offset < duration:
+        await asyncio.sleep(max(start + offset - time.perf_counter(), 0))
+        request = scenario.request()
+        if len(inflight) >= max_inflight:
+            recorder.drop(request[0], start + offset)
+        else:
+            task = asyncio.create_task(send(request, start + offset))
+            inflight.add(task)
+            task.add_done_callback(inflight.discard)
+        offset += gap(offset)
+    if inflight:
+        await asyncio.wait(inflight)
+    await pool.close()
+
+
+def _stats(histogram: Histogram, errors: int, dropped: int, elapsed: float) -> dict:
+    ms = lambda us: round(us / 1000, 3)  # noqa: E731
+    return {
+        "requests": histogram.count,
+        "errors": errors,
+        "dropped": dropped,
+        "throughput_rps": round(histogram.count / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "min": ms(histogram.min or 0),
+            "mean": ms(histogram.sum / histogram.count) if histogram.count else 0.0,
+            **{name: ms(histogram.percentile(p)) for name, p in PERCENTILES.items()},
+            "max": ms(histogram.max),
+        },
+        "histogram_us": histogram.buckets(),
+    }
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    """Per-endpoint and overall stats, JSON-ready"""
+    total = Histogram()
+    endpoints = {}
+    for name in sorted(set(recorder.latency) | set(recorder.errors) | set(recorder.dropped)):
+        total.merge(recorder.latency[name])
+        endpoints[name] = _stats(recorder.latency[name], recorder.errors[name],
+                                 recorder.dropped[name], elapsed)
+    return {"elapsed_seconds": round(elapsed, 3),
+            "total": _stats(total, sum(recorder.errors.values()),
+                            sum(recorder.dropped.values()), elapsed),
+            "endpoints": endpoints}
+
+
+def print_summary(summary: dict):
+    print(f"{'endpoint':<16}{'count':>8}{'err':>6}{'drop':>6}{'req/s':>9}{'p50 ms':>9}"
+          f"{'p95 ms':>9}{'p99 ms':>9}{'p99.9 ms':>10}{'max ms':>9}")
+    for name, r in [*summary["endpoints"].items(), ("total", summary["total"])]:
+        latency = r["latency_ms"]
+        print(f"{name:<16}{r['requests']:>8}{r['errors']:>6}{r['dropped']:>6}"
+              f"{r['throughput_rps']:>9.0f}{latency['p50']:>9.1f}{latency['p95']:>9.1f}"
+              f"{latency['p99']:>9.1f}{latency['p999']:>10.1f}{latency['max']:>9.1f}")
+
+
+def print_comparison(baseline: dict, results: dict):
+    """Throughput and p99 changes against an earlier run's JSON"""
+    print(f"\nvs {baseline.get('commit') or 'baseline'}:")
+    print(f"{'endpoint':<16}{'req/s':>18}{'change':>9}{'p99 ms':>20}{'change':>9}")
+    rows = [(name, baseline["summary"]["endpoints"].get(name), r)
+            for name, r in results["summary"]["endpoints"].items()]
+    rows.append(("total", baseline["summary"]["total"], results["summary"]["total"]))
+    for name, before, after in rows:
+        if before is None:
+            continue
+        changes = []
+        for old, new in [(before["throughput_rps"], after["throughput_rps"]),
+                         (before["latency_ms"]["p99"], after["latency_ms"]["p99"])]:
+            change = f"{(new - old) / old * 100:+.0f}%" if old else "n/a"
+            changes.append((f"{old:.1f} -> {new:.1f}", change))
+        (rps, rps_change), (p99, p99_change) = changes
+        print(f"{name:<16}{rps:>18}{rps_change:>9}{p99:>20}{p99_change:>9}")
+
+
+def seed_database(tenants: ZipfTenants, tenant_count: int, issues: int, areas: int,
+                  rng: random.Random):
+    """Schema plus tenants, areas, issues, SLA results and scores; skipped if seeded"""
+    from sqlalchemy import func, select
+
+    from app.db.base import Base, engine
+    from app.db.models import (
+        AreaModel,
+        IssueModel,
+        PerformanceScoreModel,
+        SLAMetricModel,
+        TenantModel,
+    )
+
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+        if conn.execute(select(func.count()).select_from(TenantModel)).scalar():
+            return
+        now = datetime.utcnow()
+        conn.execute(TenantModel.__table__.insert(), [
+            {"name": f"City {i}", "type": "city", "timezone": "UTC"}
+            for i in range(1, tenant_count + 1)
+        ])
+        conn.execute(AreaModel.__table__.insert(), [
+            {"tenant_id": tenant_id, "name": f"Ward {i}"}
+            for tenant_id in range(1, tenant_count + 1) for i in range(1, areas + 1)
+        ])
+        area_ids = defaultdict(list)
+        for area_id, tenant_id in conn.execute(select(AreaModel.id, AreaModel.tenant_id)):
+            area_ids[tenant_id].append(area_id)
+
+        rows = []
+        for _ in range(issues):
+            tenant_id = tenants()
+            created_at = now - timedelta(hours=rng.uniform(0, 24 * 60))
+            resolved = rng.random() < 0.75
+            rows.append({
+                "tenant_id": tenant_id, "area_id": rng.choice(area_ids[tenant_id]),
+                "category": rng.choice(CATEGORIES), "severity": rng.choice(SEVERITIES),
+                "status": "resolved" if resolved else "open", "created_at": created_at,
+                "resolved_at": created_at + timedelta(hours=rng.uniform(1, 96))
+                if resolved else None,
+            })
+        conn.execute(IssueModel.__table__.insert(), rows)
+        conn.execute(SLAMetricModel.__table__.insert(), [
+            {"issue_id": issue_id, "met_sla": rng.random() < 0.8,
+             "resolution_time_hours": (resolved_at - created_at).total_seconds() / 3600,
+             "calculated_at": resolved_at}
+            for issue_id, created_at, resolved_at in conn.execute(
+                select(IssueModel.id, IssueModel.created_at, IssueModel.resolved_at)
+                .where(IssueModel.resolved_at.isnot(None)))
+        ])
+        conn.execute(PerformanceScoreModel.__table__.insert(), [
+            {"tenant_id": tenant_id, "area_id": area_id, "metric_type": metric,
+             "score": round(rng.uniform(40, 100), 2), "calculated_at": now}
+            for tenant_id in range(1, tenant_count + 1)
+            for area_id in [None, *area_ids[tenant_id]]
+            for metric in ("overall", "sla", "responsiveness")
+        ])
+
+
+async def seed_reports(conn, count: int, scenario: Scenario, batch: int = 5000):
+    """Bulk-load ``count`` reports through POST /reports/bulk"""
+    for start in range(0, count, batch):
+        rows = [scenario.report() for _ in range(min(batch, count - start))]
+        status, body = await conn.request("POST", "/reports/bulk", json.dumps(rows).encode())
+        if status >= 300:
+            raise RuntimeError(f"Seeding failed with {status}: {body[:200]!r}")
+    await conn.close()
+
+
+async def run_dedup(interval: float, stop: asyncio.Event):
+    """Run the dedup worker every ``interval`` seconds until ``stop`` is set"""
+    from app.workers.dedup_worker import deduplicate_reports
+
+    while not stop.is_set():
+        try:
+            await asyncio.to_thread(deduplicate_reports)
+        except Exception as e:
+            print(f"Error running dedup worker: {e}")
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def start_server(port: int, timeout: float = 30.0) -> subprocess.Popen:
+    """uvicorn on ``port`` with this process's environment, once /health answers"""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--log-level", "warning"], cwd=ROOT, env=dict(os.environ))
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with {process.returncode}")
+        conn = HttpConnection("127.0.0.1", port)
+        try:
+            if (await conn.request("GET", "/health"))[0] == 200:
+                return process
+        except REQUEST_ERRORS:
+            await asyncio.sleep(0.2)
+        finally:
+            await conn.close()
+    process.terminate()
+    raise RuntimeError(f"uvicorn did not answer on port {port} within {timeout}s")
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args) -> dict:
+    mix = dict(DEFAULT_MIX)
+    for item in args.mix or []:
+        name, _, weight = item.partition("=")
+        if name not in DEFAULT_MIX:
+            raise SystemExit(f"Unknown endpoint {name!r}; choose from {', '.join(DEFAULT_MIX)}")
+        mix[name] = int(weight)
+    rng = random.Random(args.seed)
+    tenants = ZipfTenants(args.tenants, args.zipf, rng)
+    scenario = Scenario(tenants, mix, rng)
+
+    fake_llm = process = lifespan = scratch = None
+    stop = asyncio.Event()
+    background = []
+    try:
+        if args.target in ("asgi", "serve"):
+            from app.llm.fake_server import FakeOpenAIServer
+
+            fake_llm = FakeOpenAIServer(latency=args.llm_latency)
+            await fake_llm.start()
+            if not args.database_url:
+                scratch = tempfile.mkdtemp(prefix="civicpulse-load-")
+            # Settings() reads the environment when app modules are first imported
+            os.environ.update({
+                "DATABASE_URL": args.database_url or "sqlite:///" + os.path.join(
+                    scratch, "load.db"),
+                "OPENAI_API_KEY": "fake",
+                "OPENAI_BASE_URL": fake_llm.base_url,
+            })
+            started = time.perf_counter()
+            await asyncio.to_thread(seed_database, ZipfTenants(args.tenants, args.zipf, rng),
+                                    args.tenants, args.seed_issues, args.areas, rng)
+            print(f"database {os.environ['DATABASE_URL']} ready in "
+                  f"{time.perf_counter() - started:.1f}s")
+
+        if args.target == "asgi":
+            from app.main import app
+
+            lifespan = app.router.lifespan_context(app)
+            await lifespan.__aenter__()
+            connect = lambda: AsgiConnection(app)  # noqa: E731
+        else:
+            if args.target == "serve":
+                host, port = "127.0.0.1", _free_port()
+                process = await start_server(port)
+            else:
+                url = urlsplit(args.target)
+                host, port = url.hostname, url.port or 80
+            connect = lambda: HttpConnection(host, port)  # noqa: E731
+
+        if args.seed_reports:
+            started = time.perf_counter()
+            await seed_reports(connect(), args.seed_reports, scenario)
+            print(f"seeded {args.seed_reports:,} reports in {time.perf_counter() - started:.1f}s")
+            if not args.duration:
+                return {}
+        if args.dedup_interval and args.target in ("asgi", "serve"):
+            background.append(asyncio.create_task(run_dedup(args.dedup_interval, stop)))
+
+        started = time.perf_counter()
+        recorder = Recorder(measure_from=started + args.warmup)
+        if args.arrival == "closed":
+            await closed_loop(connect, scenario, args.concurrency, args.duration, args.timeout,
+                              recorder)
+        else:
+            gap = arrival_gaps(args.arrival, args.rate, rng, args.burst_factor,
+                               args.burst_every, args.burst_length)
+            await open_loop(ConnectionPool(connect), scenario, gap, args.duration,
+                            args.max_inflight, args.timeout, recorder)
+        elapsed = time.perf_counter() - recorder.measure_from
+    finally:
+        stop.set()
+        await asyncio.gather(*background)
+        if lifespan is not None:
+            await lifespan.__aexit__(None, None, None)
+        if process is not None:
+            process.terminate()
+            process.wait()
+        if fake_llm is not None:
+            await fake_llm.stop()
+        if scratch is not None:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    summary = summarize(recorder, elapsed)
+    load = (f"{args.concurrency} clients" if args.arrival == "closed"
+            else f"{args.arrival} arrivals at {args.rate:g}/s")
+    print(f"{summary['total']['requests']:,} requests in {elapsed:.1f}s = "
+          f"{summary['total']['throughput_rps']:,.0f} req/s ({load}, target {args.target})")
+    print_summary(summary)
+    results = {
+        "commit": _commit(),
+        "started_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "config": {**vars(args), "mix": {k: v for k, v in mix.items() if v > 0}},
+        "llm_requests": fake_llm.request_count if fake_llm is not None else None,
+        "summary": summary,
+    }
+    results["config"].pop("json", None)
+    results["config"].pop("compare", None)
+    if args.target in ("asgi", "serve"):
+        results["config"]["database_url"] = os.environ["DATABASE_URL"]
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(json.load(f), results)
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"wrote {args.json}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", default="asgi",
+                        help="asgi (in-process), serve (local uvicorn) or a server URL")
+    parser.add_argument("--database-url",
+                        help="database for asgi/serve (default: a fresh SQLite file)")
+    parser.add_argument("--arrival", choices=["closed", "constant", "poisson", "burst"],
+                        default="closed")
+    parser.add_argument("--concurrency", type=int, default=32, help="clients (closed loop)")
+    parser.add_argument("--rate", type=float, default=200.0,
+                        help="mean arrivals per second (open loop)")
+    parser.add_argument("--burst-factor", type=float, default=5.0)
+    parser.add_argument("--burst-every", type=float, default=10.0, help="seconds")
+    parser.add_argument("--burst-length", type=float, default=2.0, help="seconds")
+    parser.add_argument("--max-inflight", type=int, default=1000,
+                        help="open-loop arrivals beyond this many outstanding are dropped")
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--warmup", type=float, default=0.0,
+                        help="seconds at the start left out of the results")
+    parser.add_argument("--timeout", type=float, default=10.0,
+                        help="seconds before a request counts as an error")
+    parser.add_argument("--tenants", type=int, default=20)
+    parser.add_argument("--zipf", type=float, default=0.0,
+                        help="tenant skew exponent (0 = uniform, ~1 = heavy head)")
+    parser.add_argument("--areas", type=int, default=8, help="areas per seeded tenant")
+    parser.add_argument("--seed-issues", type=int, default=20000,
+                        help="issues to seed for asgi/serve (skipped if already seeded)")
+    parser.add_argument("--seed-reports", type=int, default=0,
+                        help="bulk-load this many reports first (then exit if --duration 0)")
+    parser.add_argument("--dedup-interval", type=float, default=0.0,
+                        help="run the dedup worker every N seconds during asgi/serve runs")
+    parser.add_argument("--llm-latency", type=float, default=0.0,
+                        help="seconds per fake LLM response")
+    parser.add_argument("--mix", nargs="*", metavar="NAME=WEIGHT",
+                        help=f"override endpoint weights (default {DEFAULT_MIX})")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="write results here")
+    parser.add_argument("--compare", help="results JSON of an earlier run to compare against")
+    asyncio.run(run(parser.parse_args()))
 
-# TODO: Generate concurrent API requests
-# TODO: Simulate realistic load patterns
-# TODO: Measure throughput and response times
 
 if __name__ == "__main__":
-    print("Starting load simulation...")
-    # Implementation to follow
+    main()
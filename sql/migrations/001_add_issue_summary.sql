@@ -0,0 +1,3 @@
+-- issues.summary was added to schema.sql after the first deployments;
+-- CREATE TABLE IF NOT EXISTS does not add columns to existing tables.
+ALTER TABLE issues ADD COLUMN IF NOT EXISTS summary TEXT;
@@ -0,0 +1,30 @@
+-- migrate: no-transaction
+-- Indexes for the hot access patterns, built without blocking writes.
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so the
+-- runner executes each statement on its own in autocommit mode.
+
+-- Issue lists filtered by status (GET /issues?status=..., open issue counts)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_issues_tenant_status
+    ON issues (tenant_id, status);
+
+-- Newest-first issue lists and time-windowed aggregates per tenant
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_issues_tenant_created
+    ON issues (tenant_id, created_at DESC);
+
+-- Open issues only: the working set of the dedup worker and dashboards
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_issues_open
+    ON issues (tenant_id, created_at DESC)
+    WHERE status = 'open';
+
+-- Dedup worker claim queue: unprocessed reports in submission order
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_reports_unprocessed
+    ON reports (submitted_at, id)
+    WHERE processed = false;
+
+-- SLA windows joined to a tenant's issues (nested loop from issues)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_sla_issue_calculated
+    ON sla_metrics (issue_id, calculated_at);
+
+-- SLA windows across tenants (rollup refresh)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_sla_calculated
+    ON sla_metrics (calculated_at);
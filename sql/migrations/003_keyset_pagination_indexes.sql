@@ -0,0 +1,12 @@
+-- migrate: no-transaction
+-- Keyset pagination walks (tenant_id, timestamp DESC, id DESC); with id in the
+-- index the row comparison (timestamp, id) < (:t, :i) is an index condition.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_reports_tenant_submitted
+    ON reports (tenant_id, submitted_at DESC, id DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_issues_tenant_created_id
+    ON issues (tenant_id, created_at DESC, id DESC);
+
+-- Superseded by idx_issues_tenant_created_id
+DROP INDEX CONCURRENTLY IF EXISTS idx_issues_tenant_created;
@@ -0,0 +1,9 @@
+-- issues.updated_at drives the incremental SLA worker (rows changed since its
+-- watermark). Existing rows get the migration time, so the first run after
+-- deploying evaluates every issue once.
+ALTER TABLE issues ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
+
+-- sla_metrics becomes one row per issue (upserted); keep the newest duplicate
+DELETE FROM sla_metrics older
+    USING sla_metrics newer
+    WHERE older.issue_id = newer.issue_id AND older.id < newer.id;
@@ -0,0 +1,15 @@
+-- migrate: no-transaction
+
+-- SLA worker change scan: issues with (updated_at, id) past the watermark
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_issues_updated
+    ON issues (updated_at, id);
+
+-- Conflict target for the sla_metrics upsert (one row per issue)
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_sla_metrics_issue
+    ON sla_metrics (issue_id);
+
+-- Breach alerts: open issues whose deadline (created_at + threshold) falls in
+-- the alert window
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_issues_open_created
+    ON issues (created_at)
+    WHERE status = 'open';
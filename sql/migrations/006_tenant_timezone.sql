@@ -0,0 +1,3 @@
+-- Reporting timezone per tenant (IANA name, e.g. 'America/New_York'): time
+-- series bucket hours, days, weeks and months by the tenant's local time.
+ALTER TABLE tenants ADD COLUMN IF NOT EXISTS timezone VARCHAR(64) NOT NULL DEFAULT 'UTC';
@@ -0,0 +1,11 @@
+-- migrate: no-transaction
+
+-- Latest scores: a tenant's (or one area's) newest row per metric type, and
+-- the area leaderboard within a tenant
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_scores_tenant_area_metric
+    ON performance_scores (tenant_id, area_id, metric_type, calculated_at);
+
+-- Tenant leaderboard: tenant-level scores for one metric across all tenants
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_scores_metric_tenant
+    ON performance_scores (metric_type, tenant_id, calculated_at)
+    WHERE area_id IS NULL;
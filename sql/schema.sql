@@ -5,6 +5,7 @@ CREATE TABLE IF NOT EXISTS tenants (
     id SERIAL PRIMARY KEY,
     name VARCHAR(255) NOT NULL,
     type VARCHAR(50) NOT NULL, -- city, building, campus, hotel, facility
+    timezone VARCHAR(64) NOT NULL DEFAULT 'UTC', -- IANA name; time series bucket by local time
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -23,9 +24,11 @@ CREATE TABLE IF NOT EXISTS issues (
     area_id INTEGER REFERENCES areas(id),
     category VARCHAR(100),
     severity VARCHAR(50),
+    summary TEXT,
     status VARCHAR(50) DEFAULT 'open',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    resolved_at TIMESTAMP
+    resolved_at TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Reports table (individual submissions)
@@ -58,9 +61,69 @@ CREATE TABLE IF NOT EXISTS performance_scores (
     calculated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Shared LLM result cache (classification / similarity)
+CREATE TABLE IF NOT EXISTS llm_cache (
+    cache_key VARCHAR(64) PRIMARY KEY,
+    value TEXT NOT NULL,
+    expires_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Dashboard rollups: issue/SLA event totals per tenant/area/category/severity
+-- and hour (or day), maintained by app/db/rollups.py up to a watermark
+CREATE TABLE IF NOT EXISTS issue_rollups_hourly (
+    id SERIAL PRIMARY KEY,
+    tenant_id INTEGER NOT NULL,
+    area_id INTEGER,
+    category VARCHAR(100),
+    severity VARCHAR(50),
+    bucket_start TIMESTAMP NOT NULL,
+    issues_created INTEGER NOT NULL DEFAULT 0,
+    issues_resolved INTEGER NOT NULL DEFAULT 0,
+    sla_met INTEGER NOT NULL DEFAULT 0,
+    sla_missed INTEGER NOT NULL DEFAULT 0,
+    resolution_count INTEGER NOT NULL DEFAULT 0,
+    resolution_hours_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    resolution_hours_sq_sum DOUBLE PRECISION NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS issue_rollups_daily (
+    id SERIAL PRIMARY KEY,
+    tenant_id INTEGER NOT NULL,
+    area_id INTEGER,
+    category VARCHAR(100),
+    severity VARCHAR(50),
+    bucket_start TIMESTAMP NOT NULL,
+    issues_created INTEGER NOT NULL DEFAULT 0,
+    issues_resolved INTEGER NOT NULL DEFAULT 0,
+    sla_met INTEGER NOT NULL DEFAULT 0,
+    sla_missed INTEGER NOT NULL DEFAULT 0,
+    resolution_count INTEGER NOT NULL DEFAULT 0,
+    resolution_hours_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    resolution_hours_sq_sum DOUBLE PRECISION NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS rollup_watermarks (
+    name VARCHAR(100) PRIMARY KEY,
+    watermark TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Rolled-up hours whose events changed after the fact (an issue reopened, an
+-- SLA result re-evaluated); the next rollup refresh rebuilds them
+CREATE TABLE IF NOT EXISTS rollup_stale_hours (
+    bucket_start TIMESTAMP PRIMARY KEY,
+    marked_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Create indexes for common queries
 CREATE INDEX IF NOT EXISTS idx_reports_tenant ON reports(tenant_id);
 CREATE INDEX IF NOT EXISTS idx_reports_issue ON reports(issue_id);
 CREATE INDEX IF NOT EXISTS idx_issues_tenant ON issues(tenant_id);
 CREATE INDEX IF NOT EXISTS idx_issues_status ON issues(status);
 CREATE INDEX IF NOT EXISTS idx_sla_issue ON sla_metrics(issue_id);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_expires ON llm_cache(expires_at);
+CREATE INDEX IF NOT EXISTS idx_rollups_hourly_tenant_bucket ON issue_rollups_hourly(tenant_id, bucket_start);
+CREATE INDEX IF NOT EXISTS idx_rollups_hourly_bucket ON issue_rollups_hourly(bucket_start);
+CREATE INDEX IF NOT EXISTS idx_rollups_daily_tenant_bucket ON issue_rollups_daily(tenant_id, bucket_start);
+CREATE INDEX IF NOT EXISTS idx_rollups_daily_bucket ON issue_rollups_daily(bucket_start);